@@ -0,0 +1,47 @@
+import asyncio
+from typing import Optional
+from ..services.gemini_client import GeminiClient
+from ..services.session_manager import SessionManager
+from ..services.enhanced_tool_orchestrator import EnhancedToolOrchestrator
+
+# Shared service singletons, created once when the application starts
+_gemini_client: Optional[GeminiClient] = None
+_session_manager: Optional[SessionManager] = None
+_tool_orchestrator: Optional[EnhancedToolOrchestrator] = None
+
+# Longest startup waits on connection warmup before serving anyway
+WARMUP_TIMEOUT = 10  # seconds
+
+async def init_services():
+    """Construct the shared services used by all routers and warm their connections"""
+    global _gemini_client, _session_manager, _tool_orchestrator
+    
+    _session_manager = SessionManager()
+    _tool_orchestrator = EnhancedToolOrchestrator()
+    _gemini_client = GeminiClient()
+    
+    # Warm the tool capability cache without delaying startup
+    _tool_orchestrator.start_capability_probe()
+    
+    # Open storage and API connections up front so the first requests don't pay for them; an
+    # unreachable service is left to connect on first use rather than holding up startup
+    try:
+        await asyncio.wait_for(asyncio.gather(_session_manager.aopen(), _gemini_client.aopen()), timeout=WARMUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"⚠️ Service warmup did not finish within {WARMUP_TIMEOUT}s; continuing startup")
+
+async def shutdown_services():
+    """Stop background tool runs, flush pending session writes and close connections before the application exits"""
+    if _tool_orchestrator is not None:
+        await _tool_orchestrator.aclose()
+    if _session_manager is not None:
+        await _session_manager.aclose()
+
+async def get_gemini_client() -> GeminiClient:
+    return _gemini_client
+
+async def get_session_manager() -> SessionManager:
+    return _session_manager
+
+async def get_orchestrator() -> EnhancedToolOrchestrator:
+    return _tool_orchestrator
\ No newline at end of file
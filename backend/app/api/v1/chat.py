@@ -1,126 +1,208 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-import asyncio
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional
+import orjson
 from ...schemas.chat import ChatRequest, ChatResponse, SessionInfo, SessionListResponse
-from ...services.gemini_client import GeminiClient
+from ...services.gemini_client import GeminiClient, CLARIFICATION_QUESTIONS
 from ...services.session_manager import SessionManager
 from ...services.enhanced_tool_orchestrator import EnhancedToolOrchestrator
+from ..deps import get_gemini_client, get_session_manager, get_orchestrator
+from ...responses import model_response
 
 router = APIRouter()
-gemini_client = GeminiClient()
-session_manager = SessionManager()
-tool_orchestrator = EnhancedToolOrchestrator()
 
-@router.post("/message", response_model=ChatResponse)
-async def process_message(request: ChatRequest):
-    """Process a chat message and execute reconnaissance if needed"""
-    try:
-        # Safely log the message
-        safe_message = str(request.message)[:50].replace('{', '{{').replace('}', '}}')
-        print(f"📨 Processing message: {safe_message}...")
+# Example queries appended to clarification prompts, keyed by a substring of the parsed action
+_ACTION_HINTS = {
+    "subdomain": "\n\n**Examples:**\n• Find subdomains for google.com\n• Enumerate subdomains on tesla.com\n• Discover assets for microsoft.com",
+    "port": "\n\n**Examples:**\n• Scan ports on 192.168.1.1\n• Run nmap on github.com\n• Check open ports on example.org",
+    "screenshot": "\n\n**Examples:**\n• Take screenshots of reddit.com\n• Capture visuals for facebook.com",
+    "content": "\n\n**Examples:**\n• Find directories on tesla.com\n• Discover content on github.com"
+}
+
+async def _prepare_turn(
+    request: ChatRequest,
+    gemini_client: GeminiClient,
+    session_manager: SessionManager,
+    tool_orchestrator: EnhancedToolOrchestrator
+) -> Dict[str, Any]:
+    """Parse the message and run any requested tools, returning what the reply is built from"""
+    # Safely log the message
+    safe_message = str(request.message)[:50].replace('{', '{{').replace('}', '}}')
+    print(f"📨 Processing message: {safe_message}...")
+    
+    # Get or create session
+    session_id = request.session_id or session_manager.create_session()
+    
+    # Get the recent conversation context, then queue the user message
+    context = await session_manager.get_recent_context(session_id)
+    await session_manager.add_message(session_id, "user_query", request.message)
+    
+    # Parse the query using Gemini
+    print("🤖 Calling Gemini API for query parsing...")
+    parsed_intent = await gemini_client.parse_query(request.message, context)
+    print("✅ Gemini response received")
+    
+    # Check if clarification is needed
+    if parsed_intent.get("clarification_needed", False):
+        action = parsed_intent.get("action", "")
         
-        # Get or create session
-        session_id = request.session_id or session_manager.create_session()
+        # Prefer the parsed question, then a canned one for the action, before asking Gemini again
+        clarification = parsed_intent.get("clarification_question") or CLARIFICATION_QUESTIONS.get(action)
+        if not clarification:
+            clarification = await gemini_client.ask_clarification(request.message)
         
-        # Get conversation context
-        context = await session_manager.get_conversation_history(session_id)
+        # Add helpful suggestions based on the action type
+        for key, hint in _ACTION_HINTS.items():
+            if key in action:
+                clarification += hint
+                break
         
-        # Parse the query using Gemini (run in thread pool to avoid blocking)
-        print("🤖 Calling Gemini API for query parsing...")
-        parsed_intent = await asyncio.to_thread(gemini_client.parse_query, request.message, context)
-        print("✅ Gemini response received")
+        await session_manager.add_message(session_id, "system_response", clarification)
         
-        # Save user message
-        await session_manager.add_message(session_id, "user_query", request.message)
+        return {"session_id": session_id, "clarification": clarification}
+    
+    # Execute reconnaissance tools if targets are identified
+    results = {}
+    tools_executed = []
+    
+    targets = parsed_intent.get("targets", [])
+    tools = parsed_intent.get("tools", [])
+    
+    if targets and tools:
+        # Extract tool configurations from parsed intent
+        tool_configs = parsed_intent.get("tool_configs", {})
         
-        # Check if clarification is needed
-        if parsed_intent.get("clarification_needed", False):
-            clarification = parsed_intent.get("clarification_question")
-            if not clarification:
-                clarification = await asyncio.to_thread(gemini_client.ask_clarification, request.message)
-            
-            # Add helpful suggestions based on the action type
-            action = parsed_intent.get("action", "")
-            if "subdomain" in action:
-                clarification += "\n\n**Examples:**\n• Find subdomains for google.com\n• Enumerate subdomains on tesla.com\n• Discover assets for microsoft.com"
-            elif "port" in action:
-                clarification += "\n\n**Examples:**\n• Scan ports on 192.168.1.1\n• Run nmap on github.com\n• Check open ports on example.org"
-            elif "screenshot" in action:
-                clarification += "\n\n**Examples:**\n• Take screenshots of reddit.com\n• Capture visuals for facebook.com"
-            elif "content" in action:
-                clarification += "\n\n**Examples:**\n• Find directories on tesla.com\n• Discover content on github.com"
-            
-            await session_manager.add_message(session_id, "system_response", clarification)
-            
-            return ChatResponse(
-                reply=clarification,
-                session_id=session_id,
-                requires_clarification=True
-            )
+        # Check if user requested a preset
+        preset = parsed_intent.get("preset")
+        if preset:
+            print(f"🎯 Using preset: {preset}")
+            # You could load preset configs here if needed
         
-        # Execute reconnaissance tools if targets are identified
-        results = {}
-        tools_executed = []
+        results = await tool_orchestrator.execute_workflow(parsed_intent, tool_configs)
+        tools_executed = tools
         
-        targets = parsed_intent.get("targets", [])
-        tools = parsed_intent.get("tools", [])
+        # Save tool execution message
+        targets_str = ', '.join(str(target) for target in targets)
+        tools_str = ', '.join(str(tool) for tool in tools_executed)
+        execution_msg = f"Executed {tools_str} on {targets_str}"
+        await session_manager.add_message(session_id, "tool_execution", execution_msg)
+    
+    return {"session_id": session_id, "results": results, "tools_executed": tools_executed}
+
+def _sse_event(data: Dict[str, Any], event: Optional[str] = None) -> bytes:
+    """Encode a server-sent event carrying a JSON payload"""
+    prefix = f"event: {event}\n".encode() if event else b""
+    return prefix + b"data: " + orjson.dumps(data) + b"\n\n"
+
+@router.post("/message", response_model=ChatResponse)
+async def process_message(
+    request: ChatRequest,
+    background: BackgroundTasks,
+    gemini_client: GeminiClient = Depends(get_gemini_client),
+    session_manager: SessionManager = Depends(get_session_manager),
+    tool_orchestrator: EnhancedToolOrchestrator = Depends(get_orchestrator)
+):
+    """Process a chat message and execute reconnaissance if needed"""
+    try:
+        turn = await _prepare_turn(request, gemini_client, session_manager, tool_orchestrator)
+        session_id = turn["session_id"]
         
-        if targets and tools:
-            # Extract tool configurations from parsed intent
-            tool_configs = parsed_intent.get("tool_configs", {})
-            
-            # Check if user requested a preset
-            preset = parsed_intent.get("preset")
-            if preset:
-                print(f"🎯 Using preset: {preset}")
-                # You could load preset configs here if needed
-            
-            results = await tool_orchestrator.execute_workflow(parsed_intent, tool_configs)
-            tools_executed = tools
-            
-            # Save tool execution message
-            targets_str = ', '.join(str(target) for target in targets)
-            tools_str = ', '.join(str(tool) for tool in tools_executed)
-            execution_msg = f"Executed {tools_str} on {targets_str}"
-            await session_manager.add_message(session_id, "tool_execution", execution_msg)
+        if "clarification" in turn:
+            return model_response(ChatResponse(
+                reply=turn["clarification"],
+                session_id=session_id,
+                requires_clarification=True
+            ))
         
-        # Generate natural language response (run in thread pool to avoid blocking)
-        reply = await asyncio.to_thread(gemini_client.generate_response, results, request.message)
+        # Generate natural language response
+        reply = await gemini_client.generate_response(turn["results"], request.message)
         
-        # Save system response
-        await session_manager.add_message(session_id, "system_response", reply)
+        # Save system response after the reply has been sent
+        background.add_task(session_manager.add_message, session_id, "system_response", reply)
         
-        return ChatResponse(
+        return model_response(ChatResponse(
             reply=reply,
             session_id=session_id,
-            tools_executed=tools_executed,
-            results=results,
+            tools_executed=turn["tools_executed"],
+            results=turn["results"],
             requires_clarification=False
-        )
-        
+        ))
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
+
+@router.post("/message/stream")
+async def stream_message(
+    request: ChatRequest,
+    gemini_client: GeminiClient = Depends(get_gemini_client),
+    session_manager: SessionManager = Depends(get_session_manager),
+    tool_orchestrator: EnhancedToolOrchestrator = Depends(get_orchestrator)
+):
+    """Process a chat message and stream the reply as server-sent events"""
+    try:
+        turn = await _prepare_turn(request, gemini_client, session_manager, tool_orchestrator)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
+    
+    session_id = turn["session_id"]
+    
+    async def event_stream():
+        # Send session and tool results up front so the client can render them immediately
+        yield _sse_event({
+            "session_id": session_id,
+            "tools_executed": turn.get("tools_executed"),
+            "results": turn.get("results"),
+            "requires_clarification": "clarification" in turn
+        }, event="meta")
+        
+        if "clarification" in turn:
+            yield _sse_event({"text": turn["clarification"]})
+            yield _sse_event({}, event="done")
+            return
+        
+        reply_parts = []
+        try:
+            async for chunk in gemini_client.stream_response(turn["results"], request.message):
+                reply_parts.append(chunk)
+                yield _sse_event({"text": chunk})
+            yield _sse_event({}, event="done")
+        finally:
+            # Persist whatever was streamed, even if the client disconnected early
+            reply = "".join(reply_parts).strip()
+            if reply:
+                await session_manager.add_message(session_id, "system_response", reply)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.get("/sessions", response_model=SessionListResponse)
-async def list_sessions():
+async def list_sessions(session_manager: SessionManager = Depends(get_session_manager)):
     """List all available sessions"""
     try:
         sessions = await session_manager.list_sessions()
-        return SessionListResponse(sessions=sessions)
+        return model_response(SessionListResponse(sessions=sessions))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing sessions: {str(e)}")
 
 @router.get("/sessions/{session_id}/history")
-async def get_session_history(session_id: str):
+async def get_session_history(session_id: str, session_manager: SessionManager = Depends(get_session_manager)):
     """Get conversation history for a session"""
     try:
-        history = await session_manager.get_conversation_history(session_id)
-        return {"session_id": session_id, "messages": history}
+        # Stored messages are already JSON, so they are spliced into the body rather than
+        # decoded into models and re-encoded
+        messages_json = await session_manager.get_history_json(session_id)
+        return Response(
+            content=b'{"session_id":' + orjson.dumps(session_id) + b',"messages":' + messages_json + b'}',
+            media_type="application/json"
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting session history: {str(e)}")
 
 @router.delete("/sessions/{session_id}")
-async def delete_session(session_id: str):
+async def delete_session(session_id: str, session_manager: SessionManager = Depends(get_session_manager)):
     """Delete a session"""
     try:
         await session_manager.delete_session(session_id)
@@ -131,10 +213,10 @@ async def delete_session(session_id: str):
 @router.post("/test")
 async def test_endpoint(request: ChatRequest):
     """Simple test endpoint without Gemini integration"""
-    return ChatResponse(
+    return model_response(ChatResponse(
         reply=f"Echo: {request.message}",
         session_id="test-session",
         tools_executed=[],
         results={},
         requires_clarification=False
-    )
+    ))
\ No newline at end of file
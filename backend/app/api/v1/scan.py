@@ -1,18 +1,56 @@
-from fastapi import APIRouter, HTTPException
-from ...schemas.scan import ScanRequest, ScanResponse, ExportRequest, ExportResponse
+from fastapi import APIRouter, HTTPException, Response, Depends
+from fastapi.responses import StreamingResponse
+from ...schemas.scan import ScanRequest, ScanResponse, ExportRequest, ExportResponse, ToolExecution, FINDING_LIST_ADAPTER, construct_findings
 from ...services.enhanced_tool_orchestrator import EnhancedToolOrchestrator
 from ...services.session_manager import SessionManager
+from ..deps import get_orchestrator, get_session_manager
+from ...responses import model_response
+from ...config import settings
+from typing import Any, Dict, List
 import uuid
+import orjson
 
 router = APIRouter()
-tool_orchestrator = EnhancedToolOrchestrator()
-session_manager = SessionManager()
+
+def _build_tool_executions(results: Dict[str, Any]) -> List[ToolExecution]:
+    """Turn the orchestrator's execution summary into ToolExecution records with their findings"""
+    # Plugins, the orchestrator and session storage pass findings around as plain dicts;
+    # this is the only place they become Finding models, right before the API response.
+    # Build every finding in one batch, then hand each run its slice; the summary
+    # is in execution order and findings were appended in the same order
+    if settings.trust_internal_findings:
+        # Our own plugins emit well-formed findings, so skip validation
+        findings = tuple(construct_findings(results.get("findings", [])))
+        build_execution = ToolExecution.model_construct
+    else:
+        findings = tuple(FINDING_LIST_ADAPTER.validate_python(results.get("findings", [])))
+        build_execution = ToolExecution
+    
+    executions = []
+    offset = 0
+    for run in results.get("execution_summary", {}).values():
+        count = run.get("findings_count", 0)
+        executions.append(build_execution(
+            tool_name=run["tool_name"],
+            status=run["status"],
+            start_time_ns=run["start_time_ns"],
+            end_time_ns=run.get("end_time_ns"),
+            findings=findings[offset:offset + count],  # tuple slice: an immutable batch per run
+            errors=run.get("errors") or ([run["error"]] if run.get("error") else [])
+        ))
+        offset += count
+    
+    return executions
 
 @router.post("/execute", response_model=ScanResponse)
-async def execute_scan(request: ScanRequest):
+async def execute_scan(
+    request: ScanRequest,
+    tool_orchestrator: EnhancedToolOrchestrator = Depends(get_orchestrator),
+    session_manager: SessionManager = Depends(get_session_manager)
+):
     """Execute a reconnaissance scan"""
     try:
-        scan_id = str(uuid.uuid4())
+        scan_id = uuid.uuid4().hex
         session_id = request.session_id or session_manager.create_session()
         
         # Default tools if none specified
@@ -36,121 +74,142 @@ async def execute_scan(request: ScanRequest):
             results
         )
         
-        return ScanResponse(
+        return model_response(ScanResponse(
             scan_id=scan_id,
             target=request.target,
             status="completed",
-            tools_executed=[],  # Will be populated from results
+            tools_executed=_build_tool_executions(results),
             total_findings=results.get("total_findings", 0),
             session_id=session_id
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scan execution failed: {str(e)}")
 
+# Available reconnaissance tools, serialized once at import
+_TOOLS = [
+    # Recon Tools
+    {
+        "name": "subfinder",
+        "description": "Fast subdomain discovery tool",
+        "type": "subdomain_enumeration"
+    },
+    {
+        "name": "assetfinder",
+        "description": "Fast subdomain discovery using various techniques",
+        "type": "subdomain_enumeration"
+    },
+    {
+        "name": "dnsx",
+        "description": "Fast and multi-purpose DNS toolkit",
+        "type": "dns_enumeration"
+    },
+    {
+        "name": "httpx",
+        "description": "Fast HTTP probe and web technology detection",
+        "type": "http_probe"
+    },
+    {
+        "name": "amass",
+        "description": "In-depth DNS enumeration and network mapping",
+        "type": "subdomain_enumeration"
+    },
+    # Port Scan Tools
+    {
+        "name": "nmap",
+        "description": "Network exploration and security auditing tool",
+        "type": "port_scan"
+    },
+    {
+        "name": "naabu",
+        "description": "Fast port scanner written in Go",
+        "type": "port_scan"
+    },
+    # Screenshot Tools
+    {
+        "name": "gowitness",
+        "description": "Web screenshot utility using Chrome Headless",
+        "type": "screenshot"
+    },
+    {
+        "name": "eyewitness",
+        "description": "Web application screenshot tool with report generation",
+        "type": "screenshot"
+    },
+    # Content Discovery
+    {
+        "name": "gobuster",
+        "description": "Directory/file & DNS busting tool written in Go",
+        "type": "content_discovery"
+    },
+    # Fuzzing & Endpoint Tools
+    {
+        "name": "ffuf",
+        "description": "Fast web fuzzer written in Go",
+        "type": "fuzzing"
+    },
+    {
+        "name": "katana",
+        "description": "Next-generation crawling and spidering framework",
+        "type": "crawling"
+    },
+    {
+        "name": "waybackurls",
+        "description": "Fetch URLs from Wayback Machine archives",
+        "type": "url_discovery"
+    },
+    {
+        "name": "waymore",
+        "description": "Tool for downloading archived web pages and extracting URLs",
+        "type": "url_discovery"
+    },
+    # Parameter Discovery
+    {
+        "name": "paramspider",
+        "description": "Parameter discovery tool for web applications",
+        "type": "parameter_discovery"
+    }
+]
+_TOOLS_JSON = orjson.dumps({"tools": _TOOLS})
+
 @router.get("/tools")
 async def list_available_tools():
     """List available reconnaissance tools"""
-    return {
-        "tools": [
-            # Recon Tools
-            {
-                "name": "subfinder",
-                "description": "Fast subdomain discovery tool",
-                "type": "subdomain_enumeration"
-            },
-            {
-                "name": "assetfinder",
-                "description": "Fast subdomain discovery using various techniques",
-                "type": "subdomain_enumeration"
-            },
-            {
-                "name": "dnsx",
-                "description": "Fast and multi-purpose DNS toolkit",
-                "type": "dns_enumeration"
-            },
-            {
-                "name": "httpx",
-                "description": "Fast HTTP probe and web technology detection",
-                "type": "http_probe"
-            },
-            {
-                "name": "amass",
-                "description": "In-depth DNS enumeration and network mapping",
-                "type": "subdomain_enumeration"
-            },
-            # Port Scan Tools
-            {
-                "name": "nmap",
-                "description": "Network exploration and security auditing tool",
-                "type": "port_scan"
-            },
-            {
-                "name": "naabu",
-                "description": "Fast port scanner written in Go",
-                "type": "port_scan"
-            },
-            # Screenshot Tools
-            {
-                "name": "gowitness",
-                "description": "Web screenshot utility using Chrome Headless",
-                "type": "screenshot"
-            },
-            {
-                "name": "eyewitness",
-                "description": "Web application screenshot tool with report generation",
-                "type": "screenshot"
-            },
-            # Content Discovery
-            {
-                "name": "gobuster",
-                "description": "Directory/file & DNS busting tool written in Go",
-                "type": "content_discovery"
-            },
-            # Fuzzing & Endpoint Tools
-            {
-                "name": "ffuf",
-                "description": "Fast web fuzzer written in Go",
-                "type": "fuzzing"
-            },
-            {
-                "name": "katana",
-                "description": "Next-generation crawling and spidering framework",
-                "type": "crawling"
-            },
-            {
-                "name": "waybackurls",
-                "description": "Fetch URLs from Wayback Machine archives",
-                "type": "url_discovery"
-            },
-            {
-                "name": "waymore",
-                "description": "Tool for downloading archived web pages and extracting URLs",
-                "type": "url_discovery"
-            },
-            # Parameter Discovery
-            {
-                "name": "paramspider",
-                "description": "Parameter discovery tool for web applications",
-                "type": "parameter_discovery"
-            }
-        ]
-    }
+    return Response(content=_TOOLS_JSON, media_type="application/json")
 
-@router.post("/export", response_model=ExportResponse)
-async def export_session(request: ExportRequest):
+@router.post("/export", response_model=ExportResponse, responses={200: {"content": {"application/msgpack": {}, "application/x-ndjson": {}, "text/csv": {}}}})
+async def export_session(
+    request: ExportRequest,
+    session_manager: SessionManager = Depends(get_session_manager)
+):
     """Export session data in specified format"""
     try:
+        if request.format.lower() == "jsonl" or (request.format.lower() in ("csv", "txt") and request.stream):
+            # Streamed line by line so large sessions are never rendered into a single string
+            export_stream = await session_manager.stream_export(request.session_id, request.format)
+            return StreamingResponse(
+                export_stream["content"],
+                media_type=export_stream["media_type"],
+                headers={"Content-Disposition": f'attachment; filename="{export_stream["filename"]}"'}
+            )
+        
         export_data = await session_manager.export_session(
             request.session_id, 
             request.format
         )
         
-        return ExportResponse(
+        if export_data["format"] == "msgpack":
+            return Response(
+                content=export_data["content"],
+                media_type="application/msgpack",
+                headers={"Content-Disposition": f'attachment; filename="{export_data["filename"]}"'}
+            )
+        
+        return model_response(ExportResponse(
             filename=export_data["filename"],
             content=export_data["content"],
             format=export_data["format"]
-        )
+        ))
         
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -1,4 +1,5 @@
 import os
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -6,9 +7,16 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     debug: bool = True
+    api_workers: int = 1  # >1 needs SESSION_BACKEND=redis or sqlite; file sessions are per-process
+    api_limit_concurrency: Optional[int] = None
+    api_backlog: int = 2048
+    # Comma-separated list of origins allowed to call the API from a browser
+    cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
     
     # Google Gemini API Configuration
     gemini_api_key: str = os.getenv("GEMINI_API_KEY", "")
+    # Model to use; when empty, known models are probed once and the working one is remembered
+    gemini_model: str = ""
     
     # Tool Configuration - Recon Tools
     subfinder_path: str = "subfinder"
@@ -40,10 +48,23 @@ class Settings(BaseSettings):
     # Session Configuration
     sessions_dir: str = "sessions"
     max_session_age_days: int = 30
+    session_backend: str = os.getenv("SESSION_BACKEND", "file")  # file, sqlite, redis
+    redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     
     # Execution Configuration
     default_timeout: int = 300  # 5 minutes
     max_concurrent_tools: int = 3
+    # Tool processes running at once across all workflows; max_concurrent_tools caps each workflow
+    max_concurrent_runs: int = 16
+    # Optional JSON file mapping tool path -> version, written at deploy time so versions
+    # are read instead of running each tool with --version
+    tool_versions_file: str = ""
+    # Build findings from our own plugins without re-validating them
+    trust_internal_findings: bool = True
+    
+    @property
+    def cors_origin_list(self) -> List[str]:
+        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
     
     class Config:
         env_file = "config.env"
@@ -1,21 +1,44 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .api.v1 import chat, scan, tools
+from .api.deps import init_services, shutdown_services
+from .schemas.scan import build_deferred_schemas
 from .config import settings
+from .responses import ORJSONResponse
+import logging
+import orjson
+
+# Tool run messages are logged at INFO; only surface them in debug mode
+logging.basicConfig(level=logging.INFO if settings.debug else logging.WARNING, format="%(message)s")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build shared services and the deferred response schemas once at startup rather than at import
+    build_deferred_schemas()
+    await init_services()
+    yield
+    await shutdown_services()
 
 app = FastAPI(
     title="ReconIQ API",
     description="Interactive chatbot-based reconnaissance assistant",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    # Interactive docs are only exposed in debug mode
+    docs_url="/docs" if settings.debug else None,
+    redoc_url=None,
+    openapi_url="/openapi.json" if settings.debug else None
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=settings.cors_origin_list,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["content-type", "authorization"],
 )
 
 # Include routers
@@ -23,10 +46,32 @@ app.include_router(chat.router, prefix="/api/v1/chat", tags=["chat"])
 app.include_router(scan.router, prefix="/api/v1/scan", tags=["scan"])
 app.include_router(tools.router, prefix="/api/v1/tools", tags=["tools"])
 
+# Static bodies are serialized once at import
+_ROOT_JSON = orjson.dumps({"message": "ReconIQ API is running", "version": "1.0.0"})
+_HEALTH_JSON = orjson.dumps({"status": "healthy", "service": "ReconIQ API"})
+
 @app.get("/")
 async def root():
-    return {"message": "ReconIQ API is running", "version": "1.0.0"}
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "ReconIQ API"}
\ No newline at end of file
+    return Response(content=_HEALTH_JSON, media_type="application/json")
+
+# Build the OpenAPI schema once now that all routes are registered
+app.openapi_schema = app.openapi()
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    # loop="auto" picks uvloop when it is installed (not available on Windows)
+    uvicorn.run(
+        "app.main:app",
+        host=settings.api_host,
+        port=settings.api_port,
+        loop="auto",
+        http="httptools",
+        workers=settings.api_workers,
+        limit_concurrency=settings.api_limit_concurrency,
+        backlog=settings.api_backlog
+    )
\ No newline at end of file
@@ -0,0 +1,20 @@
+from typing import Any
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+import orjson
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """Serialize a response model straight to JSON bytes with pydantic-core, skipping FastAPI's re-encoding"""
+    # to_json returns bytes directly, where model_dump_json would build a str for Response to re-encode
+    return Response(
+        content=model.__pydantic_serializer__.to_json(model),
+        status_code=status_code,
+        media_type="application/json"
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -10,16 +10,22 @@ class MessageType(str, Enum):
     ERROR = "error"
 
 class ChatMessage(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
     timestamp: datetime
     type: MessageType
     content: str
     results: Optional[Dict[str, Any]] = None
 
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
     message: str
     session_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
     reply: str
     session_id: str
     tools_executed: Optional[List[str]] = None
@@ -28,10 +34,14 @@ class ChatResponse(BaseModel):
     requires_clarification: bool = False
 
 class SessionInfo(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
     session_id: str
     start_time: datetime
     last_activity: datetime
     message_count: int
     
 class SessionListResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
     sessions: List[SessionInfo]
\ No newline at end of file
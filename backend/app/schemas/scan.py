@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter, computed_field
+from typing import List, Optional, Dict, Any, Literal, Union, Annotated, Tuple, get_args
 from datetime import datetime
 from enum import Enum
 
@@ -24,39 +24,226 @@ class ExecutionStatus(str, Enum):
     FAILED = "failed"
     TIMEOUT = "timeout"
 
-class Finding(BaseModel):
-    type: FindingType
-    value: str
-    source: str
-    confidence: float
-    metadata: Optional[Dict[str, Any]] = None
+# Literal aliases of the enums above; pydantic validates these with a single hash lookup
+# instead of constructing an Enum member per value
+FindingTypeValue = Literal[tuple(t.value for t in FindingType)]
+ExecutionStatusValue = Literal[tuple(s.value for s in ExecutionStatus)]
+
+# Bounded string and number types; oversized payloads are rejected by pydantic-core before
+# any further validation. Finding values are parsed from single lines of tool output, which
+# are read up to this many bytes, so any value a plugin emits fits the bound.
+FINDING_VALUE_MAX_LENGTH = 1024 * 1024
+FindingValue = Annotated[str, StringConstraints(max_length=FINDING_VALUE_MAX_LENGTH)]
+FindingSource = Annotated[str, StringConstraints(max_length=64)]
+Confidence = Annotated[float, Field(ge=0.0, le=1.0)]
+# Hostname, IP, CIDR or URL; no whitespace and no leading "-" so it can't be read as a tool flag
+ScanTarget = Annotated[str, StringConstraints(min_length=1, max_length=2048, pattern=r"^[^\s-]\S*$")]
+
+# Typed metadata per finding type. Known keys are validated as concrete fields instead of
+# walking an arbitrary dict; extra="allow" keeps any plugin-specific keys.
+class FindingMetadata(BaseModel):
+    model_config = ConfigDict(extra="allow")
+    
+    # Key into the workflow results' "configs" map
+    config_id: Optional[str] = None
+
+class SubdomainMetadata(FindingMetadata):
+    target: Optional[str] = None
+    source_name: Optional[str] = None
+    mode: Optional[str] = None
+
+class UrlMetadata(FindingMetadata):
+    target: Optional[str] = None
+    date: Optional[str] = None
+
+class HttpServiceMetadata(FindingMetadata):
+    status_code: Optional[int] = None
+    content_length: Optional[int] = None
+    technology: List[str] = []
+    title: Optional[str] = None
+    method: Optional[str] = None
+
+class DnsRecordMetadata(FindingMetadata):
+    host: Optional[str] = None
+    records: Dict[str, Any] = {}
+
+class OpenPortMetadata(FindingMetadata):
+    target: Optional[str] = None
+    host: Optional[str] = None
+    port: Union[int, str, None] = None
+    protocol: Optional[str] = None
+    service: Optional[str] = None
+    state: Optional[str] = None
+
+class ScreenshotMetadata(FindingMetadata):
+    target: Optional[str] = None
+    screenshot_path: Optional[str] = None
+    screenshot_count: Optional[int] = None
+
+class DirectoryMetadata(FindingMetadata):
+    target: Optional[str] = None
+    mode: Optional[str] = None
+    status_code: Union[int, str, None] = None
+    length: Optional[int] = None
+    words: Optional[int] = None
+    lines: Optional[int] = None
+
+class CrawledUrlMetadata(FindingMetadata):
+    method: Optional[str] = None
+    status_code: Optional[int] = None
+    content_length: Optional[int] = None
+
+class ParameterMetadata(FindingMetadata):
+    target: Optional[str] = None
+    path: Optional[str] = None
+    query: Optional[str] = None
+
+class BaseFinding(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
+    type: str
+    value: FindingValue
+    source: FindingSource
+    confidence: Confidence
+    metadata: Optional[FindingMetadata] = None
+    
+    def __hash__(self):
+        # Metadata holds dicts, so hash on identity fields only; equal findings still hash equal
+        return hash((self.type, self.value, self.source))
+
+class SubdomainFinding(BaseFinding):
+    type: Literal["subdomain"]
+    metadata: Optional[SubdomainMetadata] = None
+
+class UrlFinding(BaseFinding):
+    type: Literal["url", "historical_url"]
+    metadata: Optional[UrlMetadata] = None
+
+class HttpServiceFinding(BaseFinding):
+    type: Literal["http_service"]
+    metadata: Optional[HttpServiceMetadata] = None
+
+class DnsRecordFinding(BaseFinding):
+    type: Literal["dns_record"]
+    metadata: Optional[DnsRecordMetadata] = None
+
+class OpenPortFinding(BaseFinding):
+    type: Literal["open_port"]
+    metadata: Optional[OpenPortMetadata] = None
+
+class ScreenshotFinding(BaseFinding):
+    type: Literal["screenshot"]
+    metadata: Optional[ScreenshotMetadata] = None
+
+class DirectoryFinding(BaseFinding):
+    type: Literal["directory"]
+    metadata: Optional[DirectoryMetadata] = None
+
+class CrawledUrlFinding(BaseFinding):
+    type: Literal["crawled_url"]
+    metadata: Optional[CrawledUrlMetadata] = None
+
+class ParameterFinding(BaseFinding):
+    type: Literal["parameter"]
+    metadata: Optional[ParameterMetadata] = None
+
+class GenericFinding(BaseFinding):
+    type: Literal["technology", "vulnerability"]
+    metadata: Optional[FindingMetadata] = None
+
+_FINDING_VARIANTS = (
+    SubdomainFinding, UrlFinding, HttpServiceFinding, DnsRecordFinding, OpenPortFinding,
+    ScreenshotFinding, DirectoryFinding, CrawledUrlFinding, ParameterFinding, GenericFinding
+)
+
+# Findings are dispatched on their "type" tag, so each one is validated against a single variant
+Finding = Annotated[Union[_FINDING_VARIANTS], Field(discriminator="type")]
+
+# Validates a whole batch of finding dicts in one pydantic-core call
+FINDING_LIST_ADAPTER = TypeAdapter(List[Finding])
+
+# Type tag -> (finding class, metadata class), used to build trusted findings without validation
+_FINDING_CLASSES = {
+    tag: (variant, get_args(variant.model_fields["metadata"].annotation)[0])
+    for variant in _FINDING_VARIANTS
+    for tag in get_args(variant.model_fields["type"].annotation)
+}
+
+def construct_findings(findings: List[Dict[str, Any]]) -> List[BaseFinding]:
+    """Build Finding models from trusted plugin output without validating them"""
+    constructed = []
+    for finding in findings:
+        classes = _FINDING_CLASSES.get(finding.get("type"))
+        if classes is None:
+            # Unknown tag: let validation report it
+            constructed.extend(FINDING_LIST_ADAPTER.validate_python([finding]))
+            continue
+        
+        finding_cls, metadata_cls = classes
+        metadata = finding.get("metadata")
+        constructed.append(finding_cls.model_construct(
+            type=finding["type"],
+            value=finding["value"],
+            source=finding["source"],
+            confidence=finding["confidence"],
+            metadata=metadata_cls.model_construct(**metadata) if metadata is not None else None
+        ))
+    
+    return constructed
 
 class ToolExecution(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", defer_build=True)
+    
     tool_name: str
-    status: ExecutionStatus
-    start_time: datetime
-    end_time: Optional[datetime] = None
-    findings: List[Finding] = []
+    status: ExecutionStatusValue
+    # Epoch nanoseconds; validated as plain ints instead of parsing ISO-8601 strings
+    start_time_ns: int
+    end_time_ns: Optional[int] = None
+    # Read-only once the tool finishes, so stored as a tuple
+    findings: Tuple[Finding, ...] = ()
     errors: List[str] = []
+    
+    @computed_field
+    @property
+    def start_time(self) -> datetime:
+        return datetime.fromtimestamp(self.start_time_ns / 1e9)
+    
+    @computed_field
+    @property
+    def end_time(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.end_time_ns / 1e9) if self.end_time_ns is not None else None
 
 class ScanRequest(BaseModel):
-    target: str
+    target: ScanTarget
     tools: Optional[List[str]] = None
     session_id: Optional[str] = None
 
 class ScanResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     scan_id: str
     target: str
-    status: ExecutionStatus
+    status: ExecutionStatusValue
     tools_executed: List[ToolExecution]
     total_findings: int
     session_id: str
 
 class ExportRequest(BaseModel):
     session_id: str
-    format: str = "json"  # json, csv, txt
+    format: str = "json"  # json, csv, txt; msgpack and jsonl are returned as raw bytes
+    stream: bool = False  # csv and txt only: stream the file instead of wrapping it in ExportResponse
 
 class ExportResponse(BaseModel):
     filename: str
     content: str
-    format: str
\ No newline at end of file
+    format: str
+
+# Make sure the small schemas are fully built at import (model_rebuild is a no-op once complete), so
+# an unresolved reference fails at startup and no request pays for a lazy schema build
+for _model in (ScanRequest, ExportRequest, ExportResponse):
+    _model.model_rebuild()
+
+def build_deferred_schemas():
+    """Build the large deferred schemas; called from the app's startup hook in each worker"""
+    for model in (ToolExecution, ScanResponse):
+        model.model_rebuild()
\ No newline at end of file
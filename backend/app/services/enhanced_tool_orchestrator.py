@@ -1,16 +1,234 @@
 import asyncio
+import atexit
 import subprocess
 import json
 import os
 import tempfile
-from typing import Dict, List, Any, Optional, Union
+import time
+import hashlib
+import logging
+import shutil
+import functools
+import contextlib
+import sys
+import re
+import orjson
+import xml.etree.ElementTree as ET
+from collections import defaultdict, OrderedDict
+from typing import Dict, List, Set, Any, Optional, Union, Tuple, Sequence, Mapping, Literal, AsyncIterator, Callable, Awaitable
+from types import MappingProxyType
 from datetime import datetime
 from pathlib import Path
-from ..schemas.scan import Finding, FindingType, ToolExecution, ExecutionStatus
+from urllib.parse import urlsplit, SplitResult
+from pydantic import ConfigDict, Field, ValidationError, create_model
+from ..schemas.scan import Finding, FindingType, ToolExecution, ExecutionStatus, FINDING_VALUE_MAX_LENGTH
 from ..config import settings
 
+# Level-gated so per-run messages cost nothing when filtered out
+logger = logging.getLogger(__name__)
+
+# Finding type tags resolved once, instead of an enum attribute lookup per finding
+_FT_SUBDOMAIN = FindingType.SUBDOMAIN.value
+_FT_HISTORICAL_URL = FindingType.HISTORICAL_URL.value
+_FT_HTTP_SERVICE = FindingType.HTTP_SERVICE.value
+_FT_DNS_RECORD = FindingType.DNS_RECORD.value
+_FT_OPEN_PORT = FindingType.OPEN_PORT.value
+_FT_SCREENSHOT = FindingType.SCREENSHOT.value
+_FT_DIRECTORY = FindingType.DIRECTORY.value
+_FT_CRAWLED_URL = FindingType.CRAWLED_URL.value
+_FT_PARAMETER = FindingType.PARAMETER.value
+
+# URL schemes accepted from URL-discovery tools
+_HTTP_PREFIXES = ('http://', 'https://')
+_HTTP_PREFIXES_BYTES = (b'http://', b'https://')
+
+# Shared read-only default for optional nested JSON objects, instead of a new {} per lookup
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+def _install_pidfd_child_watcher():
+    """Reap tool processes through pidfds instead of the default SIGCHLD-based child watcher.
+    
+    The default watcher before Python 3.12 serializes child handling behind a lock and a
+    signal handler, which throttles many concurrent tool processes. 3.12+ already uses pidfds,
+    and uvloop reaps children itself, so this only changes the stdlib loop on older Pythons.
+    """
+    if sys.platform != "linux" or sys.version_info >= (3, 12) or not hasattr(asyncio, "PidfdChildWatcher"):
+        return
+    try:
+        # pidfd_open needs Linux 5.3+
+        os.close(os.pidfd_open(os.getpid()))
+    except (AttributeError, OSError):
+        return
+    
+    policy = asyncio.get_event_loop_policy()
+    if isinstance(policy, asyncio.DefaultEventLoopPolicy):
+        watcher = asyncio.PidfdChildWatcher()
+        try:
+            # set_child_watcher doesn't attach it; the orchestrator is built inside the running loop
+            watcher.attach_loop(asyncio.get_running_loop())
+        except RuntimeError:
+            # No running loop yet; the policy attaches the default watcher instead
+            return
+        policy.set_child_watcher(watcher)
+
+@functools.lru_cache(maxsize=None)
+def _tool_versions() -> Dict[str, str]:
+    """Tool path -> version string from the manifest written at deploy time, read once"""
+    if not settings.tool_versions_file:
+        return {}
+    try:
+        with open(settings.tool_versions_file, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning("⚠️ Could not read tool versions manifest %s: %s", settings.tool_versions_file, e)
+        return {}
+
+def _config_id(config: Mapping[str, Any]) -> str:
+    """Short stable id of an effective tool config; findings reference it instead of embedding the config"""
+    # Interned so every finding, cached result and workflow "configs" key shares one string per config
+    return sys.intern(hashlib.blake2b(orjson.dumps(config, option=orjson.OPT_SORT_KEYS, default=str), digest_size=6).hexdigest())
+
+def _png_files(directory: str) -> List[os.DirEntry]:
+    """PNG files in a directory, listed with a single readdir pass; empty if it doesn't exist"""
+    try:
+        with os.scandir(directory) as entries:
+            return [entry for entry in entries if entry.name.endswith(".png") and entry.is_file()]
+    except FileNotFoundError:
+        return []
+
+def _screenshots_by_target(files: List[os.DirEntry], targets: List[str]) -> Dict[str, List[os.DirEntry]]:
+    """Group screenshot files from a batch run by the target their file name was derived from"""
+    # Screenshot tools name files after the URL with punctuation replaced, so compare alphanumerics only
+    keys = {target: re.sub(r"[^a-z0-9]", "", target.lower().split("://", 1)[-1]) for target in targets}
+    grouped = {target: [] for target in targets}
+    for file in files:
+        name = re.sub(r"[^a-z0-9]", "", file.name[:-len(".png")].lower())
+        matches = [target for target, key in keys.items() if key and key in name]
+        if matches:
+            # The longest key wins, so sub.example.com isn't filed under example.com
+            grouped[max(matches, key=lambda target: len(keys[target]))].append(file)
+        elif len(targets) == 1:
+            grouped[targets[0]].append(file)
+    return grouped
+
+def _comma_list(values: Sequence[Any]) -> str:
+    """Format a list option as a comma-separated CLI value"""
+    return ",".join(map(str, values))
+
+# Tool command -> absolute executable path, resolved on first spawn
+_executables: Dict[str, str] = {}
+
+def _spawn_tool(command: List[str], stdin: Optional[int] = None, **kwargs) -> Awaitable[asyncio.subprocess.Process]:
+    """Start a tool process with stdout and stderr piped.
+    
+    Every tool is started here with an absolute executable path and no preexec_fn, cwd or
+    env overrides, so CPython keeps using its vfork/posix_spawn fast path instead of fully
+    forking the server process.
+    """
+    program = _executables.get(command[0])
+    if program is None:
+        program = shutil.which(command[0])
+        if program is None:
+            # Not found: leave the exec to report it
+            program = command[0]
+        else:
+            _executables[command[0]] = program
+    
+    return asyncio.create_subprocess_exec(
+        program, *command[1:],
+        stdin=stdin,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        **kwargs
+    )
+
+# Wordlist paths already seen on disk; missing paths aren't remembered so a wordlist added
+# later is still picked up
+_found_wordlists = set()
+
+def _wordlist_ok(path: str) -> bool:
+    """Whether a wordlist exists, stat-ing each existing path once per process"""
+    if path in _found_wordlists:
+        return True
+    try:
+        size = os.stat(path).st_size
+    except OSError:
+        return False
+    if size == 0:
+        # Still passed to the tool, which then finds nothing; say why once instead of per run
+        logger.warning("Wordlist %s is empty", path)
+    _found_wordlists.add(path)
+    return True
+
+def _dedupe_findings(findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop repeated (type, value) findings from a single tool run, keeping the first occurrence"""
+    seen = set()
+    unique = []
+    for finding in findings:
+        key = (finding.get("type"), finding.get("value"))
+        if key not in seen:
+            seen.add(key)
+            unique.append(finding)
+    return unique
+
+def _confidence_by_type(findings: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Aggregate finding count, mean and max confidence per finding type in a single pass"""
+    totals: Dict[str, List[float]] = {}
+    for finding in findings:
+        confidence = finding.get("confidence", 0.0)
+        entry = totals.get(finding.get("type"))
+        if entry is None:
+            totals[finding.get("type")] = [1, confidence, confidence]
+        else:
+            entry[0] += 1
+            entry[1] += confidence
+            if confidence > entry[2]:
+                entry[2] = confidence
+    
+    return {
+        finding_type: {"count": count, "mean": total / count, "max": highest}
+        for finding_type, (count, total, highest) in totals.items()
+    }
+
+def _result_cache_key(tool_name: str, target: str, config: Dict[str, Any]) -> str:
+    """Key a tool run by its name, target and canonicalized configuration"""
+    return hashlib.sha1(json.dumps([tool_name, target, config], sort_keys=True, default=str).encode()).hexdigest()
+
+def _match_target(host: Optional[str], targets: Sequence[str]) -> str:
+    """Pick the input target a host belongs to: the target itself, else its most specific parent domain"""
+    if host:
+        host = host.lower()
+        if host in targets:
+            return host
+        parents = [target for target in targets if host.endswith("." + target)]
+        if parents:
+            return max(parents, key=len)
+    return targets[0]
+
+def _url_key(url: str) -> str:
+    """Canonical form of a URL for dedupe: lowercase scheme and host, no trailing slash, sorted query"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    return _split_url_key(parts)
+
+def _split_url_key(parts: SplitResult) -> str:
+    """_url_key for a URL that has already been split"""
+    query = "&".join(sorted(parts.query.split("&"))) if parts.query else ""
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path.rstrip('/')}?{query}"
+
 class EnhancedToolOrchestrator:
+    # Capability probes spawn subprocesses, so results are reused for a while
+    CAPABILITIES_TTL = 300  # seconds
+    # Identical (tool, target, config) runs within the tool's result_cache_ttl reuse the earlier result
+    RESULT_CACHE_SIZE = 1024
+    # Batch runs of the same tool, config and targets that start within this window, e.g. from
+    # concurrent chat requests, share one process so its startup cost is paid once
+    BATCH_COALESCE_WINDOW = 0.05  # seconds
+    
     def __init__(self):
+        _install_pidfd_child_watcher()
         self.available_tools = {
             # Recon Tools
             "subfinder": EnhancedSubfinderPlugin(),
@@ -40,9 +258,47 @@ class EnhancedToolOrchestrator:
             "paramspider": EnhancedParamSpiderPlugin()
         }
         self.tool_configs = {}
+        self._capabilities_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._capabilities_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._result_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Batch key -> (targets, future for the shared run's results)
+        self._pending_batches: Dict[str, Tuple[List[str], asyncio.Future]] = {}
+        # Launched batch runs; the event loop only holds weak references to tasks, and joined
+        # callers wait on the run's future rather than the task itself
+        self._batch_tasks: Set[asyncio.Task] = set()
+        # Result cache key -> future for a run that is still going; identical runs requested
+        # meanwhile await it instead of starting their own process
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Each workflow has its own semaphore, so this bounds the tool processes of all
+        # concurrent workflows together
+        self._run_slots = asyncio.Semaphore(settings.max_concurrent_runs)
     
-    async def execute_workflow(self, parsed_intent: Dict[str, Any], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute reconnaissance workflow with user customization"""
+    @property
+    def tool_names(self) -> Tuple[str, ...]:
+        """Names of all registered tools, in registration order"""
+        return tuple(self.available_tools)
+    
+    def start_capability_probe(self):
+        """Probe every tool in the background so capability requests are served from cache"""
+        self._warmup_task = asyncio.create_task(self.get_all_capabilities(self.tool_names))
+    
+    async def aclose(self):
+        """Cancel the capability probe and shared batch runs, and wait for their processes to stop"""
+        tasks = [*self._batch_tasks]
+        if self._warmup_task is not None:
+            tasks.append(self._warmup_task)
+            self._warmup_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def execute_workflow(self, parsed_intent: Dict[str, Any], user_config: Optional[Dict[str, Any]] = None, findings_queue: Optional[asyncio.Queue] = None) -> Dict[str, Any]:
+        """Execute reconnaissance workflow with user customization.
+        
+        When ``findings_queue`` is given, every finding is also put on it as soon as its
+        tool reports it, so a consumer can show results before the workflow completes.
+        """
         targets = parsed_intent.get("targets", [])
         tools = parsed_intent.get("tools", [])
         custom_params = user_config or {}
@@ -55,50 +311,327 @@ class EnhancedToolOrchestrator:
             "tools_executed": [],
             "findings": [],
             "execution_summary": {},
+            # config_id -> effective tool config; findings reference their config by id
+            "configs": {},
             "start_time": datetime.now().isoformat(),
             "user_config": custom_params
         }
         
-        # Execute tools for each target
+        # Tool runs are independent subprocesses, so run them concurrently; the semaphore
+        # caps how many run at once
+        semaphore = asyncio.Semaphore(custom_params.get("max_concurrency", settings.max_concurrent_tools))
+        use_cache = not custom_params.get("no_cache", False)
+        tool_names = [tool_name for tool_name in dict.fromkeys(tools) if tool_name in self.available_tools]
+        for tool_name in tool_names:
+            config = {**self.available_tools[tool_name].default_config, **custom_params.get(tool_name, {})}
+            results["configs"][_config_id(config)] = config
+        
+        # Tools that take a list of targets get every target in one process; the rest run once per target
+        batch_runs = [
+            self._run_tool_batch(tool_name, targets, custom_params.get(tool_name, {}), semaphore, use_cache, findings_queue)
+            for tool_name in tool_names
+            if self.available_tools[tool_name].supports_batch
+        ]
+        single_runs = {
+            (tool_name, target): self._run_tool(tool_name, target, custom_params.get(tool_name, {}), semaphore, use_cache, findings_queue)
+            for target in targets
+            for tool_name in tool_names
+            if not self.available_tools[tool_name].supports_batch
+        }
+        run_results = await asyncio.gather(*batch_runs, *single_runs.values())
+        
+        outcomes = dict(zip(single_runs, run_results[len(batch_runs):]))
+        for batch_outcome in run_results[:len(batch_runs)]:
+            outcomes.update(batch_outcome)
+        
+        # Fold results back in target/tool order so findings line up with the execution summary
         for target in targets:
-            for tool_name in tools:
-                if tool_name in self.available_tools:
-                    try:
-                        tool = self.available_tools[tool_name]
-                        
-                        # Apply user-specific configuration
-                        tool_config = custom_params.get(tool_name, {})
-                        
-                        print(f"🔧 Executing {tool_name} on {target} with config: {tool_config}")
-                        tool_results = await tool.execute(target, tool_config)
-                        
-                        results["tools_executed"].append(tool_name)
-                        results["findings"].extend(tool_results.get("findings", []))
-                        results["execution_summary"][f"{tool_name}_{target}"] = {
-                            "status": "completed",
-                            "findings_count": len(tool_results.get("findings", [])),
-                            "execution_time": tool_results.get("execution_time", 0),
-                            "config_used": tool_config
-                        }
-                        
-                    except Exception as e:
-                        print(f"❌ Error executing {tool_name}: {e}")
-                        results["execution_summary"][f"{tool_name}_{target}"] = {
-                            "status": "failed",
-                            "error": str(e),
-                            "findings_count": 0
-                        }
+            for tool_name in tool_names:
+                summary, findings = outcomes[(tool_name, target)]
+                if summary["status"] == "completed":
+                    results["tools_executed"].append(tool_name)
+                    results["findings"].extend(findings)
+                results["execution_summary"][f"{tool_name}_{target}"] = summary
         
         results["end_time"] = datetime.now().isoformat()
         results["total_findings"] = len(results["findings"])
+        results["confidence_by_type"] = _confidence_by_type(results["findings"])
         
         return results
     
+    async def _run_tool(self, tool_name: str, target: str, tool_config: Dict[str, Any], semaphore: asyncio.Semaphore, use_cache: bool = True, findings_queue: Optional[asyncio.Queue] = None) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Run one tool against one target, returning its summary entry and deduplicated findings"""
+        start_time_ns = time.time_ns()
+        try:
+            tool = self.available_tools[tool_name]
+            cache_key = _result_cache_key(tool_name, target, tool_config)
+            tool_results = self._get_cached_result(cache_key) if use_cache else None
+            cached = tool_results is not None
+            
+            if cached:
+                logger.info("♻️ Reusing cached %s results for %s", tool_name, target)
+                if findings_queue is not None:
+                    for finding in _dedupe_findings(tool_results.get("findings", [])):
+                        await findings_queue.put(finding)
+            elif use_cache and cache_key in self._inflight:
+                logger.info("⏳ Joining in-flight %s run for %s", tool_name, target)
+                tool_results = await asyncio.shield(self._inflight[cache_key])
+                cached = True
+                if findings_queue is not None:
+                    for finding in _dedupe_findings(tool_results.get("findings", [])):
+                        await findings_queue.put(finding)
+            else:
+                future = self._open_inflight(cache_key) if use_cache else None
+                try:
+                    async with semaphore, self._run_slots:
+                        start_time_ns = time.time_ns()
+                        logger.info("🔧 Executing %s on %s with config: %s", tool_name, target, tool_config)
+                        if findings_queue is None:
+                            tool_results = await tool.execute(target, tool_config)
+                        else:
+                            run_result = {}
+                            findings = await self._forward_findings(tool.execute_stream(target, tool_config, run_result), findings_queue)
+                            tool_results = {"findings": findings, **run_result}
+                except BaseException as e:
+                    self._close_inflight(cache_key, future, error=e)
+                    raise
+                
+                if tool_results.get("success"):
+                    self._store_result(cache_key, tool_results, tool.result_cache_ttl)
+                self._close_inflight(cache_key, future, tool_results)
+            
+            return self._summarize_run(tool_name, tool_config, tool_results, cached, start_time_ns)
+            
+        except Exception as e:
+            logger.warning("❌ Error executing %s: %s", tool_name, e, exc_info=True)
+            return self._failed_run(tool_name, e, start_time_ns)
+    
+    async def _run_tool_batch(self, tool_name: str, targets: List[str], tool_config: Dict[str, Any], semaphore: asyncio.Semaphore, use_cache: bool = True, findings_queue: Optional[asyncio.Queue] = None) -> Dict[Tuple[str, str], Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Run a batching tool once for all uncached targets, returning each target's summary entry and findings"""
+        tool = self.available_tools[tool_name]
+        outcomes = {}
+        pending = []
+        joined = {}
+        
+        for target in targets:
+            cache_key = _result_cache_key(tool_name, target, tool_config)
+            cached = self._get_cached_result(cache_key) if use_cache else None
+            if cached is None and use_cache and cache_key in self._inflight:
+                joined[target] = self._inflight[cache_key]
+            elif cached is None:
+                pending.append(target)
+            else:
+                logger.info("♻️ Reusing cached %s results for %s", tool_name, target)
+                if findings_queue is not None:
+                    for finding in _dedupe_findings(cached.get("findings", [])):
+                        await findings_queue.put(finding)
+                outcomes[(tool_name, target)] = self._summarize_run(tool_name, tool_config, cached, True, time.time_ns())
+        
+        if joined:
+            # Another batch already runs these targets with the same config; share its results
+            logger.info("⏳ Joining in-flight %s run for %s", tool_name, ", ".join(joined))
+            joined_start_ns = time.time_ns()
+            joined_results = await asyncio.gather(*(asyncio.shield(future) for future in joined.values()), return_exceptions=True)
+            for target, tool_results in zip(joined, joined_results):
+                if isinstance(tool_results, BaseException):
+                    outcomes[(tool_name, target)] = self._failed_run(tool_name, tool_results, joined_start_ns)
+                    continue
+                if findings_queue is not None:
+                    for finding in _dedupe_findings(tool_results.get("findings", [])):
+                        await findings_queue.put(finding)
+                outcomes[(tool_name, target)] = self._summarize_run(tool_name, tool_config, tool_results, True, joined_start_ns)
+        
+        if not pending:
+            return outcomes
+        
+        futures = {
+            target: self._open_inflight(_result_cache_key(tool_name, target, tool_config)) if use_cache else None
+            for target in pending
+        }
+        start_time_ns = time.time_ns()
+        try:
+            async with semaphore:
+                start_time_ns = time.time_ns()
+                logger.info("🔧 Executing %s on %s with config: %s", tool_name, ", ".join(pending), tool_config)
+                if findings_queue is None:
+                    batch_results = await self._execute_batch_coalesced(tool_name, pending, tool_config)
+                else:
+                    # A streamed run feeds a single consumer, so it isn't shared with other batches
+                    run_result = {}
+                    async with self._run_slots:
+                        findings = await self._forward_findings(tool.execute_batch_stream(pending, tool_config, run_result), findings_queue)
+                    batch_results = {"findings": findings, **run_result}
+        except BaseException as e:
+            for target, future in futures.items():
+                self._close_inflight(_result_cache_key(tool_name, target, tool_config), future, error=e)
+            if not isinstance(e, Exception):
+                raise
+            logger.warning("❌ Error executing %s: %s", tool_name, e, exc_info=True)
+            for target in pending:
+                outcomes[(tool_name, target)] = self._failed_run(tool_name, e, start_time_ns)
+            return outcomes
+        
+        # Split the combined output back into per-target results
+        findings_by_target: Dict[str, List[Dict[str, Any]]] = {target: [] for target in pending}
+        for finding in batch_results.get("findings", []):
+            findings_by_target[_match_target(finding["metadata"].get("target"), pending)].append(finding)
+        
+        for target in pending:
+            cache_key = _result_cache_key(tool_name, target, tool_config)
+            tool_results = {**batch_results, "findings": findings_by_target[target]}
+            if tool_results.get("success"):
+                self._store_result(cache_key, tool_results, tool.result_cache_ttl)
+            self._close_inflight(cache_key, futures[target], tool_results)
+            outcomes[(tool_name, target)] = self._summarize_run(tool_name, tool_config, tool_results, False, start_time_ns)
+        
+        return outcomes
+    
+    async def _execute_batch_coalesced(self, tool_name: str, targets: List[str], tool_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Join (or open) the pending batch for this tool, config and target set, returning its results"""
+        # Only identical target sets share a run: batched output often doesn't say which input a
+        # host came from (assetfinder prints bare subdomains), so findings from a run merged across
+        # requests couldn't be handed back to the request they belong to
+        targets = list(dict.fromkeys(targets))
+        batch_key = _result_cache_key(tool_name, "\n".join(sorted(targets)), tool_config)
+        pending = self._pending_batches.get(batch_key)
+        if pending is None:
+            pending = self._pending_batches[batch_key] = (targets, asyncio.get_running_loop().create_future())
+            asyncio.get_running_loop().call_later(
+                self.BATCH_COALESCE_WINDOW, self._launch_batch, batch_key, tool_name, tool_config
+            )
+        
+        # Shielded so one caller going away doesn't cancel the run the others are waiting on
+        return await asyncio.shield(pending[1])
+    
+    def _launch_batch(self, batch_key: str, tool_name: str, tool_config: Dict[str, Any]):
+        """Close the pending batch and run its targets in one process"""
+        targets, future = self._pending_batches.pop(batch_key)
+        
+        async def run():
+            try:
+                # The joined callers hold no run slot of their own, so the shared process takes one here
+                async with self._run_slots:
+                    batch_results = await self.available_tools[tool_name].execute_batch(targets, tool_config)
+                future.set_result(batch_results)
+            except BaseException as e:
+                # Resolve the future even when cancelled, or every joined caller would wait forever;
+                # they see the cancellation as a failure rather than being cancelled themselves
+                future.set_exception(RuntimeError("Shared batch run was cancelled") if isinstance(e, asyncio.CancelledError) else e)
+                # Mark the error as retrieved; the joined callers may all have gone already
+                future.exception()
+                if not isinstance(e, Exception):
+                    raise
+        
+        task = asyncio.get_running_loop().create_task(run())
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _forward_findings(self, findings: AsyncIterator[Dict[str, Any]], findings_queue: asyncio.Queue) -> List[Dict[str, Any]]:
+        """Put each finding on the queue as it arrives, skipping repeats within the run, and return them all"""
+        collected = []
+        seen = set()
+        async for finding in findings:
+            collected.append(finding)
+            key = (finding.get("type"), finding.get("value"))
+            if key not in seen:
+                seen.add(key)
+                await findings_queue.put(finding)
+        
+        return collected
+    
+    def _open_inflight(self, cache_key: str) -> asyncio.Future:
+        """Register a run that is starting, so identical runs can await it"""
+        future = self._inflight[cache_key] = asyncio.get_running_loop().create_future()
+        return future
+    
+    def _close_inflight(self, cache_key: str, future: Optional[asyncio.Future], tool_results: Optional[Dict[str, Any]] = None, error: Optional[BaseException] = None):
+        """Hand a finished run's results, or its error, to the runs that joined it"""
+        if future is None:
+            return
+        if self._inflight.get(cache_key) is future:
+            del self._inflight[cache_key]
+        
+        if error is None:
+            future.set_result(tool_results)
+        else:
+            # Joined runs report a cancelled run as failed rather than being cancelled themselves
+            future.set_exception(RuntimeError("Shared tool run was cancelled") if isinstance(error, asyncio.CancelledError) else error)
+            # Mark the error as retrieved; joined runs re-raise it, and there may be none
+            future.exception()
+    
+    def _summarize_run(self, tool_name: str, tool_config: Dict[str, Any], tool_results: Dict[str, Any], cached: bool, start_time_ns: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Build the execution summary entry and deduplicated findings for a completed run"""
+        findings = _dedupe_findings(tool_results.get("findings", []))
+        
+        return {
+            "tool_name": tool_name,
+            "status": "completed",
+            "findings_count": len(findings),
+            "execution_time": tool_results.get("execution_time", 0),
+            "config_used": tool_config,
+            "errors": tool_results.get("errors", []),
+            "cached": cached,
+            "start_time_ns": start_time_ns,
+            "end_time_ns": time.time_ns()
+        }, findings
+    
+    def _failed_run(self, tool_name: str, error: Exception, start_time_ns: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Build the execution summary entry for a run that raised"""
+        return {
+            "tool_name": tool_name,
+            "status": "failed",
+            "error": str(error),
+            "findings_count": 0,
+            "start_time_ns": start_time_ns,
+            "end_time_ns": time.time_ns()
+        }, []
+    
+    def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached tool result if it has not expired"""
+        cached = self._result_cache.get(cache_key)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic():
+            del self._result_cache[cache_key]
+            return None
+        
+        self._result_cache.move_to_end(cache_key)
+        return cached[1]
+    
+    def _store_result(self, cache_key: str, tool_results: Dict[str, Any], ttl: float):
+        """Cache a successful tool result, evicting the least recently used entry when full"""
+        if ttl <= 0:
+            return
+        self._result_cache[cache_key] = (time.monotonic() + ttl, tool_results)
+        self._result_cache.move_to_end(cache_key)
+        if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
     async def get_tool_capabilities(self, tool_name: str) -> Dict[str, Any]:
         """Get detailed capabilities and configuration options for a tool"""
-        if tool_name in self.available_tools:
-            return await self.available_tools[tool_name].get_capabilities()
-        return {}
+        if tool_name not in self.available_tools:
+            return {}
+        
+        async with self._capabilities_locks[tool_name]:
+            cached = self._capabilities_cache.get(tool_name)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            
+            capabilities = await self.available_tools[tool_name].get_capabilities()
+            self._capabilities_cache[tool_name] = (time.monotonic() + self.CAPABILITIES_TTL, capabilities)
+            return capabilities
+    
+    async def get_all_capabilities(self, tool_names: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Get capabilities for several tools concurrently, skipping unknown tools and failed probes"""
+        results = await asyncio.gather(
+            *(self.get_tool_capabilities(tool_name) for tool_name in tool_names),
+            return_exceptions=True
+        )
+        return {
+            tool_name: capabilities
+            for tool_name, capabilities in zip(tool_names, results)
+            if capabilities and not isinstance(capabilities, BaseException)
+        }
     
     async def validate_tool_config(self, tool_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate user configuration for a specific tool"""
@@ -106,43 +639,218 @@ class EnhancedToolOrchestrator:
             return await self.available_tools[tool_name].validate_config(config)
         return {"valid": False, "errors": ["Tool not found"]}
 
+class _CommandStream:
+    """Run a command and iterate its stdout line by line as it is produced.
+    
+    Used as an async context manager; leaving the block early (or hitting the timeout)
+    terminates the process. Once the block exits, ``result`` holds the same fields as
+    ``_run_command`` returns, minus stdout. With ``raw`` set, lines are yielded as bytes
+    for parsers that take bytes (orjson, XMLPullParser) instead of being decoded first.
+    """
+    
+    # Largest single output line accepted from a tool; tied to the finding value bound so a
+    # value parsed from a line always passes response validation
+    LINE_LIMIT = FINDING_VALUE_MAX_LENGTH
+    
+    def __init__(self, command: List[str], timeout: int, input_data: str = None, raw: bool = False):
+        self.command = command
+        self.timeout = timeout
+        self.input_data = input_data
+        self.raw = raw
+        self.result: Dict[str, Any] = {}
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._start_time = 0.0
+        self._finished = False
+        self._timed_out = False
+        self._error: Optional[str] = None
+    
+    async def __aenter__(self) -> "_CommandStream":
+        self._start_time = time.monotonic()
+        logger.debug("🚀 Running command: %s", self.command)
+        
+        try:
+            self._process = await _spawn_tool(
+                self.command,
+                stdin=asyncio.subprocess.PIPE if self.input_data else None,
+                limit=self.LINE_LIMIT
+            )
+        except Exception as e:
+            self._error = str(e)
+            return self
+        
+        # Drain stderr alongside stdout so a chatty tool can't stall on a full pipe
+        self._stderr_task = asyncio.create_task(self._process.stderr.read())
+        if self.input_data:
+            self._process.stdin.write(self.input_data.encode())
+            self._process.stdin.close()
+        return self
+    
+    async def __aiter__(self):
+        if self._process is None:
+            return
+        
+        deadline = self._start_time + self.timeout
+        raw_lines = self.raw
+        while True:
+            try:
+                raw = await asyncio.wait_for(self._process.stdout.readline(), timeout=deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                self._timed_out = True
+                return
+            except ValueError:
+                # A line longer than LINE_LIMIT; readline has discarded it (or the buffered part of
+                # it, leaving the rest to fail parsing), so skip it rather than end the run
+                logger.warning("Skipped an output line over %d bytes from %s", self.LINE_LIMIT, self.command[0])
+                continue
+            
+            if not raw:
+                self._finished = True
+                return
+            
+            # Strip and skip blank lines on the raw bytes so each line is decoded at most once
+            raw = raw.strip()
+            if raw:
+                yield raw if raw_lines else raw.decode('utf-8', errors='ignore')
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        process = self._process
+        stopped_early = False
+        
+        if process is not None:
+            if process.returncode is None and not self._finished:
+                # The caller stopped reading (limit reached, error) or the timeout hit
+                stopped_early = not self._timed_out and exc_type is None
+                try:
+                    process.terminate()
+                except ProcessLookupError:
+                    pass
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+            # A child the tool spawned may still hold stderr open, so don't wait on it for long
+            try:
+                stderr = (await asyncio.wait_for(self._stderr_task, timeout=1)).decode('utf-8', errors='ignore')
+            except asyncio.TimeoutError:
+                self._stderr_task.cancel()
+                stderr = ""
+        
+        if self._timed_out:
+            self.result = {
+                "success": False,
+                "stderr": f"Command timed out after {self.timeout} seconds",
+                "returncode": -1,
+                "execution_time": self.timeout,
+                "command": ' '.join(self.command)
+            }
+        elif process is None:
+            self.result = {
+                "success": False,
+                "stderr": self._error or "",
+                "returncode": -1,
+                "execution_time": time.monotonic() - self._start_time,
+                "command": ' '.join(self.command)
+            }
+        else:
+            self.result = {
+                # Stopping a tool on purpose once enough output was read still counts as success
+                "success": process.returncode == 0 or stopped_early,
+                "stderr": stderr,
+                "returncode": process.returncode,
+                "execution_time": time.monotonic() - self._start_time,
+                "command": ' '.join(self.command)
+            }
+        return False
+
 class EnhancedBaseToolPlugin:
     """Enhanced base class for reconnaissance tool plugins with full customization"""
     
+    # Seconds an identical run's result is reused by the orchestrator; 0 disables caching
+    result_cache_ttl = 300
+    # Tools that take a list of targets (on stdin or from a file) implement execute_batch and are
+    # run once per workflow instead of once per target
+    supports_batch = False
+    # Option specs and their defaults are fixed per tool, so subclasses define them once at
+    # class level as read-only mappings shared by every instance
+    supported_options: Mapping[str, Dict[str, Any]] = MappingProxyType({})
+    default_config: Mapping[str, Any] = MappingProxyType({})
+    # (option, flag, formatter) for options that map straight onto a CLI flag, added in order
+    # by _add_cli_flags when the option is set; a None formatter marks a switch without a value
+    cli_flags: Tuple[Tuple[str, str, Optional[Callable[[Any], str]]], ...] = ()
+    # Distinct configs whose option argv is kept by _option_argv
+    ARGV_CACHE_SIZE = 64
+    
     def __init__(self, tool_name: str, tool_path: str):
         self.tool_name = tool_name
         self.tool_path = tool_path
-        self.default_config = {}
-        self.supported_options = {}
+        # Probe results for the installed binary; only successful probes are remembered so a
+        # tool installed while the server runs is still picked up
+        self._available: Optional[bool] = None
+        self._version: Optional[str] = None
+        self._probe_lock = asyncio.Lock()
+        # config_id -> option argv from _build_option_argv
+        self._argv_cache: Dict[str, Tuple[str, ...]] = {}
+        # Directory holding this plugin's per-run scratch directories, created on first use
+        self._scratch_root: Optional[str] = None
     
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute the tool with user customization"""
         raise NotImplementedError
     
+    async def execute_batch(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Execute the tool once for several targets; each finding's metadata names its target"""
+        raise NotImplementedError
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield findings as the tool produces them.
+        
+        Once the stream is exhausted, ``run_result`` (if given) holds the rest of what
+        ``execute`` returns. Plugins that parse output line by line override this; the
+        default waits for ``execute`` to finish.
+        """
+        tool_results = await self.execute(target, user_config)
+        if run_result is not None:
+            run_result.update((key, value) for key, value in tool_results.items() if key != "findings")
+        for finding in tool_results.get("findings", []):
+            yield finding
+    
+    async def execute_batch_stream(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming counterpart of execute_batch; see execute_stream"""
+        tool_results = await self.execute_batch(targets, user_config)
+        if run_result is not None:
+            run_result.update((key, value) for key, value in tool_results.items() if key != "findings")
+        for finding in tool_results.get("findings", []):
+            yield finding
+    
     async def get_capabilities(self) -> Dict[str, Any]:
         """Get tool capabilities and configuration options"""
+        available, version = await asyncio.gather(
+            self._check_tool_availability(),
+            self._get_tool_version()
+        )
         return {
             "name": self.tool_name,
             "path": self.tool_path,
-            "available": await self._check_tool_availability(),
-            "version": await self._get_tool_version(),
-            "supported_options": self.supported_options,
-            "default_config": self.default_config,
+            "available": available,
+            "version": version,
+            "supported_options": dict(self.supported_options),
+            "default_config": dict(self.default_config),
             "description": self._get_description()
         }
     
     async def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate user configuration"""
-        errors = []
-        warnings = []
+        warnings = [f"Unknown option: {key}" for key in config if key not in self.supported_options]
         
-        for key, value in config.items():
-            if key not in self.supported_options:
-                warnings.append(f"Unknown option: {key}")
-            else:
-                option_info = self.supported_options[key]
-                if not self._validate_option_value(key, value, option_info):
-                    errors.append(f"Invalid value for {key}: {value}")
+        errors = []
+        try:
+            self._config_model().model_validate(config)
+        except ValidationError as e:
+            # One message per offending option, in the order pydantic reports them
+            for key in dict.fromkeys(error["loc"][0] for error in e.errors()):
+                errors.append(f"Invalid value for {key}: {config[key]}")
         
         return {
             "valid": len(errors) == 0,
@@ -150,56 +858,75 @@ class EnhancedBaseToolPlugin:
             "warnings": warnings
         }
     
-    def _validate_option_value(self, key: str, value: Any, option_info: Dict[str, Any]) -> bool:
-        """Validate a specific option value"""
+    @classmethod
+    def _config_model(cls) -> type:
+        """Pydantic model compiled from supported_options, built once per plugin class"""
+        model = cls.__dict__.get("_compiled_config_model")
+        if model is None:
+            fields = {key: cls._option_field(info) for key, info in cls.supported_options.items()}
+            # Strict so values are type-checked rather than coerced; unknown keys only warn
+            model = create_model(
+                f"{cls.__name__}Config",
+                __config__=ConfigDict(strict=True, extra="ignore"),
+                **fields
+            )
+            cls._compiled_config_model = model
+        return model
+    
+    @staticmethod
+    def _option_field(option_info: Mapping[str, Any]) -> Tuple[Any, Any]:
+        """Field type and constraints for one supported option"""
         expected_type = option_info.get("type", "string")
-        
-        if expected_type == "integer" and not isinstance(value, int):
-            return False
-        elif expected_type == "boolean" and not isinstance(value, bool):
-            return False
-        elif expected_type == "list" and not isinstance(value, list):
-            return False
-        elif expected_type == "string" and not isinstance(value, str):
-            return False
-        
-        # Check allowed values
         allowed_values = option_info.get("allowed_values")
-        if allowed_values and value not in allowed_values:
-            return False
+        allowed = Literal[tuple(allowed_values)] if allowed_values else None
         
-        # Check ranges for integers
+        # Defaults aren't validated, so a None default lets any option be omitted while an
+        # explicit null is still rejected
         if expected_type == "integer":
-            min_val = option_info.get("min")
-            max_val = option_info.get("max")
-            if min_val is not None and value < min_val:
-                return False
-            if max_val is not None and value > max_val:
-                return False
-        
-        return True
+            return int, Field(None, ge=option_info.get("min"), le=option_info.get("max"))
+        if expected_type == "boolean":
+            return bool, None
+        if expected_type == "list":
+            # allowed_values on a list option restricts its items
+            return List[allowed or Any], None
+        return allowed or str, None
     
     async def _check_tool_availability(self) -> bool:
-        """Check if the tool is available on the system"""
+        """Check if the tool is available on the system, probing it at most once when present"""
+        if self._available:
+            return True
+        # An executable on PATH (or at the configured path) is enough; only fork the tool
+        # when that lookup fails
+        if shutil.which(self.tool_path) is not None:
+            self._available = True
+            return True
+        async with self._probe_lock:
+            if not self._available:
+                self._available = await self._probe_availability()
+        return self._available
+    
+    async def _get_tool_version(self) -> str:
+        """Get tool version, probing it at most once when it can be read"""
+        if self._version is not None:
+            return self._version
+        version = _tool_versions().get(self.tool_path) or await self._probe_version()
+        if version != "Unknown":
+            self._version = version
+        return version
+    
+    async def _probe_availability(self) -> bool:
+        """Run the tool's --help to check it is installed"""
         try:
-            process = await asyncio.create_subprocess_exec(
-                self.tool_path, "--help",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            process = await _spawn_tool([self.tool_path, "--help"])
             await asyncio.wait_for(process.communicate(), timeout=5)
             return process.returncode == 0
         except:
             return False
     
-    async def _get_tool_version(self) -> str:
-        """Get tool version"""
+    async def _probe_version(self) -> str:
+        """Run the tool's --version and return the first line of output"""
         try:
-            process = await asyncio.create_subprocess_exec(
-                self.tool_path, "--version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            process = await _spawn_tool([self.tool_path, "--version"])
             stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=5)
             version_output = stdout.decode('utf-8', errors='ignore') + stderr.decode('utf-8', errors='ignore')
             return version_output.strip().split('\n')[0] if version_output else "Unknown"
@@ -210,20 +937,75 @@ class EnhancedBaseToolPlugin:
         """Get tool description"""
         return f"{self.tool_name} reconnaissance tool"
     
+    @contextlib.asynccontextmanager
+    async def _scratch_dir(self) -> AsyncIterator[str]:
+        """Create a working directory for one run under the plugin's scratch root, removed afterwards"""
+        if self._scratch_root is None:
+            self._scratch_root = tempfile.mkdtemp(prefix=f"reconiq-{self.tool_name}-")
+            atexit.register(shutil.rmtree, self._scratch_root, ignore_errors=True)
+        try:
+            run_dir = tempfile.mkdtemp(dir=self._scratch_root)
+        except FileNotFoundError:
+            # The scratch root was cleaned up under us (e.g. by tmpfiles); recreate it
+            os.makedirs(self._scratch_root, exist_ok=True)
+            run_dir = tempfile.mkdtemp(dir=self._scratch_root)
+        
+        try:
+            yield run_dir
+        finally:
+            # Runs can leave hundreds of screenshots behind, so delete them off the event loop
+            await asyncio.to_thread(shutil.rmtree, run_dir, ignore_errors=True)
+    
+    def _stream_command(self, command: List[str], timeout: int = None, input_data: str = None, raw: bool = False) -> _CommandStream:
+        """Run a command and stream its stdout lines; see _CommandStream"""
+        return _CommandStream(command, timeout or settings.default_timeout, input_data, raw)
+    
+    def _build_option_argv(self, config: Mapping[str, Any]) -> List[str]:
+        """Command-line options for an effective config, without the tool path or target"""
+        raise NotImplementedError
+    
+    def _option_argv(self, config: Mapping[str, Any], config_id: str) -> Tuple[str, ...]:
+        """Options for this config, built once per distinct config; most runs use the defaults"""
+        argv = self._argv_cache.get(config_id)
+        if argv is None:
+            argv = tuple(self._build_option_argv(config))
+            if len(self._argv_cache) >= self.ARGV_CACHE_SIZE:
+                # Drop the oldest entry
+                del self._argv_cache[next(iter(self._argv_cache))]
+            self._argv_cache[config_id] = argv
+        return argv
+    
+    def _add_cli_flags(self, command: List[str], config: Mapping[str, Any]) -> List[str]:
+        """Append the flag (and formatted value) for every set option in cli_flags"""
+        for option, flag, formatter in self.cli_flags:
+            value = config.get(option)
+            if not value:
+                continue
+            command.append(flag)
+            if formatter is not None:
+                command.append(formatter(value))
+        return command
+    
+    def _stream_result(self, result: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        """The non-finding fields of execute's return value, from a finished _CommandStream's result"""
+        return {
+            "execution_time": result["execution_time"],
+            "success": result["success"],
+            "errors": [result["stderr"]] if result["stderr"] else [],
+            "command_executed": result["command"],
+            "config_used": config
+        }
+    
     async def _run_command(self, command: List[str], timeout: int = None, input_data: str = None) -> Dict[str, Any]:
         """Run a command with enhanced options"""
         timeout = timeout or settings.default_timeout
-        start_time = datetime.now()
+        start_time = time.monotonic()
+        process = None
         
         try:
-            print(f"🚀 Running command: {' '.join(command)}")
+            logger.debug("🚀 Running command: %s", command)
             
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                stdin=asyncio.subprocess.PIPE if input_data else None
-            )
+            process = await _spawn_tool(command, stdin=asyncio.subprocess.PIPE if input_data else None)
             
             if input_data:
                 stdout, stderr = await asyncio.wait_for(
@@ -236,7 +1018,7 @@ class EnhancedBaseToolPlugin:
                     timeout=timeout
                 )
             
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.monotonic() - start_time
             
             return {
                 "success": process.returncode == 0,
@@ -262,193 +1044,197 @@ class EnhancedBaseToolPlugin:
                 "stdout": "",
                 "stderr": str(e),
                 "returncode": -1,
-                "execution_time": (datetime.now() - start_time).total_seconds(),
+                "execution_time": time.monotonic() - start_time,
                 "command": ' '.join(command)
             }
+        finally:
+            # A timed-out, failed or cancelled run must not leave the tool running: kill it and
+            # reap it so no zombie or open pipes are left behind
+            if process is not None and process.returncode is None:
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                # A child the tool spawned may keep the pipes open, so don't wait on it forever
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(process.wait(), timeout=5)
 
 class EnhancedSubfinderPlugin(EnhancedBaseToolPlugin):
+    supported_options = MappingProxyType({
+        "sources": {
+            "type": "list",
+            "description": "Specific sources to use for enumeration",
+            "allowed_values": ["shodan", "censys", "fofa", "spyse", "recon", "dnsdumpster", "hackertarget"],
+            "default": []
+        },
+        "exclude_sources": {
+            "type": "list", 
+            "description": "Sources to exclude from enumeration",
+            "default": []
+        },
+        "max_time": {
+            "type": "integer",
+            "description": "Maximum time in minutes for enumeration",
+            "min": 1,
+            "max": 60,
+            "default": 10
+        },
+        "threads": {
+            "type": "integer",
+            "description": "Number of concurrent threads",
+            "min": 1,
+            "max": 100,
+            "default": 10
+        },
+        "recursive": {
+            "type": "boolean",
+            "description": "Enable recursive subdomain enumeration",
+            "default": False
+        },
+        "wordlist": {
+            "type": "string",
+            "description": "Path to custom wordlist file",
+            "default": ""
+        },
+        "output_format": {
+            "type": "string",
+            "description": "Output format",
+            "allowed_values": ["txt", "json"],
+            "default": "txt"
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    cli_flags = (
+        ("sources", "-sources", _comma_list),
+        ("exclude_sources", "-exclude-sources", _comma_list),
+        ("max_time", "-timeout", str),
+        ("threads", "-t", str),
+        ("recursive", "-recursive", None)
+    )
+    
     def __init__(self):
         super().__init__("subfinder", settings.subfinder_path)
-        self.supported_options = {
-            "sources": {
-                "type": "list",
-                "description": "Specific sources to use for enumeration",
-                "allowed_values": ["shodan", "censys", "fofa", "spyse", "recon", "dnsdumpster", "hackertarget"],
-                "default": []
-            },
-            "exclude_sources": {
-                "type": "list", 
-                "description": "Sources to exclude from enumeration",
-                "default": []
-            },
-            "max_time": {
-                "type": "integer",
-                "description": "Maximum time in minutes for enumeration",
-                "min": 1,
-                "max": 60,
-                "default": 10
-            },
-            "threads": {
-                "type": "integer",
-                "description": "Number of concurrent threads",
-                "min": 1,
-                "max": 100,
-                "default": 10
-            },
-            "recursive": {
-                "type": "boolean",
-                "description": "Enable recursive subdomain enumeration",
-                "default": False
-            },
-            "wordlist": {
-                "type": "string",
-                "description": "Path to custom wordlist file",
-                "default": ""
-            },
-            "output_format": {
-                "type": "string",
-                "description": "Output format",
-                "allowed_values": ["txt", "json"],
-                "default": "txt"
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Fast passive subdomain discovery tool with multiple data sources"
     
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute subfinder with advanced configuration"""
+        run_result = {}
+        findings = [finding async for finding in self.execute_stream(target, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield subdomains as subfinder reports them"""
         config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
         
-        command = [self.tool_path, "-d", target, "-silent"]
-        
-        # Add sources
-        if config.get("sources"):
-            command.extend(["-sources", ",".join(config["sources"])])
-        
-        # Add excluded sources
-        if config.get("exclude_sources"):
-            command.extend(["-exclude-sources", ",".join(config["exclude_sources"])])
-        
-        # Add max time
-        if config.get("max_time"):
-            command.extend(["-timeout", str(config["max_time"])])
-        
-        # Add threads
-        if config.get("threads"):
-            command.extend(["-t", str(config["threads"])])
-        
-        # Add recursive
-        if config.get("recursive"):
-            command.append("-recursive")
+        command = self._add_cli_flags([self.tool_path, "-d", target, "-silent"], config)
         
         # Add wordlist
-        if config.get("wordlist") and os.path.exists(config["wordlist"]):
+        if config.get("wordlist") and _wordlist_ok(config["wordlist"]):
             command.extend(["-w", config["wordlist"]])
         
         # Add output format
         if config.get("output_format") == "json":
             command.append("-json")
         
-        result = await self._run_command(command, timeout=config.get("max_time", 10) * 60)
-        findings = []
+        # Sources report the same subdomain repeatedly; keep the first sighting only
+        seen = {target}
         
-        if result["success"] and result["stdout"]:
-            if config.get("output_format") == "json":
-                # Parse JSON output
-                for line in result["stdout"].strip().split('\n'):
+        # Parse output as it is produced instead of buffering all of stdout
+        async with self._stream_command(command, timeout=config.get("max_time", 10) * 60) as stream:
+            async for line in stream:
+                if config.get("output_format") == "json":
+                    # Parse JSON output
                     try:
-                        data = json.loads(line)
-                        subdomain = data.get("host", "")
-                        if subdomain and subdomain != target:
-                            findings.append({
-                                "type": FindingType.SUBDOMAIN.value,
-                                "value": subdomain,
-                                "source": "subfinder",
-                                "confidence": 0.9,
-                                "metadata": {
-                                    "target": target,
-                                    "source_name": data.get("source", "unknown"),
-                                    "config": config
-                                }
-                            })
-                    except json.JSONDecodeError:
+                        data = orjson.loads(line)
+                    except orjson.JSONDecodeError:
                         continue
-            else:
-                # Parse text output
-                subdomains = result["stdout"].strip().split('\n')
-                for subdomain in subdomains:
-                    subdomain = subdomain.strip()
-                    if subdomain and subdomain != target:
-                        findings.append({
-                            "type": FindingType.SUBDOMAIN.value,
+                    subdomain = data.get("host", "")
+                    if subdomain and subdomain not in seen:
+                        seen.add(subdomain)
+                        yield {
+                            "type": _FT_SUBDOMAIN,
                             "value": subdomain,
                             "source": "subfinder",
                             "confidence": 0.9,
-                            "metadata": {"target": target, "config": config}
-                        })
+                            "metadata": {
+                                "target": target,
+                                "source_name": data.get("source", "unknown"),
+                                "config_id": config_id
+                            }
+                        }
+                elif line not in seen:
+                    # Parse text output
+                    seen.add(line)
+                    yield {
+                        "type": _FT_SUBDOMAIN,
+                        "value": line,
+                        "source": "subfinder",
+                        "confidence": 0.9,
+                        "metadata": {"target": target, "config_id": config_id}
+                    }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
 
 class EnhancedAmassPlugin(EnhancedBaseToolPlugin):
+    supported_options = MappingProxyType({
+        "mode": {
+            "type": "string",
+            "description": "Enumeration mode",
+            "allowed_values": ["passive", "active", "intel"],
+            "default": "passive"
+        },
+        "sources": {
+            "type": "list",
+            "description": "Specific data sources to use",
+            "default": []
+        },
+        "exclude_sources": {
+            "type": "list",
+            "description": "Data sources to exclude",
+            "default": []
+        },
+        "max_dns_queries": {
+            "type": "integer",
+            "description": "Maximum DNS queries per minute",
+            "min": 100,
+            "max": 10000,
+            "default": 1000
+        },
+        "timeout": {
+            "type": "integer",
+            "description": "Timeout in minutes",
+            "min": 1,
+            "max": 120,
+            "default": 30
+        },
+        "wordlist": {
+            "type": "string",
+            "description": "Path to custom wordlist",
+            "default": ""
+        },
+        "brute_force": {
+            "type": "boolean",
+            "description": "Enable brute force enumeration",
+            "default": False
+        },
+        "alterations": {
+            "type": "boolean",
+            "description": "Enable subdomain alterations",
+            "default": False
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    cli_flags = (
+        ("sources", "-src", _comma_list),
+        ("exclude_sources", "-exclude", _comma_list),
+        ("max_dns_queries", "-max-dns-queries", str),
+        ("alterations", "-alts", None)
+    )
+    
     def __init__(self):
         super().__init__("amass", settings.amass_path)
-        self.supported_options = {
-            "mode": {
-                "type": "string",
-                "description": "Enumeration mode",
-                "allowed_values": ["passive", "active", "intel"],
-                "default": "passive"
-            },
-            "sources": {
-                "type": "list",
-                "description": "Specific data sources to use",
-                "default": []
-            },
-            "exclude_sources": {
-                "type": "list",
-                "description": "Data sources to exclude",
-                "default": []
-            },
-            "max_dns_queries": {
-                "type": "integer",
-                "description": "Maximum DNS queries per minute",
-                "min": 100,
-                "max": 10000,
-                "default": 1000
-            },
-            "timeout": {
-                "type": "integer",
-                "description": "Timeout in minutes",
-                "min": 1,
-                "max": 120,
-                "default": 30
-            },
-            "wordlist": {
-                "type": "string",
-                "description": "Path to custom wordlist",
-                "default": ""
-            },
-            "brute_force": {
-                "type": "boolean",
-                "description": "Enable brute force enumeration",
-                "default": False
-            },
-            "alterations": {
-                "type": "boolean",
-                "description": "Enable subdomain alterations",
-                "default": False
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "In-depth DNS enumeration and network mapping with multiple modes"
@@ -456,6 +1242,7 @@ class EnhancedAmassPlugin(EnhancedBaseToolPlugin):
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute amass with advanced configuration"""
         config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
         
         mode = config.get("mode", "passive")
         
@@ -467,49 +1254,36 @@ class EnhancedAmassPlugin(EnhancedBaseToolPlugin):
             if mode == "passive":
                 command.append("-passive")
         
-        # Add sources
-        if config.get("sources"):
-            command.extend(["-src", ",".join(config["sources"])])
-        
-        # Add excluded sources  
-        if config.get("exclude_sources"):
-            command.extend(["-exclude", ",".join(config["exclude_sources"])])
-        
-        # Add DNS query limit
-        if config.get("max_dns_queries"):
-            command.extend(["-max-dns-queries", str(config["max_dns_queries"])])
+        self._add_cli_flags(command, config)
         
         # Add wordlist for brute force
-        if config.get("brute_force") and config.get("wordlist") and os.path.exists(config["wordlist"]):
+        if config.get("brute_force") and config.get("wordlist") and _wordlist_ok(config["wordlist"]):
             command.extend(["-brute", "-w", config["wordlist"]])
         
-        # Add alterations
-        if config.get("alterations"):
-            command.append("-alts")
-        
         # Always use silent mode for API
         command.append("-silent")
         
         timeout_minutes = config.get("timeout", 30)
-        result = await self._run_command(command, timeout=timeout_minutes * 60)
         findings = []
+        seen = {target}
         
-        if result["success"] and result["stdout"]:
-            subdomains = result["stdout"].strip().split('\n')
-            for subdomain in subdomains:
-                subdomain = subdomain.strip()
-                if subdomain and subdomain != target:
+        # Each stdout line is decoded once as it arrives instead of decoding and splitting the whole output
+        async with self._stream_command(command, timeout=timeout_minutes * 60) as stream:
+            async for subdomain in stream:
+                if subdomain not in seen:
+                    seen.add(subdomain)
                     findings.append({
-                        "type": FindingType.SUBDOMAIN.value,
+                        "type": _FT_SUBDOMAIN,
                         "value": subdomain,
                         "source": "amass",
                         "confidence": 0.95,
                         "metadata": {
                             "target": target,
                             "mode": mode,
-                            "config": config
+                            "config_id": config_id
                         }
                     })
+        result = stream.result
         
         return {
             "findings": findings,
@@ -521,382 +1295,411 @@ class EnhancedAmassPlugin(EnhancedBaseToolPlugin):
         }
 
 class EnhancedWaybackurlsPlugin(EnhancedBaseToolPlugin):
+    supports_batch = True
+    
+    supported_options = MappingProxyType({
+        "get_versions": {
+            "type": "boolean",
+            "description": "Get all versions of URLs",
+            "default": False
+        },
+        "no_subs": {
+            "type": "boolean", 
+            "description": "Don't include subdomains",
+            "default": False
+        },
+        "dates": {
+            "type": "boolean",
+            "description": "Show dates in output",
+            "default": False
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Limit number of URLs returned",
+            "min": 1,
+            "max": 10000,
+            "default": 1000
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    cli_flags = (
+        ("get_versions", "-get-versions", None),
+        ("no_subs", "-no-subs", None),
+        ("dates", "-dates", None)
+    )
+    
     def __init__(self):
         super().__init__("waybackurls", settings.waybackurls_path)
-        self.supported_options = {
-            "get_versions": {
-                "type": "boolean",
-                "description": "Get all versions of URLs",
-                "default": False
-            },
-            "no_subs": {
-                "type": "boolean", 
-                "description": "Don't include subdomains",
-                "default": False
-            },
-            "dates": {
-                "type": "boolean",
-                "description": "Show dates in output",
-                "default": False
-            },
-            "limit": {
-                "type": "integer",
-                "description": "Limit number of URLs returned",
-                "min": 1,
-                "max": 10000,
-                "default": 1000
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Fetch URLs from Wayback Machine archives with filtering options"
     
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute waybackurls with configuration"""
+        return await self.execute_batch([target], user_config)
+    
+    async def execute_batch(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fetch archived URLs for every target in one waybackurls process, feeding them on stdin"""
+        run_result = {}
+        findings = [finding async for finding in self.execute_batch_stream(targets, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield archived URLs as waybackurls reports them"""
+        async for finding in self.execute_batch_stream([target], user_config, run_result):
+            yield finding
+    
+    async def execute_batch_stream(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield archived URLs for every target from one waybackurls process"""
         config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
+        
+        command = self._add_cli_flags([self.tool_path], config)
+        
+        limit = config.get("limit", 1000)
+        line_counts = {target: 0 for target in targets}
+        # The archive returns the same URL once per snapshot; keep the first and count only unique URLs
+        seen = set()
+        
+        # Use stdin for targets; the process is stopped as soon as every target reached the limit
+        async with self._stream_command(command, input_data="".join(f"{target}\n" for target in targets)) as stream:
+            async for url in stream:
+                # Parse date if available
+                date_info = None
+                if config.get("dates") and " " in url:
+                    parts = url.split(" ", 1)
+                    if len(parts) == 2:
+                        date_info = parts[0]
+                        url = parts[1]
+                
+                if not url.startswith(_HTTP_PREFIXES) or url in seen:
+                    continue
+                seen.add(url)
+                
+                try:
+                    hostname = urlsplit(url).hostname
+                except ValueError:
+                    continue  # Malformed archived URL, e.g. an unclosed IPv6 bracket
+                target = _match_target(hostname, targets)
+                if line_counts[target] >= limit:
+                    continue
+                line_counts[target] += 1
+                
+                yield {
+                    "type": _FT_HISTORICAL_URL,
+                    "value": url,
+                    "source": "waybackurls",
+                    "confidence": 0.8,
+                    "metadata": {
+                        "target": target,
+                        "date": date_info,
+                        "config_id": config_id
+                    }
+                }
+                
+                if all(count >= limit for count in line_counts.values()):
+                    break
         
-        command = [self.tool_path]
-        
-        # Add options
-        if config.get("get_versions"):
-            command.append("-get-versions")
-        
-        if config.get("no_subs"):
-            command.append("-no-subs")
-        
-        if config.get("dates"):
-            command.append("-dates")
-        
-        # Use stdin for target
-        result = await self._run_command(command, input_data=target)
-        findings = []
-        
-        if result["success"] and result["stdout"]:
-            urls = result["stdout"].strip().split('\n')
-            limit = config.get("limit", 1000)
-            
-            for url in urls[:limit]:
-                url = url.strip()
-                if url and url.startswith(('http://', 'https://')):
-                    # Parse date if available
-                    date_info = None
-                    if config.get("dates") and " " in url:
-                        parts = url.split(" ", 1)
-                        if len(parts) == 2:
-                            date_info = parts[0]
-                            url = parts[1]
-                    
-                    findings.append({
-                        "type": FindingType.HISTORICAL_URL.value,
-                        "value": url,
-                        "source": "waybackurls",
-                        "confidence": 0.8,
-                        "metadata": {
-                            "target": target,
-                            "date": date_info,
-                            "config": config
-                        }
-                    })
-        
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
 
 class EnhancedHttpxPlugin(EnhancedBaseToolPlugin):
+    # Probes live hosts, so results go stale sooner than passive sources
+    result_cache_ttl = 60
+    supports_batch = True
+    
+    supported_options = MappingProxyType({
+        "threads": {
+            "type": "integer",
+            "description": "Number of threads",
+            "min": 1,
+            "max": 300,
+            "default": 50
+        },
+        "timeout": {
+            "type": "integer",
+            "description": "Timeout in seconds",
+            "min": 1,
+            "max": 300,
+            "default": 10
+        },
+        "retries": {
+            "type": "integer",
+            "description": "Number of retries",
+            "min": 0,
+            "max": 10,
+            "default": 1
+        },
+        "status_code": {
+            "type": "boolean",
+            "description": "Display status code",
+            "default": True
+        },
+        "title": {
+            "type": "boolean",
+            "description": "Display page title",
+            "default": True
+        },
+        "content_length": {
+            "type": "boolean",
+            "description": "Display content length",
+            "default": True
+        },
+        "tech_detect": {
+            "type": "boolean",
+            "description": "Display technology stack",
+            "default": True
+        },
+        "follow_redirects": {
+            "type": "boolean",
+            "description": "Follow HTTP redirects",
+            "default": True
+        },
+        "method": {
+            "type": "string",
+            "description": "HTTP method to use",
+            "allowed_values": ["GET", "POST", "HEAD"],
+            "default": "GET"
+        },
+        "ports": {
+            "type": "list",
+            "description": "Ports to probe",
+            "default": ["80", "443", "8080", "8443"]
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    cli_flags = (
+        ("threads", "-threads", str),
+        ("timeout", "-timeout", str),
+        ("retries", "-retries", str),
+        ("status_code", "-status-code", None),
+        ("title", "-title", None),
+        ("content_length", "-content-length", None),
+        ("tech_detect", "-tech-detect", None),
+        ("follow_redirects", "-follow-redirects", None),
+        ("ports", "-ports", _comma_list)
+    )
+    
     def __init__(self):
         super().__init__("httpx", settings.httpx_path)
-        self.supported_options = {
-            "threads": {
-                "type": "integer",
-                "description": "Number of threads",
-                "min": 1,
-                "max": 300,
-                "default": 50
-            },
-            "timeout": {
-                "type": "integer",
-                "description": "Timeout in seconds",
-                "min": 1,
-                "max": 300,
-                "default": 10
-            },
-            "retries": {
-                "type": "integer",
-                "description": "Number of retries",
-                "min": 0,
-                "max": 10,
-                "default": 1
-            },
-            "status_code": {
-                "type": "boolean",
-                "description": "Display status code",
-                "default": True
-            },
-            "title": {
-                "type": "boolean",
-                "description": "Display page title",
-                "default": True
-            },
-            "content_length": {
-                "type": "boolean",
-                "description": "Display content length",
-                "default": True
-            },
-            "tech_detect": {
-                "type": "boolean",
-                "description": "Display technology stack",
-                "default": True
-            },
-            "follow_redirects": {
-                "type": "boolean",
-                "description": "Follow HTTP redirects",
-                "default": True
-            },
-            "method": {
-                "type": "string",
-                "description": "HTTP method to use",
-                "allowed_values": ["GET", "POST", "HEAD"],
-                "default": "GET"
-            },
-            "ports": {
-                "type": "list",
-                "description": "Ports to probe",
-                "default": ["80", "443", "8080", "8443"]
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Fast HTTP probe with technology detection and customizable options"
     
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute httpx with advanced configuration"""
+        return await self.execute_batch([target], user_config)
+    
+    async def execute_batch(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Probe every target in one httpx process, feeding them on stdin"""
+        run_result = {}
+        findings = [finding async for finding in self.execute_batch_stream(targets, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield HTTP services as httpx reports them"""
+        async for finding in self.execute_batch_stream([target], user_config, run_result):
+            yield finding
+    
+    async def execute_batch_stream(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield HTTP services for every target from one httpx process"""
         config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
         
-        command = [self.tool_path, "-u", target, "-silent", "-json"]
-        
-        # Add threads
-        if config.get("threads"):
-            command.extend(["-threads", str(config["threads"])])
-        
-        # Add timeout
-        if config.get("timeout"):
-            command.extend(["-timeout", str(config["timeout"])])
-        
-        # Add retries
-        if config.get("retries"):
-            command.extend(["-retries", str(config["retries"])])
-        
-        # Add status code
-        if config.get("status_code"):
-            command.append("-status-code")
-        
-        # Add title
-        if config.get("title"):
-            command.append("-title")
-        
-        # Add content length
-        if config.get("content_length"):
-            command.append("-content-length")
-        
-        # Add tech detection
-        if config.get("tech_detect"):
-            command.append("-tech-detect")
-        
-        # Add follow redirects
-        if config.get("follow_redirects"):
-            command.append("-follow-redirects")
+        command = self._add_cli_flags([self.tool_path, "-silent", "-json"], config)
         
         # Add method
         if config.get("method") and config["method"] != "GET":
             command.extend(["-method", config["method"]])
         
-        # Add ports
-        if config.get("ports"):
-            command.extend(["-ports", ",".join(map(str, config["ports"]))])
-        
-        result = await self._run_command(command, timeout=config.get("timeout", 10) * 2)
-        findings = []
-        
-        if result["success"] and result["stdout"]:
-            lines = result["stdout"].strip().split('\n')
-            for line in lines:
+        # Parse each JSON line as httpx reports it instead of buffering all of stdout
+        timeout = config.get("timeout", 10) * 2 * len(targets)
+        async with self._stream_command(command, timeout=timeout, input_data="".join(f"{target}\n" for target in targets), raw=True) as stream:
+            async for line in stream:
                 try:
-                    data = json.loads(line)
-                    if data.get("url"):
-                        findings.append({
-                            "type": FindingType.HTTP_SERVICE.value,
-                            "value": data["url"],
-                            "source": "httpx",
-                            "confidence": 0.9,
-                            "metadata": {
-                                "status_code": data.get("status_code"),
-                                "content_length": data.get("content_length"),
-                                "technology": data.get("tech", []),
-                                "title": data.get("title"),
-                                "method": data.get("method"),
-                                "config": config
-                            }
-                        })
-                except json.JSONDecodeError:
+                    data = orjson.loads(line)
+                except orjson.JSONDecodeError:
                     continue
+                if data.get("url"):
+                    host = data.get("input")
+                    if not host:
+                        try:
+                            host = urlsplit(data["url"]).hostname
+                        except ValueError:
+                            host = None  # Malformed URL; _match_target falls back to the first target
+                    yield {
+                        "type": _FT_HTTP_SERVICE,
+                        "value": data["url"],
+                        "source": "httpx",
+                        "confidence": 0.9,
+                        "metadata": {
+                            "target": _match_target(host, targets),
+                            "status_code": data.get("status_code"),
+                            "content_length": data.get("content_length"),
+                            "technology": data.get("tech", []),
+                            "title": data.get("title"),
+                            "method": data.get("method"),
+                            "config_id": config_id
+                        }
+                    }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
 
 # ============================================================================
 # NEW TOOL PLUGINS - RECON TOOLS
 # ============================================================================
 
 class EnhancedAssetfinderPlugin(EnhancedBaseToolPlugin):
+    # Reads domains from stdin when none is given on the command line
+    supports_batch = True
+    
+    supported_options = MappingProxyType({
+        "subs_only": {
+            "type": "boolean",
+            "description": "Find only subdomains",
+            "default": True
+        },
+        "timeout": {
+            "type": "integer",
+            "description": "Timeout in seconds",
+            "min": 10,
+            "max": 300,
+            "default": 60
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
     def __init__(self):
         super().__init__("assetfinder", settings.assetfinder_path)
-        self.supported_options = {
-            "subs_only": {
-                "type": "boolean",
-                "description": "Find only subdomains",
-                "default": True
-            },
-            "timeout": {
-                "type": "integer",
-                "description": "Timeout in seconds",
-                "min": 10,
-                "max": 300,
-                "default": 60
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Fast subdomain discovery tool using various techniques"
     
+    def _build_option_argv(self, config: Mapping[str, Any]) -> List[str]:
+        return ["--subs-only"] if config.get("subs_only") else []
+    
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self.execute_batch([target], user_config)
+    
+    async def execute_batch(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Enumerate every target in one assetfinder process, feeding them on stdin"""
+        run_result = {}
+        findings = [finding async for finding in self.execute_batch_stream(targets, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield subdomains as assetfinder reports them"""
+        async for finding in self.execute_batch_stream([target], user_config, run_result):
+            yield finding
+    
+    async def execute_batch_stream(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield subdomains for every target from one assetfinder process"""
         config = {**self.default_config, **(user_config or {})}
-        
-        command = [self.tool_path]
-        
-        if config.get("subs_only"):
-            command.append("--subs-only")
-        
-        command.append(target)
-        
-        result = await self._run_command(command, timeout=config.get("timeout", 60))
-        findings = []
-        
-        if result["success"] and result["stdout"]:
-            subdomains = result["stdout"].strip().split('\n')
-            for subdomain in subdomains:
-                subdomain = subdomain.strip()
-                if subdomain and subdomain != target:
-                    findings.append({
-                        "type": FindingType.SUBDOMAIN.value,
+        config_id = _config_id(config)
+        
+        command = [self.tool_path, *self._option_argv(config, config_id)]
+        
+        # Domains are enumerated one after another, so the timeout covers each of them
+        timeout = config.get("timeout", 60) * len(targets)
+        # Use stdin for targets; each subdomain becomes a finding as soon as it is printed
+        async with self._stream_command(command, timeout=timeout, input_data="".join(f"{target}\n" for target in targets)) as stream:
+            async for subdomain in stream:
+                if subdomain not in targets:
+                    yield {
+                        "type": _FT_SUBDOMAIN,
                         "value": subdomain,
                         "source": "assetfinder",
                         "confidence": 0.85,
-                        "metadata": {"target": target, "config": config}
-                    })
+                        "metadata": {"target": _match_target(subdomain, targets), "config_id": config_id}
+                    }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
 
 class EnhancedDnsxPlugin(EnhancedBaseToolPlugin):
+    supports_batch = True
+    # DNS answers change more often than passive enumeration sources
+    result_cache_ttl = 60
+    
+    supported_options = MappingProxyType({
+        "a": {
+            "type": "boolean",
+            "description": "Query A records",
+            "default": True
+        },
+        "aaaa": {
+            "type": "boolean",
+            "description": "Query AAAA records",
+            "default": False
+        },
+        "cname": {
+            "type": "boolean",
+            "description": "Query CNAME records",
+            "default": True
+        },
+        "mx": {
+            "type": "boolean",
+            "description": "Query MX records",
+            "default": False
+        },
+        "ns": {
+            "type": "boolean",
+            "description": "Query NS records",
+            "default": False
+        },
+        "txt": {
+            "type": "boolean",
+            "description": "Query TXT records",
+            "default": False
+        },
+        "ptr": {
+            "type": "boolean",
+            "description": "Query PTR records",
+            "default": False
+        },
+        "srv": {
+            "type": "boolean",
+            "description": "Query SRV records",
+            "default": False
+        },
+        "threads": {
+            "type": "integer",
+            "description": "Number of threads",
+            "min": 1,
+            "max": 100,
+            "default": 25
+        },
+        "timeout": {
+            "type": "integer",
+            "description": "Timeout in seconds",
+            "min": 1,
+            "max": 60,
+            "default": 10
+        },
+        "retries": {
+            "type": "integer",
+            "description": "Number of retries",
+            "min": 0,
+            "max": 10,
+            "default": 2
+        },
+        "resolver": {
+            "type": "string",
+            "description": "Custom DNS resolver",
+            "default": ""
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
     def __init__(self):
         super().__init__("dnsx", settings.dnsx_path)
-        self.supported_options = {
-            "a": {
-                "type": "boolean",
-                "description": "Query A records",
-                "default": True
-            },
-            "aaaa": {
-                "type": "boolean",
-                "description": "Query AAAA records",
-                "default": False
-            },
-            "cname": {
-                "type": "boolean",
-                "description": "Query CNAME records",
-                "default": True
-            },
-            "mx": {
-                "type": "boolean",
-                "description": "Query MX records",
-                "default": False
-            },
-            "ns": {
-                "type": "boolean",
-                "description": "Query NS records",
-                "default": False
-            },
-            "txt": {
-                "type": "boolean",
-                "description": "Query TXT records",
-                "default": False
-            },
-            "ptr": {
-                "type": "boolean",
-                "description": "Query PTR records",
-                "default": False
-            },
-            "srv": {
-                "type": "boolean",
-                "description": "Query SRV records",
-                "default": False
-            },
-            "threads": {
-                "type": "integer",
-                "description": "Number of threads",
-                "min": 1,
-                "max": 100,
-                "default": 25
-            },
-            "timeout": {
-                "type": "integer",
-                "description": "Timeout in seconds",
-                "min": 1,
-                "max": 60,
-                "default": 10
-            },
-            "retries": {
-                "type": "integer",
-                "description": "Number of retries",
-                "min": 0,
-                "max": 10,
-                "default": 2
-            },
-            "resolver": {
-                "type": "string",
-                "description": "Custom DNS resolver",
-                "default": ""
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Fast and multi-purpose DNS toolkit for DNS resolution and enumeration"
     
-    async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        config = {**self.default_config, **(user_config or {})}
-        
-        command = [self.tool_path, "-silent", "-json"]
+    def _build_option_argv(self, config: Mapping[str, Any]) -> List[str]:
+        command = []
         
         # Add record types
         record_types = []
@@ -928,109 +1731,131 @@ class EnhancedDnsxPlugin(EnhancedBaseToolPlugin):
         if config.get("resolver"):
             command.extend(["-r", config["resolver"]])
         
-        # Use stdin for target
-        result = await self._run_command(command, input_data=target, timeout=config.get("timeout", 10) * 2)
-        findings = []
+        return command
+    
+    async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self.execute_batch([target], user_config)
+    
+    async def execute_batch(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Resolve every target in one dnsx process, feeding them on stdin"""
+        run_result = {}
+        findings = [finding async for finding in self.execute_batch_stream(targets, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield DNS records as dnsx resolves them"""
+        async for finding in self.execute_batch_stream([target], user_config, run_result):
+            yield finding
+    
+    async def execute_batch_stream(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield DNS records for every target from one dnsx process"""
+        config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
+        
+        command = [self.tool_path, "-silent", "-json", *self._option_argv(config, config_id)]
         
-        if result["success"] and result["stdout"]:
-            lines = result["stdout"].strip().split('\n')
-            for line in lines:
+        # Use stdin for targets; each JSON line is parsed as dnsx resolves it
+        timeout = config.get("timeout", 10) * 2 * len(targets)
+        async with self._stream_command(command, timeout=timeout, input_data="".join(f"{target}\n" for target in targets), raw=True) as stream:
+            async for line in stream:
+                # Only records with A answers become findings, so don't parse the rest at all
+                # (CNAME/MX/TXT-only records can be large)
+                if b'"a"' not in line:
+                    continue
                 try:
-                    data = json.loads(line)
-                    if data.get("host") and data.get("a"):
-                        findings.append({
-                            "type": FindingType.DNS_RECORD.value,
-                            "value": f"{data['host']} -> {', '.join(data['a'])}",
-                            "source": "dnsx",
-                            "confidence": 0.95,
-                            "metadata": {
-                                "host": data["host"],
-                                "records": data,
-                                "config": config
-                            }
-                        })
-                except json.JSONDecodeError:
+                    data = orjson.loads(line)
+                except orjson.JSONDecodeError:
                     continue
+                host = data.get("host")
+                answers = data.get("a")
+                if host and answers:
+                    yield {
+                        "type": _FT_DNS_RECORD,
+                        "value": f"{host} -> {', '.join(answers)}",
+                        "source": "dnsx",
+                        "confidence": 0.95,
+                        "metadata": {
+                            "target": _match_target(host, targets),
+                            "host": host,
+                            "records": data,
+                            "config_id": config_id
+                        }
+                    }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
 
 # ============================================================================
 # PORT SCAN TOOLS
 # ============================================================================
 
 class EnhancedNmapPlugin(EnhancedBaseToolPlugin):
+    # Probes live hosts, so results go stale sooner than passive sources
+    result_cache_ttl = 60
+    
+    supported_options = MappingProxyType({
+        "scan_type": {
+            "type": "string",
+            "description": "Type of scan to perform",
+            "allowed_values": ["syn", "tcp", "udp", "ping", "version", "os"],
+            "default": "syn"
+        },
+        "ports": {
+            "type": "string",
+            "description": "Ports to scan (e.g., '80,443,1000-2000')",
+            "default": "21,22,23,25,53,80,110,111,135,139,143,443,993,995,1723,3306,3389,5432,5900,8080"
+        },
+        "top_ports": {
+            "type": "integer",
+            "description": "Scan top N ports",
+            "min": 10,
+            "max": 65535,
+            "default": 100
+        },
+        "timing": {
+            "type": "string",
+            "description": "Timing template",
+            "allowed_values": ["0", "1", "2", "3", "4", "5"],
+            "default": "3"
+        },
+        "threads": {
+            "type": "integer",
+            "description": "Parallel host scan groups",
+            "min": 1,
+            "max": 100,
+            "default": 10
+        },
+        "version_detection": {
+            "type": "boolean",
+            "description": "Enable version detection",
+            "default": True
+        },
+        "os_detection": {
+            "type": "boolean",
+            "description": "Enable OS detection",
+            "default": False
+        },
+        "script_scan": {
+            "type": "boolean",
+            "description": "Enable default script scan",
+            "default": False
+        },
+        "aggressive": {
+            "type": "boolean",
+            "description": "Enable aggressive scan",
+            "default": False
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
     def __init__(self):
         super().__init__("nmap", settings.nmap_path)
-        self.supported_options = {
-            "scan_type": {
-                "type": "string",
-                "description": "Type of scan to perform",
-                "allowed_values": ["syn", "tcp", "udp", "ping", "version", "os"],
-                "default": "syn"
-            },
-            "ports": {
-                "type": "string",
-                "description": "Ports to scan (e.g., '80,443,1000-2000')",
-                "default": "21,22,23,25,53,80,110,111,135,139,143,443,993,995,1723,3306,3389,5432,5900,8080"
-            },
-            "top_ports": {
-                "type": "integer",
-                "description": "Scan top N ports",
-                "min": 10,
-                "max": 65535,
-                "default": 100
-            },
-            "timing": {
-                "type": "string",
-                "description": "Timing template",
-                "allowed_values": ["0", "1", "2", "3", "4", "5"],
-                "default": "3"
-            },
-            "threads": {
-                "type": "integer",
-                "description": "Parallel host scan groups",
-                "min": 1,
-                "max": 100,
-                "default": 10
-            },
-            "version_detection": {
-                "type": "boolean",
-                "description": "Enable version detection",
-                "default": True
-            },
-            "os_detection": {
-                "type": "boolean",
-                "description": "Enable OS detection",
-                "default": False
-            },
-            "script_scan": {
-                "type": "boolean",
-                "description": "Enable default script scan",
-                "default": False
-            },
-            "aggressive": {
-                "type": "boolean",
-                "description": "Enable aggressive scan",
-                "default": False
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Network exploration and security auditing tool"
     
-    async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        config = {**self.default_config, **(user_config or {})}
-        
-        # Use normal output format instead of XML for better parsing
-        command = [self.tool_path, target]
+    def _build_option_argv(self, config: Mapping[str, Any]) -> List[str]:
+        command = []
         
         # Add scan type
         scan_type = config.get("scan_type", "syn")
@@ -1043,8 +1868,10 @@ class EnhancedNmapPlugin(EnhancedBaseToolPlugin):
         elif scan_type == "ping":
             command.append("-sn")
         
-        # Add ports - use more common ports by default
-        if config.get("top_ports"):
+        # Add ports - use more common ports by default; a ping scan probes none
+        if scan_type == "ping":
+            pass
+        elif config.get("top_ports"):
             command.extend(["--top-ports", str(config["top_ports"])])
         elif config.get("ports"):
             command.extend(["-p", config["ports"]])
@@ -1056,8 +1883,8 @@ class EnhancedNmapPlugin(EnhancedBaseToolPlugin):
         if config.get("timing"):
             command.extend([f"-T{config['timing']}"])
         
-        # Add version detection by default for better results
-        if config.get("version_detection") or scan_type != "ping":
+        # Add version detection by default for better results; a ping scan has no ports to fingerprint
+        if scan_type != "ping":
             command.append("-sV")
         
         # Add OS detection
@@ -1072,153 +1899,163 @@ class EnhancedNmapPlugin(EnhancedBaseToolPlugin):
         if config.get("aggressive"):
             command.append("-A")
         
-        # Skip host discovery for better results
-        command.append("-Pn")
+        # Skip host discovery for better results; with -sn it would skip the only probe a ping scan sends
+        if scan_type != "ping":
+            command.append("-Pn")
         
-        # Add verbose output
-        command.append("-v")
+        # XML report on stdout, parsed incrementally instead of scraping the human-readable output
+        command.extend(["-oX", "-"])
         
-        result = await self._run_command(command, timeout=300)  # 5 minute timeout
-        findings = []
+        return command
+    
+    async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        run_result = {}
+        findings = [finding async for finding in self.execute_stream(target, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield open ports from nmap's XML report as each one is written"""
+        config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
         
-        if result["success"] and result["stdout"]:
-            # Parse nmap output - look for open ports
-            lines = result["stdout"].split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                # Look for lines like "22/tcp   open  ssh"
-                if '/tcp' in line and 'open' in line:
-                    parts = line.split()
-                    if len(parts) >= 3 and parts[1] == 'open':
-                        port_info = parts[0]  # e.g., "22/tcp"
-                        service = parts[2] if len(parts) > 2 else "unknown"
-                        
-                        port_num = port_info.split('/')[0]
-                        protocol = port_info.split('/')[1] if '/' in port_info else "tcp"
-                        
-                        findings.append({
-                            "type": FindingType.OPEN_PORT.value,
-                            "value": f"{target}:{port_num}/{protocol}",
-                            "source": "nmap",
-                            "confidence": 0.95,
-                            "metadata": {
-                                "host": target,
-                                "port": port_num,
-                                "protocol": protocol,
-                                "service": service,
-                                "state": "open",
-                                "config": config
-                            }
-                        })
+        command = [self.tool_path, target, *self._option_argv(config, config_id)]
+        
+        parser = ET.XMLPullParser(events=("end",))
+        open_ports = 0
+        # A ping scan reports no ports, only whether the host is up
+        ping_scan = config.get("scan_type", "syn") == "ping"
+        host_state = None
+        
+        async with self._stream_command(command, timeout=300, raw=True) as stream:  # 5 minute timeout
+            async for line in stream:
+                try:
+                    parser.feed(line + b"\n")
+                    events = list(parser.read_events())
+                except ET.ParseError:
+                    break
                 
-                # Also look for UDP ports
-                elif '/udp' in line and 'open' in line:
-                    parts = line.split()
-                    if len(parts) >= 3 and parts[1] == 'open':
-                        port_info = parts[0]
-                        service = parts[2] if len(parts) > 2 else "unknown"
-                        
-                        port_num = port_info.split('/')[0]
-                        
-                        findings.append({
-                            "type": FindingType.OPEN_PORT.value,
-                            "value": f"{target}:{port_num}/udp",
-                            "source": "nmap",
-                            "confidence": 0.95,
-                            "metadata": {
-                                "host": target,
-                                "port": port_num,
-                                "protocol": "udp",
-                                "service": service,
-                                "state": "open",
-                                "config": config
+                for _, elem in events:
+                    if elem.tag == "port":
+                        state = elem.find("state")
+                        if state is not None and state.get("state") == "open":
+                            service = elem.find("service")
+                            port_num = elem.get("portid")
+                            # Attribute values are fresh strings per element; intern the few distinct ones
+                            protocol = sys.intern(elem.get("protocol", "tcp"))
+                            open_ports += 1
+                            yield {
+                                "type": _FT_OPEN_PORT,
+                                "value": f"{target}:{port_num}/{protocol}",
+                                "source": "nmap",
+                                "confidence": 0.95,
+                                "metadata": {
+                                    "host": target,
+                                    "port": port_num,
+                                    "protocol": protocol,
+                                    "service": sys.intern(service.get("name", "unknown")) if service is not None else "unknown",
+                                    "state": "open",
+                                    "config_id": config_id
+                                }
                             }
-                        })
-        
+                        # Drop each processed port so memory stays flat on large port tables
+                        elem.clear()
+                    elif ping_scan and elem.tag == "status":
+                        host_state = elem.get("state")
+        result = stream.result
+        
+        if result["success"] and ping_scan:
+            yield {
+                "type": _FT_OPEN_PORT,
+                "value": f"Host {target} is {host_state or 'down'}",
+                "source": "nmap",
+                "confidence": 0.8,
+                "metadata": {
+                    "host": target,
+                    "state": host_state or "down",
+                    "message": "Ping scan completed; no ports were scanned",
+                    "config_id": config_id
+                }
+            }
         # If no findings but scan was successful, add informational message
-        if result["success"] and len(findings) == 0:
-            findings.append({
-                "type": FindingType.OPEN_PORT.value,
+        elif result["success"] and open_ports == 0:
+            yield {
+                "type": _FT_OPEN_PORT,
                 "value": f"No open ports found on {target}",
                 "source": "nmap",
                 "confidence": 0.8,
                 "metadata": {
                     "host": target,
                     "message": "Scan completed but no open ports detected",
-                    "config": config,
+                    "config_id": config_id,
                     "suggestion": "Try scanning more ports or check if host is reachable"
                 }
-            })
+            }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(result, config))
 
 class EnhancedNaabuPlugin(EnhancedBaseToolPlugin):
+    # Probes live hosts, so results go stale sooner than passive sources
+    result_cache_ttl = 60
+    supports_batch = True
+    
+    supported_options = MappingProxyType({
+        "ports": {
+            "type": "string",
+            "description": "Ports to scan",
+            "default": "1-1000"
+        },
+        "top_ports": {
+            "type": "string",
+            "description": "Top ports to scan",
+            "allowed_values": ["100", "1000", "full"],
+            "default": "1000"
+        },
+        "rate": {
+            "type": "integer",
+            "description": "Rate of packets per second",
+            "min": 100,
+            "max": 50000,
+            "default": 1000
+        },
+        "threads": {
+            "type": "integer",
+            "description": "Number of threads",
+            "min": 1,
+            "max": 100,
+            "default": 25
+        },
+        "timeout": {
+            "type": "integer",
+            "description": "Timeout in milliseconds",
+            "min": 100,
+            "max": 10000,
+            "default": 1000
+        },
+        "retries": {
+            "type": "integer",
+            "description": "Number of retries",
+            "min": 0,
+            "max": 10,
+            "default": 3
+        },
+        "scan_type": {
+            "type": "string",
+            "description": "Scan type",
+            "allowed_values": ["s", "c"],
+            "default": "s"
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
     def __init__(self):
         super().__init__("naabu", settings.naabu_path)
-        self.supported_options = {
-            "ports": {
-                "type": "string",
-                "description": "Ports to scan",
-                "default": "1-1000"
-            },
-            "top_ports": {
-                "type": "string",
-                "description": "Top ports to scan",
-                "allowed_values": ["100", "1000", "full"],
-                "default": "1000"
-            },
-            "rate": {
-                "type": "integer",
-                "description": "Rate of packets per second",
-                "min": 100,
-                "max": 50000,
-                "default": 1000
-            },
-            "threads": {
-                "type": "integer",
-                "description": "Number of threads",
-                "min": 1,
-                "max": 100,
-                "default": 25
-            },
-            "timeout": {
-                "type": "integer",
-                "description": "Timeout in milliseconds",
-                "min": 100,
-                "max": 10000,
-                "default": 1000
-            },
-            "retries": {
-                "type": "integer",
-                "description": "Number of retries",
-                "min": 0,
-                "max": 10,
-                "default": 3
-            },
-            "scan_type": {
-                "type": "string",
-                "description": "Scan type",
-                "allowed_values": ["s", "c"],
-                "default": "s"
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Fast port scanner written in Go with focus on reliability and simplicity"
     
-    async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        config = {**self.default_config, **(user_config or {})}
-        
-        command = [self.tool_path, "-host", target, "-silent", "-json"]
+    def _build_option_argv(self, config: Mapping[str, Any]) -> List[str]:
+        command = []
         
         # Add ports
         if config.get("top_ports") and config["top_ports"] != "full":
@@ -1246,92 +2083,125 @@ class EnhancedNaabuPlugin(EnhancedBaseToolPlugin):
         if config.get("scan_type"):
             command.extend(["-s", config["scan_type"]])
         
-        result = await self._run_command(command, timeout=120)
-        findings = []
+        return command
+    
+    async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self.execute_batch([target], user_config)
+    
+    async def execute_batch(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Scan every target in one naabu process, feeding them on stdin"""
+        run_result = {}
+        findings = [finding async for finding in self.execute_batch_stream(targets, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield open ports as naabu reports them"""
+        async for finding in self.execute_batch_stream([target], user_config, run_result):
+            yield finding
+    
+    async def execute_batch_stream(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield open ports for every target from one naabu process"""
+        config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
+        
+        command = [self.tool_path, "-silent", "-json", *self._option_argv(config, config_id)]
         
-        if result["success"] and result["stdout"]:
-            lines = result["stdout"].strip().split('\n')
-            for line in lines:
+        # Use stdin for targets; each JSON line is parsed as naabu reports the port
+        async with self._stream_command(command, timeout=120 * len(targets), input_data="".join(f"{target}\n" for target in targets), raw=True) as stream:
+            async for line in stream:
                 try:
-                    data = json.loads(line)
-                    if data.get("port") and data.get("host"):
-                        findings.append({
-                            "type": FindingType.OPEN_PORT.value,
-                            "value": f"{data['host']}:{data['port']}",
-                            "source": "naabu",
-                            "confidence": 0.9,
-                            "metadata": {
-                                "host": data["host"],
-                                "port": data["port"],
-                                "config": config
-                            }
-                        })
-                except json.JSONDecodeError:
+                    data = orjson.loads(line)
+                except orjson.JSONDecodeError:
                     continue
+                if data.get("port") and data.get("host"):
+                    # One line per open port, so the same host string repeats; intern it to share one copy
+                    host = sys.intern(data["host"])
+                    # IP targets are reported under "ip" when naabu also knows a hostname for them
+                    target = data["ip"] if data.get("ip") in targets else _match_target(host, targets)
+                    yield {
+                        "type": _FT_OPEN_PORT,
+                        "value": f"{host}:{data['port']}",
+                        "source": "naabu",
+                        "confidence": 0.9,
+                        "metadata": {
+                            "target": target,
+                            "host": host,
+                            "port": data["port"],
+                            "config_id": config_id
+                        }
+                    }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
 
 # ============================================================================
 # SCREENSHOT TOOLS
 # ============================================================================
 
 class EnhancedGoWitnessPlugin(EnhancedBaseToolPlugin):
+    # Probes live hosts, so results go stale sooner than passive sources
+    result_cache_ttl = 60
+    # Takes a file of URLs, so one browser session covers every target
+    supports_batch = True
+    
+    supported_options = MappingProxyType({
+        "timeout": {
+            "type": "integer",
+            "description": "Timeout in seconds",
+            "min": 5,
+            "max": 120,
+            "default": 10
+        },
+        "threads": {
+            "type": "integer",
+            "description": "Number of threads",
+            "min": 1,
+            "max": 50,
+            "default": 5
+        },
+        "resolution": {
+            "type": "string",
+            "description": "Screenshot resolution",
+            "allowed_values": ["1440,900", "1920,1080", "1366,768"],
+            "default": "1440,900"
+        },
+        "fullpage": {
+            "type": "boolean",
+            "description": "Take full page screenshot",
+            "default": False
+        },
+        "delay": {
+            "type": "integer",
+            "description": "Delay before screenshot in seconds",
+            "min": 0,
+            "max": 30,
+            "default": 3
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
     def __init__(self):
         super().__init__("gowitness", settings.gowitness_path)
-        self.supported_options = {
-            "timeout": {
-                "type": "integer",
-                "description": "Timeout in seconds",
-                "min": 5,
-                "max": 120,
-                "default": 10
-            },
-            "threads": {
-                "type": "integer",
-                "description": "Number of threads",
-                "min": 1,
-                "max": 50,
-                "default": 5
-            },
-            "resolution": {
-                "type": "string",
-                "description": "Screenshot resolution",
-                "allowed_values": ["1440,900", "1920,1080", "1366,768"],
-                "default": "1440,900"
-            },
-            "fullpage": {
-                "type": "boolean",
-                "description": "Take full page screenshot",
-                "default": False
-            },
-            "delay": {
-                "type": "integer",
-                "description": "Delay before screenshot in seconds",
-                "min": 0,
-                "max": 30,
-                "default": 3
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Web screenshot utility using Chrome Headless"
     
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self.execute_batch([target], user_config)
+    
+    async def execute_batch(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Screenshot every target in one gowitness run, so Chrome is started once per batch"""
         config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
         
-        # Create temporary directory for screenshots
-        with tempfile.TemporaryDirectory() as temp_dir:
+        # Create temporary directory for the URL list and screenshots
+        async with self._scratch_dir() as temp_dir:
+            url_file = Path(temp_dir) / "urls.txt"
+            url_file.write_text("".join(f"{target}\n" for target in targets))
+            
             command = [
-                self.tool_path, "single", 
-                "--url", target,
+                self.tool_path, "file",
+                "-f", str(url_file),
                 "--screenshot-path", temp_dir,
                 "--disable-logging"
             ]
@@ -1340,6 +2210,10 @@ class EnhancedGoWitnessPlugin(EnhancedBaseToolPlugin):
             if config.get("timeout"):
                 command.extend(["--timeout", str(config["timeout"])])
             
+            # Add threads
+            if config.get("threads"):
+                command.extend(["--threads", str(config["threads"])])
+            
             # Add resolution
             if config.get("resolution"):
                 command.extend(["--resolution", config["resolution"]])
@@ -1352,24 +2226,27 @@ class EnhancedGoWitnessPlugin(EnhancedBaseToolPlugin):
             if config.get("delay"):
                 command.extend(["--delay", str(config["delay"])])
             
-            result = await self._run_command(command, timeout=config.get("timeout", 10) + 30)
+            # Targets are shot config["threads"] at a time
+            rounds = -(-len(targets) // (config.get("threads") or 1))
+            result = await self._run_command(command, timeout=(config.get("timeout", 10) + config.get("delay", 0)) * rounds + 30)
             findings = []
             
             if result["success"]:
-                # Check if screenshot was created
-                screenshot_files = list(Path(temp_dir).glob("*.png"))
-                if screenshot_files:
-                    findings.append({
-                        "type": FindingType.SCREENSHOT.value,
-                        "value": f"Screenshot captured for {target}",
-                        "source": "gowitness",
-                        "confidence": 0.9,
-                        "metadata": {
-                            "target": target,
-                            "screenshot_path": str(screenshot_files[0]),
-                            "config": config
-                        }
-                    })
+                # Check which targets got a screenshot
+                screenshots = _screenshots_by_target(_png_files(temp_dir), targets)
+                for target in targets:
+                    if screenshots[target]:
+                        findings.append({
+                            "type": _FT_SCREENSHOT,
+                            "value": f"Screenshot captured for {target}",
+                            "source": "gowitness",
+                            "confidence": 0.9,
+                            "metadata": {
+                                "target": target,
+                                "screenshot_path": screenshots[target][0].path,
+                                "config_id": config_id
+                            }
+                        })
             
             return {
                 "findings": findings,
@@ -1381,56 +2258,70 @@ class EnhancedGoWitnessPlugin(EnhancedBaseToolPlugin):
             }
 
 class EnhancedEyeWitnessPlugin(EnhancedBaseToolPlugin):
+    # Probes live hosts, so results go stale sooner than passive sources
+    result_cache_ttl = 60
+    # Takes a file of URLs, so one browser session covers every target
+    supports_batch = True
+    
+    supported_options = MappingProxyType({
+        "timeout": {
+            "type": "integer",
+            "description": "Timeout in seconds",
+            "min": 5,
+            "max": 120,
+            "default": 7
+        },
+        "threads": {
+            "type": "integer",
+            "description": "Number of threads",
+            "min": 1,
+            "max": 25,
+            "default": 5
+        },
+        "delay": {
+            "type": "integer",
+            "description": "Delay between requests in seconds",
+            "min": 0,
+            "max": 10,
+            "default": 1
+        },
+        "user_agent": {
+            "type": "string",
+            "description": "Custom user agent",
+            "default": ""
+        },
+        "resolution": {
+            "type": "string",
+            "description": "Screenshot resolution",
+            "allowed_values": ["1440x900", "1920x1080", "1366x768"],
+            "default": "1440x900"
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
     def __init__(self):
         super().__init__("eyewitness", settings.eyewitness_path)
-        self.supported_options = {
-            "timeout": {
-                "type": "integer",
-                "description": "Timeout in seconds",
-                "min": 5,
-                "max": 120,
-                "default": 7
-            },
-            "threads": {
-                "type": "integer",
-                "description": "Number of threads",
-                "min": 1,
-                "max": 25,
-                "default": 5
-            },
-            "delay": {
-                "type": "integer",
-                "description": "Delay between requests in seconds",
-                "min": 0,
-                "max": 10,
-                "default": 1
-            },
-            "user_agent": {
-                "type": "string",
-                "description": "Custom user agent",
-                "default": ""
-            },
-            "resolution": {
-                "type": "string",
-                "description": "Screenshot resolution",
-                "allowed_values": ["1440x900", "1920x1080", "1366x768"],
-                "default": "1440x900"
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Web application screenshot tool with report generation"
     
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self.execute_batch([target], user_config)
+    
+    async def execute_batch(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Screenshot every target in one EyeWitness run, reading the URLs from a file"""
         config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
         
-        # Create temporary directory for output
-        with tempfile.TemporaryDirectory() as temp_dir:
+        # Create temporary directory for the URL list and output
+        async with self._scratch_dir() as temp_dir:
+            url_file = Path(temp_dir) / "urls.txt"
+            url_file.write_text("".join(f"{target}\n" for target in targets))
+            
             command = [
                 "python3", self.tool_path,
-                "--single", target,
-                "-d", temp_dir,
+                "-f", str(url_file),
+                "-d", str(Path(temp_dir) / "report"),
                 "--no-prompt"
             ]
             
@@ -1454,24 +2345,25 @@ class EnhancedEyeWitnessPlugin(EnhancedBaseToolPlugin):
             if config.get("resolution"):
                 command.extend(["--resolution", config["resolution"]])
             
-            result = await self._run_command(command, timeout=config.get("timeout", 7) + 60)
+            # Targets are shot config["threads"] at a time
+            rounds = -(-len(targets) // (config.get("threads") or 1))
+            result = await self._run_command(command, timeout=(config.get("timeout", 7) + config.get("delay", 0)) * rounds + 60)
             findings = []
             
             if result["success"]:
-                # Check if screenshots were created
-                screenshot_dir = Path(temp_dir) / "screens"
-                if screenshot_dir.exists():
-                    screenshot_files = list(screenshot_dir.glob("*.png"))
-                    if screenshot_files:
+                # Check which targets got screenshots
+                screenshots = _screenshots_by_target(_png_files(os.path.join(temp_dir, "report", "screens")), targets)
+                for target in targets:
+                    if screenshots[target]:
                         findings.append({
-                            "type": FindingType.SCREENSHOT.value,
+                            "type": _FT_SCREENSHOT,
                             "value": f"Screenshot captured for {target}",
                             "source": "eyewitness",
                             "confidence": 0.9,
                             "metadata": {
                                 "target": target,
-                                "screenshot_count": len(screenshot_files),
-                                "config": config
+                                "screenshot_count": len(screenshots[target]),
+                                "config_id": config_id
                             }
                         })
             
@@ -1489,67 +2381,93 @@ class EnhancedEyeWitnessPlugin(EnhancedBaseToolPlugin):
 # ============================================================================
 
 class EnhancedGobusterPlugin(EnhancedBaseToolPlugin):
+    supported_options = MappingProxyType({
+        "mode": {
+            "type": "string",
+            "description": "Gobuster mode",
+            "allowed_values": ["dir", "dns", "vhost"],
+            "default": "dir"
+        },
+        "wordlist": {
+            "type": "string",
+            "description": "Path to wordlist file",
+            "default": "/usr/share/wordlists/dirb/common.txt"
+        },
+        "threads": {
+            "type": "integer",
+            "description": "Number of threads",
+            "min": 1,
+            "max": 100,
+            "default": 10
+        },
+        "timeout": {
+            "type": "integer",
+            "description": "Timeout in seconds",
+            "min": 1,
+            "max": 60,
+            "default": 10
+        },
+        "extensions": {
+            "type": "list",
+            "description": "File extensions to search for",
+            "default": ["php", "html", "js", "txt", "xml"]
+        },
+        "status_codes": {
+            "type": "list",
+            "description": "Status codes to include",
+            "default": ["200", "204", "301", "302", "307", "401", "403"]
+        },
+        "follow_redirects": {
+            "type": "boolean",
+            "description": "Follow redirects",
+            "default": False
+        },
+        "include_length": {
+            "type": "boolean",
+            "description": "Include response length",
+            "default": True
+        },
+        "user_agent": {
+            "type": "string",
+            "description": "Custom user agent",
+            "default": ""
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
+    cli_flags = (
+        ("threads", "-t", str),
+        ("timeout", "--timeout", lambda seconds: f"{seconds}s"),
+        ("status_codes", "-s", _comma_list),
+        ("follow_redirects", "-r", None),
+        ("include_length", "-l", None),
+        ("user_agent", "-a", str)
+    )
+    
     def __init__(self):
         super().__init__("gobuster", settings.gobuster_path)
-        self.supported_options = {
-            "mode": {
-                "type": "string",
-                "description": "Gobuster mode",
-                "allowed_values": ["dir", "dns", "vhost"],
-                "default": "dir"
-            },
-            "wordlist": {
-                "type": "string",
-                "description": "Path to wordlist file",
-                "default": "/usr/share/wordlists/dirb/common.txt"
-            },
-            "threads": {
-                "type": "integer",
-                "description": "Number of threads",
-                "min": 1,
-                "max": 100,
-                "default": 10
-            },
-            "timeout": {
-                "type": "integer",
-                "description": "Timeout in seconds",
-                "min": 1,
-                "max": 60,
-                "default": 10
-            },
-            "extensions": {
-                "type": "list",
-                "description": "File extensions to search for",
-                "default": ["php", "html", "js", "txt", "xml"]
-            },
-            "status_codes": {
-                "type": "list",
-                "description": "Status codes to include",
-                "default": ["200", "204", "301", "302", "307", "401", "403"]
-            },
-            "follow_redirects": {
-                "type": "boolean",
-                "description": "Follow redirects",
-                "default": False
-            },
-            "include_length": {
-                "type": "boolean",
-                "description": "Include response length",
-                "default": True
-            },
-            "user_agent": {
-                "type": "string",
-                "description": "Custom user agent",
-                "default": ""
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Directory/file & DNS busting tool written in Go"
     
+    def _build_option_argv(self, config: Mapping[str, Any]) -> List[str]:
+        command = self._add_cli_flags([], config)
+        
+        # Extensions only apply to dir mode
+        if config.get("mode", "dir") == "dir" and config.get("extensions"):
+            command.extend(["-x", _comma_list(config["extensions"])])
+        
+        return command
+    
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        run_result = {}
+        findings = [finding async for finding in self.execute_stream(target, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield discovered paths (or subdomains in dns mode) as gobuster reports them"""
         config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
         
         mode = config.get("mode", "dir")
         command = [self.tool_path, mode, "-q"]
@@ -1561,442 +2479,412 @@ class EnhancedGobusterPlugin(EnhancedBaseToolPlugin):
         elif mode == "vhost":
             command.extend(["-u", target])
         
-        # Add wordlist
+        # Add wordlist; checked per run, since it may be installed while the server runs
         wordlist = config.get("wordlist")
-        if wordlist and os.path.exists(wordlist):
+        if wordlist and _wordlist_ok(wordlist):
             command.extend(["-w", wordlist])
         
-        # Add threads
-        if config.get("threads"):
-            command.extend(["-t", str(config["threads"])])
+        command.extend(self._option_argv(config, config_id))
         
-        # Add timeout
-        if config.get("timeout"):
-            command.extend(["--timeout", str(config["timeout"]) + "s"])
-        
-        # Add extensions for dir mode
-        if mode == "dir" and config.get("extensions"):
-            command.extend(["-x", ",".join(config["extensions"])])
-        
-        # Add status codes
-        if config.get("status_codes"):
-            command.extend(["-s", ",".join(config["status_codes"])])
-        
-        # Add follow redirects
-        if config.get("follow_redirects"):
-            command.append("-r")
-        
-        # Add include length
-        if config.get("include_length"):
-            command.append("-l")
-        
-        # Add user agent
-        if config.get("user_agent"):
-            command.extend(["-a", config["user_agent"]])
-        
-        result = await self._run_command(command, timeout=300)  # 5 minute timeout
-        findings = []
-        
-        if result["success"] and result["stdout"]:
-            lines = result["stdout"].strip().split('\n')
-            for line in lines:
-                if line.strip() and not line.startswith('='):
-                    # Parse gobuster output
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        path = parts[0]
-                        status = parts[1] if len(parts) > 1 else "200"
-                        
-                        findings.append({
-                            "type": FindingType.DIRECTORY.value if mode == "dir" else FindingType.SUBDOMAIN.value,
-                            "value": path,
-                            "source": "gobuster",
-                            "confidence": 0.8,
-                            "metadata": {
-                                "status_code": status,
-                                "mode": mode,
-                                "target": target,
-                                "config": config
-                            }
-                        })
+        # Each line is parsed as gobuster reports it
+        async with self._stream_command(command, timeout=300) as stream:  # 5 minute timeout
+            async for line in stream:
+                if line.startswith('='):
+                    continue
+                # Parse gobuster output; only the first two fields are used, so the rest of the line isn't split
+                parts = line.split(None, 2)
+                if len(parts) >= 2:
+                    # A handful of status values repeat on every line; intern them to share one copy each
+                    path, status = parts[0], sys.intern(parts[1])
+                    
+                    yield {
+                        "type": _FT_DIRECTORY if mode == "dir" else _FT_SUBDOMAIN,
+                        "value": path,
+                        "source": "gobuster",
+                        "confidence": 0.8,
+                        "metadata": {
+                            "status_code": status,
+                            "mode": mode,
+                            "target": target,
+                            "config_id": config_id
+                        }
+                    }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
 
 # ============================================================================
 # FUZZING & ENDPOINT TOOLS
 # ============================================================================
 
 class EnhancedFfufPlugin(EnhancedBaseToolPlugin):
+    supported_options = MappingProxyType({
+        "wordlist": {
+            "type": "string",
+            "description": "Path to wordlist file",
+            "default": "/usr/share/wordlists/dirb/common.txt"
+        },
+        "threads": {
+            "type": "integer",
+            "description": "Number of threads",
+            "min": 1,
+            "max": 100,
+            "default": 40
+        },
+        "delay": {
+            "type": "string",
+            "description": "Delay between requests (e.g., '0.1s')",
+            "default": "0"
+        },
+        "timeout": {
+            "type": "integer",
+            "description": "Timeout in seconds",
+            "min": 1,
+            "max": 60,
+            "default": 10
+        },
+        "match_codes": {
+            "type": "list",
+            "description": "Match HTTP status codes",
+            "default": ["200", "204", "301", "302", "307", "401", "403"]
+        },
+        "filter_codes": {
+            "type": "list",
+            "description": "Filter HTTP status codes",
+            "default": ["404"]
+        },
+        "filter_size": {
+            "type": "list",
+            "description": "Filter response sizes",
+            "default": []
+        },
+        "extensions": {
+            "type": "list",
+            "description": "File extensions to fuzz",
+            "default": ["php", "html", "js", "txt"]
+        },
+        "method": {
+            "type": "string",
+            "description": "HTTP method",
+            "allowed_values": ["GET", "POST", "PUT", "DELETE", "HEAD"],
+            "default": "GET"
+        },
+        "data": {
+            "type": "string",
+            "description": "POST data",
+            "default": ""
+        },
+        "headers": {
+            "type": "list",
+            "description": "Custom headers",
+            "default": []
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
+    cli_flags = (
+        ("threads", "-t", str),
+        ("timeout", "-timeout", str),
+        ("match_codes", "-mc", _comma_list),
+        ("filter_codes", "-fc", _comma_list),
+        ("filter_size", "-fs", _comma_list),
+        ("extensions", "-e", _comma_list),
+        ("data", "-d", str)
+    )
+    
     def __init__(self):
         super().__init__("ffuf", settings.ffuf_path)
-        self.supported_options = {
-            "wordlist": {
-                "type": "string",
-                "description": "Path to wordlist file",
-                "default": "/usr/share/wordlists/dirb/common.txt"
-            },
-            "threads": {
-                "type": "integer",
-                "description": "Number of threads",
-                "min": 1,
-                "max": 100,
-                "default": 40
-            },
-            "delay": {
-                "type": "string",
-                "description": "Delay between requests (e.g., '0.1s')",
-                "default": "0"
-            },
-            "timeout": {
-                "type": "integer",
-                "description": "Timeout in seconds",
-                "min": 1,
-                "max": 60,
-                "default": 10
-            },
-            "match_codes": {
-                "type": "list",
-                "description": "Match HTTP status codes",
-                "default": ["200", "204", "301", "302", "307", "401", "403"]
-            },
-            "filter_codes": {
-                "type": "list",
-                "description": "Filter HTTP status codes",
-                "default": ["404"]
-            },
-            "filter_size": {
-                "type": "list",
-                "description": "Filter response sizes",
-                "default": []
-            },
-            "extensions": {
-                "type": "list",
-                "description": "File extensions to fuzz",
-                "default": ["php", "html", "js", "txt"]
-            },
-            "method": {
-                "type": "string",
-                "description": "HTTP method",
-                "allowed_values": ["GET", "POST", "PUT", "DELETE", "HEAD"],
-                "default": "GET"
-            },
-            "data": {
-                "type": "string",
-                "description": "POST data",
-                "default": ""
-            },
-            "headers": {
-                "type": "list",
-                "description": "Custom headers",
-                "default": []
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Fast web fuzzer written in Go"
     
-    async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        config = {**self.default_config, **(user_config or {})}
-        
-        # Prepare URL with FUZZ keyword
-        if "FUZZ" not in target:
-            target = target.rstrip('/') + "/FUZZ"
-        
-        command = [self.tool_path, "-u", target, "-o", "json"]
-        
-        # Add wordlist
-        wordlist = config.get("wordlist")
-        if wordlist and os.path.exists(wordlist):
-            command.extend(["-w", wordlist])
-        
-        # Add threads
-        if config.get("threads"):
-            command.extend(["-t", str(config["threads"])])
+    def _build_option_argv(self, config: Mapping[str, Any]) -> List[str]:
+        command = self._add_cli_flags([], config)
         
         # Add delay
         if config.get("delay") and config["delay"] != "0":
             command.extend(["-p", config["delay"]])
         
-        # Add timeout
-        if config.get("timeout"):
-            command.extend(["-timeout", str(config["timeout"])])
-        
-        # Add match codes
-        if config.get("match_codes"):
-            command.extend(["-mc", ",".join(config["match_codes"])])
-        
-        # Add filter codes
-        if config.get("filter_codes"):
-            command.extend(["-fc", ",".join(config["filter_codes"])])
-        
-        # Add filter size
-        if config.get("filter_size"):
-            command.extend(["-fs", ",".join(map(str, config["filter_size"]))])
-        
-        # Add extensions
-        if config.get("extensions"):
-            command.extend(["-e", ",".join(config["extensions"])])
-        
         # Add method
         if config.get("method") and config["method"] != "GET":
             command.extend(["-X", config["method"]])
         
-        # Add POST data
-        if config.get("data"):
-            command.extend(["-d", config["data"]])
-        
         # Add headers
-        if config.get("headers"):
-            for header in config["headers"]:
-                command.extend(["-H", header])
+        for header in config.get("headers") or ():
+            command.extend(["-H", header])
         
         # Add silent mode
         command.append("-s")
         
-        result = await self._run_command(command, timeout=300)  # 5 minute timeout
-        findings = []
+        return command
+    
+    async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        run_result = {}
+        findings = [finding async for finding in self.execute_stream(target, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield matched URLs as ffuf reports them"""
+        config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
+        
+        # Prepare URL with FUZZ keyword
+        if "FUZZ" not in target:
+            target = target.rstrip('/') + "/FUZZ"
+        
+        command = [self.tool_path, "-u", target, "-o", "json"]
+        
+        # Add wordlist; checked per run, since it may be installed while the server runs
+        wordlist = config.get("wordlist")
+        if wordlist and _wordlist_ok(wordlist):
+            command.extend(["-w", wordlist])
+        
+        command.extend(self._option_argv(config, config_id))
         
-        if result["success"] and result["stdout"]:
-            lines = result["stdout"].strip().split('\n')
-            for line in lines:
+        # Wordlists often hold the same path with and without a trailing slash
+        seen = set()
+        
+        # Each JSON line is parsed as ffuf reports the match
+        async with self._stream_command(command, timeout=300, raw=True) as stream:  # 5 minute timeout
+            async for line in stream:
                 try:
-                    data = json.loads(line)
-                    if data.get("url") and data.get("status"):
-                        findings.append({
-                            "type": FindingType.DIRECTORY.value,
-                            "value": data["url"],
-                            "source": "ffuf",
-                            "confidence": 0.85,
-                            "metadata": {
-                                "status_code": data["status"],
-                                "length": data.get("length", 0),
-                                "words": data.get("words", 0),
-                                "lines": data.get("lines", 0),
-                                "config": config
-                            }
-                        })
-                except json.JSONDecodeError:
+                    data = orjson.loads(line)
+                except orjson.JSONDecodeError:
                     continue
+                if data.get("url") and data.get("status"):
+                    key = _url_key(data["url"])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield {
+                        "type": _FT_DIRECTORY,
+                        "value": data["url"],
+                        "source": "ffuf",
+                        "confidence": 0.85,
+                        "metadata": {
+                            "status_code": data["status"],
+                            "length": data.get("length", 0),
+                            "words": data.get("words", 0),
+                            "lines": data.get("lines", 0),
+                            "config_id": config_id
+                        }
+                    }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
 
 class EnhancedKatanaPlugin(EnhancedBaseToolPlugin):
+    supported_options = MappingProxyType({
+        "depth": {
+            "type": "integer",
+            "description": "Maximum crawl depth",
+            "min": 1,
+            "max": 10,
+            "default": 3
+        },
+        "js_crawl": {
+            "type": "boolean",
+            "description": "Enable JavaScript crawling",
+            "default": True
+        },
+        "crawl_duration": {
+            "type": "integer",
+            "description": "Maximum crawl duration in minutes",
+            "min": 1,
+            "max": 60,
+            "default": 10
+        },
+        "concurrency": {
+            "type": "integer",
+            "description": "Number of concurrent crawlers",
+            "min": 1,
+            "max": 50,
+            "default": 10
+        },
+        "delay": {
+            "type": "integer",
+            "description": "Delay between requests in seconds",
+            "min": 0,
+            "max": 10,
+            "default": 0
+        },
+        "timeout": {
+            "type": "integer",
+            "description": "Request timeout in seconds",
+            "min": 1,
+            "max": 60,
+            "default": 10
+        },
+        "retries": {
+            "type": "integer",
+            "description": "Number of retries",
+            "min": 0,
+            "max": 5,
+            "default": 1
+        },
+        "scope": {
+            "type": "list",
+            "description": "Crawling scope patterns",
+            "default": []
+        },
+        "exclude": {
+            "type": "list",
+            "description": "Exclude patterns",
+            "default": []
+        },
+        "extensions": {
+            "type": "list",
+            "description": "File extensions to crawl",
+            "default": ["php", "asp", "aspx", "jsp", "js"]
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
+    cli_flags = (
+        ("depth", "-d", str),
+        ("js_crawl", "-js-crawl", None),
+        ("crawl_duration", "-crawl-duration", lambda minutes: f"{minutes}m"),
+        ("concurrency", "-c", str),
+        ("delay", "-delay", lambda seconds: f"{seconds}s"),
+        ("timeout", "-timeout", str),
+        ("retries", "-retries", str),
+        ("extensions", "-extension", _comma_list)
+    )
+    
     def __init__(self):
         super().__init__("katana", settings.katana_path)
-        self.supported_options = {
-            "depth": {
-                "type": "integer",
-                "description": "Maximum crawl depth",
-                "min": 1,
-                "max": 10,
-                "default": 3
-            },
-            "js_crawl": {
-                "type": "boolean",
-                "description": "Enable JavaScript crawling",
-                "default": True
-            },
-            "crawl_duration": {
-                "type": "integer",
-                "description": "Maximum crawl duration in minutes",
-                "min": 1,
-                "max": 60,
-                "default": 10
-            },
-            "concurrency": {
-                "type": "integer",
-                "description": "Number of concurrent crawlers",
-                "min": 1,
-                "max": 50,
-                "default": 10
-            },
-            "delay": {
-                "type": "integer",
-                "description": "Delay between requests in seconds",
-                "min": 0,
-                "max": 10,
-                "default": 0
-            },
-            "timeout": {
-                "type": "integer",
-                "description": "Request timeout in seconds",
-                "min": 1,
-                "max": 60,
-                "default": 10
-            },
-            "retries": {
-                "type": "integer",
-                "description": "Number of retries",
-                "min": 0,
-                "max": 5,
-                "default": 1
-            },
-            "scope": {
-                "type": "list",
-                "description": "Crawling scope patterns",
-                "default": []
-            },
-            "exclude": {
-                "type": "list",
-                "description": "Exclude patterns",
-                "default": []
-            },
-            "extensions": {
-                "type": "list",
-                "description": "File extensions to crawl",
-                "default": ["php", "asp", "aspx", "jsp", "js"]
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Next-generation crawling and spidering framework"
     
-    async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        config = {**self.default_config, **(user_config or {})}
-        
-        command = [self.tool_path, "-u", target, "-silent", "-jsonl"]
-        
-        # Add depth
-        if config.get("depth"):
-            command.extend(["-d", str(config["depth"])])
-        
-        # Add JS crawling
-        if config.get("js_crawl"):
-            command.append("-js-crawl")
-        
-        # Add crawl duration
-        if config.get("crawl_duration"):
-            command.extend(["-crawl-duration", str(config["crawl_duration"]) + "m"])
-        
-        # Add concurrency
-        if config.get("concurrency"):
-            command.extend(["-c", str(config["concurrency"])])
-        
-        # Add delay
-        if config.get("delay"):
-            command.extend(["-delay", str(config["delay"]) + "s"])
-        
-        # Add timeout
-        if config.get("timeout"):
-            command.extend(["-timeout", str(config["timeout"])])
-        
-        # Add retries
-        if config.get("retries"):
-            command.extend(["-retries", str(config["retries"])])
+    def _build_option_argv(self, config: Mapping[str, Any]) -> List[str]:
+        command = self._add_cli_flags([], config)
         
-        # Add scope
-        if config.get("scope"):
-            for scope_pattern in config["scope"]:
-                command.extend(["-scope", scope_pattern])
+        # Add scope and exclude patterns, one flag per pattern
+        for scope_pattern in config.get("scope") or ():
+            command.extend(["-scope", scope_pattern])
+        for exclude_pattern in config.get("exclude") or ():
+            command.extend(["-exclude", exclude_pattern])
         
-        # Add exclude
-        if config.get("exclude"):
-            for exclude_pattern in config["exclude"]:
-                command.extend(["-exclude", exclude_pattern])
+        return command
+    
+    async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        run_result = {}
+        findings = [finding async for finding in self.execute_stream(target, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield crawled URLs as katana visits them"""
+        config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
         
-        # Add extensions
-        if config.get("extensions"):
-            command.extend(["-extension", ",".join(config["extensions"])])
+        # Only the request and a few response fields are read, so leave page bodies out of each line
+        command = [self.tool_path, "-u", target, "-silent", "-jsonl", "-omit-body", *self._option_argv(config, config_id)]
         
-        result = await self._run_command(command, timeout=config.get("crawl_duration", 10) * 60 + 60)
-        findings = []
+        # Crawled pages link the same URL with different query orders and trailing slashes
+        seen = set()
         
-        if result["success"] and result["stdout"]:
-            lines = result["stdout"].strip().split('\n')
-            for line in lines:
+        # Each JSON line is parsed as katana reports the request
+        async with self._stream_command(command, timeout=config.get("crawl_duration", 10) * 60 + 60, raw=True) as stream:
+            async for line in stream:
                 try:
-                    data = json.loads(line)
-                    if data.get("request") and data["request"].get("url"):
-                        url = data["request"]["url"]
-                        findings.append({
-                            "type": FindingType.CRAWLED_URL.value,
-                            "value": url,
-                            "source": "katana",
-                            "confidence": 0.8,
-                            "metadata": {
-                                "method": data["request"].get("method", "GET"),
-                                "status_code": data.get("response", {}).get("status_code"),
-                                "content_length": data.get("response", {}).get("content_length"),
-                                "config": config
-                            }
-                        })
-                except json.JSONDecodeError:
+                    data = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                request = data.get("request") or _EMPTY
+                url = request.get("url")
+                if not url:
                     continue
+                key = _url_key(url)
+                if key in seen:
+                    continue
+                seen.add(key)
+                response = data.get("response") or _EMPTY
+                yield {
+                    "type": _FT_CRAWLED_URL,
+                    "value": url,
+                    "source": "katana",
+                    "confidence": 0.8,
+                    "metadata": {
+                        "method": request.get("method", "GET"),
+                        "status_code": response.get("status_code"),
+                        "content_length": response.get("content_length"),
+                        "config_id": config_id
+                    }
+                }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
 
 class EnhancedWaymorePlugin(EnhancedBaseToolPlugin):
+    # Reads domains from stdin when -i isn't given, so one interpreter start serves every target
+    supports_batch = True
+    
+    supported_options = MappingProxyType({
+        "mode": {
+            "type": "string",
+            "description": "Waymore mode",
+            "allowed_values": ["U", "R"],
+            "default": "U"
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Limit number of URLs",
+            "min": 100,
+            "max": 50000,
+            "default": 5000
+        },
+        "from_date": {
+            "type": "string",
+            "description": "From date (YYYYMMDD)",
+            "default": ""
+        },
+        "to_date": {
+            "type": "string",
+            "description": "To date (YYYYMMDD)",
+            "default": ""
+        },
+        "filter_responses_only": {
+            "type": "boolean",
+            "description": "Filter responses only",
+            "default": False
+        },
+        "capture_interval": {
+            "type": "integer",
+            "description": "Capture interval in days",
+            "min": 1,
+            "max": 365,
+            "default": 30
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
     def __init__(self):
         super().__init__("waymore", settings.waymore_path)
-        self.supported_options = {
-            "mode": {
-                "type": "string",
-                "description": "Waymore mode",
-                "allowed_values": ["U", "R"],
-                "default": "U"
-            },
-            "limit": {
-                "type": "integer",
-                "description": "Limit number of URLs",
-                "min": 100,
-                "max": 50000,
-                "default": 5000
-            },
-            "from_date": {
-                "type": "string",
-                "description": "From date (YYYYMMDD)",
-                "default": ""
-            },
-            "to_date": {
-                "type": "string",
-                "description": "To date (YYYYMMDD)",
-                "default": ""
-            },
-            "filter_responses_only": {
-                "type": "boolean",
-                "description": "Filter responses only",
-                "default": False
-            },
-            "capture_interval": {
-                "type": "integer",
-                "description": "Capture interval in days",
-                "min": 1,
-                "max": 365,
-                "default": 30
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Tool for downloading archived web pages and extracting URLs"
     
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self.execute_batch([target], user_config)
+    
+    async def execute_batch(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fetch archived URLs for every target in one waymore process, feeding them on stdin"""
+        run_result = {}
+        findings = [finding async for finding in self.execute_batch_stream(targets, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield archived URLs as waymore reports them"""
+        async for finding in self.execute_batch_stream([target], user_config, run_result):
+            yield finding
+    
+    async def execute_batch_stream(self, targets: List[str], user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield archived URLs for every target from one waymore process"""
         config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
         
-        command = ["python3", self.tool_path, "-i", target]
+        command = ["python3", self.tool_path]
         
         # Add mode
         if config.get("mode"):
@@ -2021,77 +2909,89 @@ class EnhancedWaymorePlugin(EnhancedBaseToolPlugin):
         if config.get("capture_interval"):
             command.extend(["-ci", str(config["capture_interval"])])
         
-        result = await self._run_command(command, timeout=300)  # 5 minute timeout
-        findings = []
+        # Archives hold the same URL under several snapshots and spellings
+        seen = set()
         
-        if result["success"] and result["stdout"]:
-            lines = result["stdout"].strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and line.startswith(('http://', 'https://')):
-                    findings.append({
-                        "type": FindingType.HISTORICAL_URL.value,
-                        "value": line,
-                        "source": "waymore",
-                        "confidence": 0.8,
-                        "metadata": {
-                            "target": target,
-                            "config": config
-                        }
-                    })
+        # waymore prints progress and summary lines between the URLs; they are filtered
+        # on the raw bytes so only accepted URLs are decoded
+        async with self._stream_command(command, timeout=300 * len(targets), input_data="".join(f"{target}\n" for target in targets), raw=True) as stream:  # 5 minutes per target
+            async for line in stream:
+                if not line.startswith(_HTTP_PREFIXES_BYTES):
+                    continue
+                line = line.decode('utf-8', errors='ignore')
+                try:
+                    parts = urlsplit(line)
+                except ValueError:
+                    continue
+                key = _split_url_key(parts)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield {
+                    "type": _FT_HISTORICAL_URL,
+                    "value": line,
+                    "source": "waymore",
+                    "confidence": 0.8,
+                    "metadata": {
+                        "target": _match_target(parts.hostname, targets),
+                        "config_id": config_id
+                    }
+                }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
 
 # ============================================================================
 # PARAMETER DISCOVERY TOOLS
 # ============================================================================
 
 class EnhancedParamSpiderPlugin(EnhancedBaseToolPlugin):
+    supported_options = MappingProxyType({
+        "level": {
+            "type": "string",
+            "description": "Crawling level",
+            "allowed_values": ["high", "medium", "low"],
+            "default": "medium"
+        },
+        "exclude": {
+            "type": "list",
+            "description": "Extensions to exclude",
+            "default": ["png", "jpg", "jpeg", "gif", "svg", "css", "ico"]
+        },
+        "output": {
+            "type": "string",
+            "description": "Output format",
+            "allowed_values": ["txt", "json"],
+            "default": "txt"
+        },
+        "placeholder": {
+            "type": "string",
+            "description": "Placeholder for parameter values",
+            "default": "FUZZ"
+        },
+        "subs": {
+            "type": "boolean",
+            "description": "Include subdomains",
+            "default": True
+        }
+    })
+    default_config = MappingProxyType({key: info["default"] for key, info in supported_options.items()})
+    
     def __init__(self):
         super().__init__("paramspider", settings.paramspider_path)
-        self.supported_options = {
-            "level": {
-                "type": "string",
-                "description": "Crawling level",
-                "allowed_values": ["high", "medium", "low"],
-                "default": "medium"
-            },
-            "exclude": {
-                "type": "list",
-                "description": "Extensions to exclude",
-                "default": ["png", "jpg", "jpeg", "gif", "svg", "css", "ico"]
-            },
-            "output": {
-                "type": "string",
-                "description": "Output format",
-                "allowed_values": ["txt", "json"],
-                "default": "txt"
-            },
-            "placeholder": {
-                "type": "string",
-                "description": "Placeholder for parameter values",
-                "default": "FUZZ"
-            },
-            "subs": {
-                "type": "boolean",
-                "description": "Include subdomains",
-                "default": True
-            }
-        }
-        self.default_config = {key: info["default"] for key, info in self.supported_options.items()}
     
     def _get_description(self) -> str:
         return "Parameter discovery tool for web applications"
     
     async def execute(self, target: str, user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        run_result = {}
+        findings = [finding async for finding in self.execute_stream(target, user_config, run_result)]
+        return {"findings": findings, **run_result}
+    
+    async def execute_stream(self, target: str, user_config: Optional[Dict[str, Any]] = None, run_result: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield parameterized URLs as ParamSpider reports them"""
         config = {**self.default_config, **(user_config or {})}
+        config_id = _config_id(config)
         
         command = ["python3", self.tool_path, "-d", target]
         
@@ -2115,30 +3015,37 @@ class EnhancedParamSpiderPlugin(EnhancedBaseToolPlugin):
         if config.get("subs"):
             command.append("--subs")
         
-        result = await self._run_command(command, timeout=300)  # 5 minute timeout
-        findings = []
+        # The same endpoint is reported once per parameter order it was found with
+        seen = set()
         
-        if result["success"] and result["stdout"]:
-            lines = result["stdout"].strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and ('?' in line or '&' in line):
-                    findings.append({
-                        "type": FindingType.PARAMETER.value,
-                        "value": line,
-                        "source": "paramspider",
-                        "confidence": 0.8,
-                        "metadata": {
-                            "target": target,
-                            "config": config
-                        }
-                    })
+        async with self._stream_command(command, timeout=300) as stream:  # 5 minute timeout
+            async for line in stream:
+                # Cheap check first; only lines that may carry a query are split
+                if '?' not in line:
+                    continue
+                try:
+                    parts = urlsplit(line)
+                except ValueError:
+                    continue
+                # Log lines with a stray "?" or "&amp;" have no URL query
+                if not parts.query or not parts.netloc:
+                    continue
+                key = _split_url_key(parts)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield {
+                    "type": _FT_PARAMETER,
+                    "value": line,
+                    "source": "paramspider",
+                    "confidence": 0.8,
+                    "metadata": {
+                        "target": target,
+                        "path": parts.path,
+                        "query": parts.query,
+                        "config_id": config_id
+                    }
+                }
         
-        return {
-            "findings": findings,
-            "execution_time": result["execution_time"],
-            "success": result["success"],
-            "errors": [result["stderr"]] if result["stderr"] else [],
-            "command_executed": result["command"],
-            "config_used": config
-        }
\ No newline at end of file
+        if run_result is not None:
+            run_result.update(self._stream_result(stream.result, config))
\ No newline at end of file
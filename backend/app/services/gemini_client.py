@@ -1,77 +1,76 @@
 import google.generativeai as genai
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from ..config import settings
 from ..schemas.chat import ChatMessage
-import json
+import asyncio
+import contextlib
+import hashlib
+import orjson
+import os
 import re
+import string
+import time
 
-class GeminiClient:
-    def __init__(self):
-        if not settings.gemini_api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
-        
-        genai.configure(api_key=settings.gemini_api_key)
-        
-        # Try different model names in order of preference (using the latest available models)
-        model_names = [
-            'gemini-2.5-flash', 
-            'gemini-2.0-flash', 
-            'gemini-flash-latest',
-            'gemini-pro-latest',
-            'gemini-2.5-pro'
-        ]
-        
-        self.model = None
-        for model_name in model_names:
-            try:
-                self.model = genai.GenerativeModel(model_name)
-                # Test the model with a simple query
-                test_response = self.model.generate_content("Hello")
-                print(f"✅ Using Gemini model: {model_name}")
-                break
-            except Exception as e:
-                print(f"❌ Model {model_name} failed: {e}")
-                continue
-        
-        if not self.model:
-            raise ValueError("No working Gemini model found. Please check your API key and model availability.")
-        
-    def parse_query(self, query: str, context: Optional[List[ChatMessage]] = None) -> Dict[str, Any]:
-        """Parse natural language query to extract reconnaissance intent"""
-        
-        # Build context from previous messages
-        context_str = ""
-        if context:
-            recent_context = context[-5:]  # Last 5 messages for context
-            context_parts = []
-            for msg in recent_context:
-                # Safely format the context to avoid f-string issues
-                context_parts.append(f"{msg.type}: {str(msg.content).replace('{', '{{').replace('}', '}}')}")
-            context_str = "\n".join(context_parts)
-        
-        prompt = """
+# Canned clarification questions per action, used instead of an extra Gemini round trip
+CLARIFICATION_QUESTIONS = {
+    "subdomain_enumeration": "Please specify the target domain you want to scan for subdomains (e.g., 'Find subdomains for google.com').",
+    "port_scan": "Please specify the target domain or IP address you want to scan for open ports (e.g., 'Scan ports on 192.168.1.1').",
+    "url_discovery": "Please specify the target domain to search for historical URLs (e.g., 'Find URLs for tesla.com').",
+    "http_probe": "Please specify the target domain to probe HTTP services (e.g., 'Probe HTTP services on github.com').",
+    "screenshot": "Please specify the target domain to take screenshots (e.g., 'Take screenshots of microsoft.com').",
+    "content_discovery": "Please specify the target domain to discover content (e.g., 'Find directories on example.org').",
+    "crawling": "Please specify the target domain to crawl (e.g., 'Crawl and spider reddit.com').",
+    "parameter_discovery": "Please specify the target domain to find parameters (e.g., 'Find parameters on facebook.com')."
+}
+
+# Domain-like tokens in a query, for the fallback parser
+_DOMAIN_RE = re.compile(r'\b(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}\b')
+
+# Fallback keyword categories in priority order: (keywords, action, tools)
+_FALLBACK_ACTIONS = (
+    (("subdomain", "subs", "enumerate"), "subdomain_enumeration", ("subfinder", "assetfinder")),
+    (("port", "nmap", "naabu", "scan"), "port_scan", ("naabu",)),
+    (("url", "endpoint", "wayback", "historical"), "url_discovery", ("waybackurls",)),
+    (("http", "probe", "web", "service"), "http_probe", ("httpx",)),
+    (("screenshot", "visual", "gowitness"), "screenshot", ("gowitness",)),
+    (("directory", "content", "gobuster", "ffuf"), "content_discovery", ("gobuster",)),
+    (("crawl", "spider", "katana"), "crawling", ("katana",)),
+    (("parameter", "param", "paramspider"), "parameter_discovery", ("paramspider",))
+)
+_KEYWORD_RANKS = {keyword: rank for rank, (keywords, _, _) in enumerate(_FALLBACK_ACTIONS) for keyword in keywords}
+# Substring matches at every position in one scan; the lookahead lets keywords overlap
+# (e.g. "spider" inside "paramspider"), like the separate `in` checks it replaces
+_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, _KEYWORD_RANKS)) + "))")
+
+# Outermost {...} in a reply that has text around its JSON object
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Intent-parsing prompt; string.Template needs no brace escaping for the JSON examples or
+# for braces in the user's query and context
+_PARSE_PROMPT = string.Template("""
 You are ReconIQ, an AI assistant that helps with cybersecurity reconnaissance. 
 Analyze the user's query and extract the reconnaissance intent, including any tool customization requests.
 
 Context from previous conversation:
-{}
+$context
 
-Current user query: "{}"
+Current user query: "$query"
 
 Respond with a JSON object containing:
-{{
+{
     "action": "subdomain_enumeration|url_discovery|http_probe|historical_search|full_reconnaissance|custom_scan|port_scan|content_discovery|screenshot|crawling|parameter_discovery",
     "targets": ["domain1.com", "domain2.com"],
     "tools": ["subfinder", "amass", "waybackurls", "httpx"],
     "confidence": 0.95,
     "clarification_needed": false,
     "clarification_question": "optional question if clarification needed",
-    "tool_configs": {{
-        "subfinder": {{"threads": 20, "max_time": 10}},
-        "amass": {{"mode": "passive", "timeout": 15}}
-    }},
+    "tool_configs": {
+        "subfinder": {"threads": 20, "max_time": 10},
+        "amass": {"mode": "passive", "timeout": 15}
+    },
     "preset": "quick_scan|comprehensive_scan|stealth_scan|active_scan|content_discovery|screenshot_scan"
-}}
+}
 
 Rules:
 - ALWAYS extract domain targets from the query (look for domains, IPs, URLs)
@@ -111,33 +110,212 @@ Examples:
 - "Find subdomains for google.com" -> action: "subdomain_enumeration", tools: ["subfinder", "assetfinder"], targets: ["google.com"]
 - "Scan ports on 192.168.1.1" -> action: "port_scan", tools: ["nmap", "naabu"], targets: ["192.168.1.1"]
 - "Run nmap scan on tesla.com" -> action: "port_scan", tools: ["nmap"], targets: ["tesla.com"]
-- "Nmap top 100 ports on google.com" -> action: "port_scan", tools: ["nmap"], targets: ["google.com"], tool_configs: {{"nmap": {{"top_ports": 100}}}}
-- "Fast nmap scan with version detection" -> action: "port_scan", tools: ["nmap"], tool_configs: {{"nmap": {{"timing": "4", "version_detection": true}}}}
+- "Nmap top 100 ports on google.com" -> action: "port_scan", tools: ["nmap"], targets: ["google.com"], tool_configs: {"nmap": {"top_ports": 100}}
+- "Fast nmap scan with version detection" -> action: "port_scan", tools: ["nmap"], tool_configs: {"nmap": {"timing": "4", "version_detection": true}}
 - "Take screenshots of github.com" -> action: "screenshot", tools: ["gowitness"], targets: ["github.com"]
 - "Find directories on microsoft.com" -> action: "content_discovery", tools: ["gobuster"], targets: ["microsoft.com"]
 - "Find subdomains" -> clarification_needed: true, clarification_question: "Please specify the target domain you want to scan for subdomains."
 - "Scan ports" -> clarification_needed: true, clarification_question: "Please specify the target domain or IP address you want to scan."
 
 Respond only with valid JSON.
-""".format(context_str, query)
+""")
 
+# Result-summary prompt; the raw results are JSON, so this uses string.Template as well
+_RESPONSE_PROMPT = string.Template("""
+You are ReconIQ, a friendly cybersecurity reconnaissance assistant.
+Generate a natural, conversational response about the reconnaissance results.
+
+Original query: "$query"
+Tools executed: $tools
+Results summary: $summary
+Raw results: $results
+
+Guidelines:
+- Be conversational and helpful
+- Summarize the key findings
+- Suggest logical next steps
+- Keep it concise but informative
+- Use security professional language
+- If no results found, suggest alternatives
+
+Generate a helpful response:
+""")
+
+class GeminiClient:
+    # Tried in order of preference (using the latest available models) when GEMINI_MODEL isn't set
+    MODEL_NAMES = (
+        'gemini-2.5-flash',
+        'gemini-2.0-flash',
+        'gemini-flash-latest',
+        'gemini-pro-latest',
+        'gemini-2.5-pro'
+    )
+    # A probed model name is reused by later starts for this long, skipping the probe
+    MODEL_CACHE_TTL = 7 * 86400  # seconds
+    
+    # Gemini requests in flight at once; more wait for a slot instead of hitting rate limits
+    MAX_CONCURRENT_REQUESTS = 5
+    
+    # Parsed intents by prompt digest; the prompt includes the recent context, so a hit means
+    # the same query in the same conversation state
+    PARSE_CACHE_SIZE = 1024
+    PARSE_CACHE_TTL = 600  # seconds
+    
+    # Clarification questions by normalized query; vague prompts ("scan this") repeat a lot
+    CLARIFY_CACHE_SIZE = 512
+    CLARIFY_CACHE_TTL = 3600  # seconds
+    
+    # Raw results beyond this many bytes are cut from the response prompt; every byte costs
+    # tokens and latency, and the summary doesn't need every finding
+    RESPONSE_RESULTS_LIMIT = 8192
+    
+    def __init__(self):
+        if not settings.gemini_api_key:
+            raise ValueError("GEMINI_API_KEY not found in environment variables")
+        
+        genai.configure(api_key=settings.gemini_api_key)
+        
+        self._model_cache_file = os.path.join(settings.sessions_dir, ".gemini_model")
+        # Set while the model comes from the cache file and no request has succeeded with it yet
+        self._model_unverified = False
+        
+        # A configured or remembered model is used without a test query; on a cold start the model
+        # is left unset and probed for on first use, so construction never blocks the event loop
+        self.model: Optional["genai.GenerativeModel"] = None
+        self._probe_lock = asyncio.Lock()
+        model_name = settings.gemini_model or self._cached_model_name()
+        if model_name:
+            self.model = genai.GenerativeModel(model_name)
+            self._model_unverified = not settings.gemini_model
+            print(f"✅ Using Gemini model: {model_name}")
+        
+        self._request_slots = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        # Prompt digest -> (expiry, JSON text of the parsed intent); each hit decodes a fresh dict
+        self._parse_cache: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self._clarify_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        
+    def _cached_model_name(self) -> Optional[str]:
+        """Model name remembered by an earlier probe, if it is recent enough"""
         try:
-            response = self.model.generate_content(prompt)
+            if time.time() - os.path.getmtime(self._model_cache_file) > self.MODEL_CACHE_TTL:
+                return None
+            with open(self._model_cache_file) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+    
+    async def _get_model(self) -> "genai.GenerativeModel":
+        """The model to send requests to, probing for one first if none is known yet"""
+        if self.model is None:
+            # Concurrent first requests share one probe
+            async with self._probe_lock:
+                if self.model is None:
+                    self.model = await self._probe_model()
+        return self.model
+    
+    async def _probe_model(self) -> "genai.GenerativeModel":
+        """Find the first model that answers a test query and remember its name"""
+        for model_name in self.MODEL_NAMES:
+            try:
+                model = genai.GenerativeModel(model_name)
+                await model.generate_content_async("Hello")
+            except Exception as e:
+                print(f"❌ Model {model_name} failed: {e}")
+                continue
             
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
-                # Fallback parsing
+            print(f"✅ Using Gemini model: {model_name}")
+            try:
+                os.makedirs(settings.sessions_dir, exist_ok=True)
+                # Written via a temp file so a concurrently starting worker never reads a partial name
+                tmp_file = f"{self._model_cache_file}.tmp"
+                with open(tmp_file, "w") as f:
+                    f.write(model_name)
+                os.replace(tmp_file, self._model_cache_file)
+            except OSError as e:
+                print(f"⚠️ Could not remember Gemini model: {e}")
+            return model
+        
+        raise ValueError("No working Gemini model found. Please check your API key and model availability.")
+    
+    async def _generate(self, prompt: str):
+        """Send a prompt to Gemini, waiting for a free request slot"""
+        model = await self._get_model()
+        async with self._request_slots:
+            try:
+                response = await model.generate_content_async(prompt)
+            except Exception:
+                if self._model_unverified:
+                    # The remembered model may have been retired; probe again on the next start
+                    self._model_unverified = False
+                    with contextlib.suppress(OSError):
+                        os.remove(self._model_cache_file)
+                raise
+            self._model_unverified = False
+            return response
+    
+    async def aopen(self):
+        """Warm the async transport (TLS and auth) with a cheap token count request, probing for a model first if needed"""
+        try:
+            if self.model is None:
+                # The probe's test query already connects the transport
+                await self._get_model()
+                return
+            await self.model.count_tokens_async("Hello")
+        except Exception as e:
+            print(f"⚠️ Gemini warmup failed: {e}")
+    
+    async def parse_query(self, query: str, context: Optional[List[ChatMessage]] = None) -> Dict[str, Any]:
+        """Parse natural language query to extract reconnaissance intent"""
+        
+        # Build context from previous messages
+        context_str = ""
+        if context:
+            recent_context = context[-5:]  # Last 5 messages for context
+            context_parts = []
+            for msg in recent_context:
+                context_parts.append(f"{msg.type}: {msg.content}")
+            context_str = "\n".join(context_parts)
+        
+        prompt = _PARSE_PROMPT.substitute(context=context_str, query=query)
+
+        cache_key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+        cached = self._parse_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            self._parse_cache.move_to_end(cache_key)
+            return orjson.loads(cached[1])
+        
+        try:
+            response = await self._generate(prompt)
+            
+            # The reply is normally bare JSON, sometimes in a Markdown fence; parse it directly
+            # and only search for the object when there is text around it
+            intent_json = response.text.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+            try:
+                intent = orjson.loads(intent_json)
+            except orjson.JSONDecodeError:
+                json_match = _JSON_OBJECT_RE.search(intent_json)
+                if not json_match:
+                    # Fallback parsing
+                    return self._fallback_parse(query)
+                intent_json = json_match.group()
+                intent = orjson.loads(intent_json)
+            
+            if not isinstance(intent, dict):
                 return self._fallback_parse(query)
+            
+            # Only successful parses are cached, so a failed call is retried next time
+            self._parse_cache[cache_key] = (time.monotonic() + self.PARSE_CACHE_TTL, intent_json)
+            self._parse_cache.move_to_end(cache_key)
+            if len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+            return intent
                 
         except Exception as e:
             print(f"Gemini API error: {e}")
             return self._fallback_parse(query)
     
-    def generate_response(self, results: Dict[str, Any], query: str) -> str:
-        """Generate natural language response for reconnaissance results"""
+    def _build_response_prompt(self, results: Dict[str, Any], query: str) -> str:
+        """Build the prompt used to summarize reconnaissance results"""
         
         findings_summary = ""
         if "findings" in results:
@@ -146,45 +324,65 @@ Respond only with valid JSON.
         
         tools_used = results.get("tools_executed", [])
         
-        # Safely escape dynamic content
-        safe_query = str(query).replace('{', '{{').replace('}', '}}')
-        safe_results = json.dumps(results, indent=2).replace('{', '{{').replace('}', '}}')
+        raw_results = orjson.dumps(results, option=orjson.OPT_NON_STR_KEYS)
+        if len(raw_results) > self.RESPONSE_RESULTS_LIMIT:
+            # Cut on a byte boundary; a split UTF-8 sequence at the end is dropped
+            raw_results = raw_results[:self.RESPONSE_RESULTS_LIMIT].decode(errors="ignore") + " ... (truncated)"
+        else:
+            raw_results = raw_results.decode()
         
-        prompt = f"""
-You are ReconIQ, a friendly cybersecurity reconnaissance assistant.
-Generate a natural, conversational response about the reconnaissance results.
-
-Original query: "{safe_query}"
-Tools executed: {tools_used}
-Results summary: {findings_summary}
-Raw results: {safe_results}
-
-Guidelines:
-- Be conversational and helpful
-- Summarize the key findings
-- Suggest logical next steps
-- Keep it concise but informative
-- Use security professional language
-- If no results found, suggest alternatives
-
-Generate a helpful response:
-"""
+        return _RESPONSE_PROMPT.substitute(
+            query=query,
+            tools=tools_used,
+            summary=findings_summary,
+            results=raw_results
+        )
 
+    def _fallback_response(self, results: Dict[str, Any]) -> str:
+        tools_used = results.get("tools_executed", [])
+        return f"Found {len(results.get('findings', []))} results from {', '.join(tools_used)}. The reconnaissance completed successfully."
+    
+    async def generate_response(self, results: Dict[str, Any], query: str) -> str:
+        """Generate natural language response for reconnaissance results"""
+        prompt = self._build_response_prompt(results, query)
+        
         try:
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt)
             return response.text.strip()
         except Exception as e:
             print(f"Gemini API error: {e}")
-            return f"Found {len(results.get('findings', []))} results from {', '.join(tools_used)}. The reconnaissance completed successfully."
+            return self._fallback_response(results)
+    
+    async def stream_response(self, results: Dict[str, Any], query: str) -> AsyncIterator[str]:
+        """Stream the natural language response chunk by chunk as Gemini produces it"""
+        prompt = self._build_response_prompt(results, query)
+        produced = False
+        
+        try:
+            model = await self._get_model()
+            # The slot is held until the whole reply has streamed in
+            async with self._request_slots:
+                response = await model.generate_content_async(prompt, stream=True)
+                async for chunk in response:
+                    if chunk.text:
+                        produced = True
+                        yield chunk.text
+        except Exception as e:
+            print(f"Gemini API error: {e}")
+            if not produced:
+                yield self._fallback_response(results)
     
-    def ask_clarification(self, ambiguous_query: str) -> str:
+    async def ask_clarification(self, ambiguous_query: str) -> str:
         """Generate clarification question for ambiguous queries"""
         
-        # Safely escape the query
-        safe_query = str(ambiguous_query).replace('{', '{{').replace('}', '}}')
+        cache_key = " ".join(str(ambiguous_query).lower().split())[:200]
+        cached = self._clarify_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            self._clarify_cache.move_to_end(cache_key)
+            return cached[1]
         
         prompt = f"""
-The user asked: "{safe_query}"
+The user asked: "{ambiguous_query}"
 
 This query is ambiguous for reconnaissance purposes. Generate a helpful clarification question to understand what they want to do.
 
@@ -197,58 +395,35 @@ Generate a single, clear question to clarify their intent:
 """
 
         try:
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
+            response = await self._generate(prompt)
+            question = response.text.strip()
         except Exception as e:
             return "Could you please specify what type of reconnaissance you'd like to perform and on which target domain?"
+        
+        # Only Gemini's answers are cached, so a failed call is retried next time
+        self._clarify_cache[cache_key] = (time.monotonic() + self.CLARIFY_CACHE_TTL, question)
+        self._clarify_cache.move_to_end(cache_key)
+        if len(self._clarify_cache) > self.CLARIFY_CACHE_SIZE:
+            self._clarify_cache.popitem(last=False)
+        return question
     
     def _fallback_parse(self, query: str) -> Dict[str, Any]:
         """Fallback parsing when Gemini API fails"""
         
         # Simple regex-based parsing
-        domains = re.findall(r'\b(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}\b', query)
+        domains = _DOMAIN_RE.findall(query)
         
-        # Determine action based on keywords
+        # Determine action from the highest-priority category with a keyword in the query
         query_lower = query.lower()
-        if any(word in query_lower for word in ["subdomain", "subs", "enumerate"]):
-            action = "subdomain_enumeration"
-            tools = ["subfinder", "assetfinder"]
-        elif any(word in query_lower for word in ["port", "nmap", "naabu", "scan"]):
-            action = "port_scan"
-            tools = ["nmap"] if "nmap" in query_lower else ["naabu"]
-        elif any(word in query_lower for word in ["url", "endpoint", "wayback", "historical"]):
-            action = "url_discovery"
-            tools = ["waybackurls"]
-        elif any(word in query_lower for word in ["http", "probe", "web", "service"]):
-            action = "http_probe"
-            tools = ["httpx"]
-        elif any(word in query_lower for word in ["screenshot", "visual", "gowitness"]):
-            action = "screenshot"
-            tools = ["gowitness"]
-        elif any(word in query_lower for word in ["directory", "content", "gobuster", "ffuf"]):
-            action = "content_discovery"
-            tools = ["gobuster"]
-        elif any(word in query_lower for word in ["crawl", "spider", "katana"]):
-            action = "crawling"
-            tools = ["katana"]
-        elif any(word in query_lower for word in ["parameter", "param", "paramspider"]):
-            action = "parameter_discovery"
-            tools = ["paramspider"]
+        matched = {_KEYWORD_RANKS[keyword] for keyword in _KEYWORD_RE.findall(query_lower)}
+        if matched:
+            _, action, tools = _FALLBACK_ACTIONS[min(matched)]
+            if action == "port_scan":
+                tools = ("nmap",) if "nmap" in query_lower else ("naabu",)
         else:
             action = "subdomain_enumeration"  # Default
-            tools = ["subfinder"]
-        
-        # Generate appropriate clarification question based on action
-        clarification_questions = {
-            "subdomain_enumeration": "Please specify the target domain you want to scan for subdomains (e.g., 'Find subdomains for google.com').",
-            "port_scan": "Please specify the target domain or IP address you want to scan for open ports (e.g., 'Scan ports on 192.168.1.1').",
-            "url_discovery": "Please specify the target domain to search for historical URLs (e.g., 'Find URLs for tesla.com').",
-            "http_probe": "Please specify the target domain to probe HTTP services (e.g., 'Probe HTTP services on github.com').",
-            "screenshot": "Please specify the target domain to take screenshots (e.g., 'Take screenshots of microsoft.com').",
-            "content_discovery": "Please specify the target domain to discover content (e.g., 'Find directories on example.org').",
-            "crawling": "Please specify the target domain to crawl (e.g., 'Crawl and spider reddit.com').",
-            "parameter_discovery": "Please specify the target domain to find parameters (e.g., 'Find parameters on facebook.com')."
-        }
+            tools = ("subfinder",)
+        tools = list(tools)
         
         return {
             "action": action,
@@ -256,5 +431,5 @@ Generate a single, clear question to clarify their intent:
             "tools": tools,
             "confidence": 0.7 if len(domains) > 0 else 0.3,
             "clarification_needed": len(domains) == 0,
-            "clarification_question": clarification_questions.get(action, "Please specify the target domain or IP address for reconnaissance.")
+            "clarification_question": CLARIFICATION_QUESTIONS.get(action, "Please specify the target domain or IP address for reconnaissance.")
         }
\ No newline at end of file
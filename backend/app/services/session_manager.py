@@ -1,112 +1,760 @@
 import os
-import json
+import io
+import csv
 import uuid
+import asyncio
+import time
+import logging
+from collections import defaultdict, deque, OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Deque
 from ..schemas.chat import ChatMessage, MessageType, SessionInfo
 from ..config import settings
+from pydantic import TypeAdapter
 import aiofiles
+import aiosqlite
+import ormsgpack
+import orjson
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+_HISTORY_ADAPTER = TypeAdapter(List[ChatMessage])
+
+# Message type strings to members; a dict hit instead of the Enum constructor's lookup
+_MESSAGE_TYPES = {message_type.value: message_type for message_type in MessageType}
+
+def _dumps(document: Any, option: int = 0) -> bytes:
+    """Serialize a stored document; datetimes are written as ISO-8601 like isoformat()"""
+    # Tool results may carry non-string keys, which the stdlib encoder converted silently
+    return orjson.dumps(document, option=option | orjson.OPT_NON_STR_KEYS)
+
+class SessionWriteError(Exception):
+    """Raised by a backend when some sessions in a batch were not written; the others were"""
+    
+    def __init__(self, failed: Dict[str, BaseException]):
+        super().__init__(f"{len(failed)} session(s) not written: " + "; ".join(f"{session_id}: {error}" for session_id, error in failed.items()))
+        self.failed = failed
+
+class FileSessionBackend:
+    """Stores each session as an append-only JSONL message log plus a small metadata file"""
+    
+    # Session files read at once while building the listing
+    INDEX_LOAD_CONCURRENCY = 16
+    
+    # Sessions saved before the log format are single <id>.json documents; they are still
+    # read, and converted to the log format on their next append
+    
+    def __init__(self, sessions_dir: str):
+        self.sessions_dir = sessions_dir
+        os.makedirs(self.sessions_dir, exist_ok=True)
+        # Serialize appends per session
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Session listing, read from disk by the first list_sessions and then kept in step with
+        # writes and deletes; file sessions belong to one process, so nothing else changes them
+        self._index: Dict[str, SessionInfo] = {}
+        self._index_loaded = False
+        self._index_lock = asyncio.Lock()
+    
+    def _messages_file(self, session_id: str) -> str:
+        return os.path.join(self.sessions_dir, f"{session_id}.jsonl")
+    
+    def _meta_file(self, session_id: str) -> str:
+        return os.path.join(self.sessions_dir, f"{session_id}.meta.json")
+    
+    def _legacy_file(self, session_id: str) -> str:
+        return os.path.join(self.sessions_dir, f"{session_id}.json")
+    
+    async def aopen(self):
+        """Nothing to connect for file storage"""
+    
+    async def aclose(self):
+        """Nothing to release for file storage"""
+    
+    async def append_batch(self, batch: Dict[str, List[bytes]]):
+        """Append encoded messages to each touched session's log"""
+        results = await asyncio.gather(*(
+            self._append_messages(session_id, messages)
+            for session_id, messages in batch.items()
+        ), return_exceptions=True)
+        
+        # Sessions are written independently, so report exactly which ones failed
+        failed = {session_id: result for session_id, result in zip(batch, results) if isinstance(result, Exception)}
+        if failed:
+            raise SessionWriteError(failed)
+    
+    @staticmethod
+    async def _read_json(path: str) -> Optional[Any]:
+        """Read a JSON document, or None if the file is missing or empty"""
+        try:
+            async with aiofiles.open(path, 'rb') as f:
+                content = await f.read()
+        except FileNotFoundError:
+            return None
+        
+        if not content.strip():
+            return None
+        return orjson.loads(content)
+    
+    @staticmethod
+    async def _write_atomic(path: str, content: bytes):
+        """Write a file via a temp file so concurrent readers never see a partial write"""
+        tmp_file = f"{path}.tmp"
+        async with aiofiles.open(tmp_file, 'wb') as f:
+            await f.write(content)
+        os.replace(tmp_file, path)
+    
+    async def _append_messages(self, session_id: str, messages: List[bytes]):
+        messages_file = self._messages_file(session_id)
+        
+        async with self._locks[session_id]:
+            now = datetime.now().isoformat()
+            meta = await self._read_json(self._meta_file(session_id))
+            legacy = None
+            
+            if meta is None:
+                legacy = await self._read_json(self._legacy_file(session_id))
+                meta = {
+                    "session_id": session_id,
+                    "start_time": legacy["start_time"] if legacy else now,
+                    "message_count": 0
+                }
+            
+            lines = b"".join(message + b"\n" for message in messages)
+            if legacy:
+                # First append to an old single-document session: write its messages and the new
+                # ones as a fresh log, replaced as a whole so a retry after a crash can't duplicate them
+                earlier = legacy.get("messages", [])
+                lines = b"".join(_dumps(message) + b"\n" for message in earlier) + lines
+                await self._write_atomic(messages_file, lines)
+                meta["message_count"] = len(earlier)
+                meta["log_size"] = len(lines)
+            else:
+                # Only the new messages are written; earlier ones are never read or rewritten.
+                # The metadata records how much of the log was committed, so anything past that
+                # (an append cut short by a crash) is dropped before writing after it
+                log_size = meta.get("log_size", 0)
+                if os.path.exists(messages_file) and os.path.getsize(messages_file) != log_size:
+                    os.truncate(messages_file, log_size)
+                async with aiofiles.open(messages_file, 'ab') as f:
+                    await f.write(lines)
+                meta["log_size"] = log_size + len(lines)
+            
+            meta["last_activity"] = now
+            meta["message_count"] += len(messages)
+            await self._write_atomic(self._meta_file(session_id), _dumps(meta))
+            if legacy:
+                os.remove(self._legacy_file(session_id))
+            
+            self._index[session_id] = self._session_info(meta)
+    
+    @staticmethod
+    def _session_info(meta: Dict[str, Any]) -> SessionInfo:
+        return SessionInfo(
+            session_id=meta["session_id"],
+            start_time=datetime.fromisoformat(meta["start_time"]),
+            last_activity=datetime.fromisoformat(meta["last_activity"]),
+            message_count=meta["message_count"]
+        )
+    
+    async def _read_message_lines(self, session_id: str) -> List[bytes]:
+        """Read a session's log as one encoded message per line"""
+        try:
+            async with aiofiles.open(self._messages_file(session_id), 'rb') as f:
+                content = await f.read()
+        except FileNotFoundError:
+            return []
+        
+        lines = content.split(b"\n")
+        # Every append ends with a newline, so whatever follows the last one is empty or a
+        # write cut short by a crash
+        lines.pop()
+        return [line for line in lines if line]
+    
+    async def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Load the full session document, or None if it does not exist"""
+        meta = await self._read_json(self._meta_file(session_id))
+        if meta is None:
+            return await self._read_json(self._legacy_file(session_id))
+        
+        return {
+            "session_id": session_id,
+            "start_time": meta["start_time"],
+            "last_activity": meta["last_activity"],
+            "messages": [orjson.loads(line) for line in await self._read_message_lines(session_id)]
+        }
+    
+    async def load_messages_json(self, session_id: str) -> Optional[bytes]:
+        """Join the logged message documents into a JSON array without decoding them"""
+        if not os.path.exists(self._meta_file(session_id)):
+            session_data = await self._read_json(self._legacy_file(session_id))
+            if session_data is None:
+                return None
+            return _dumps(session_data.get("messages", []))
+        
+        return b"[" + b",".join(await self._read_message_lines(session_id)) + b"]"
+    
+    async def _load_index(self):
+        """Read every session's metadata once to build the session listing"""
+        if not os.path.exists(self.sessions_dir):
+            return
+        
+        session_ids = set()
+        with os.scandir(self.sessions_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.meta.json'):
+                    session_ids.add(entry.name[:-len('.meta.json')])
+                elif entry.name.endswith('.json'):
+                    session_ids.add(entry.name[:-len('.json')])  # Not yet converted to the log format
+        
+        # Read the files concurrently, bounded so a large directory can't exhaust file handles
+        slots = asyncio.Semaphore(self.INDEX_LOAD_CONCURRENCY)
+        await asyncio.gather(*(self._index_session(session_id, slots) for session_id in session_ids))
+    
+    async def _index_session(self, session_id: str, slots: asyncio.Semaphore):
+        # Under the session's lock, so a write or delete can't interleave with the read
+        async with slots, self._locks[session_id]:
+            if session_id in self._index:
+                return  # Written since the listing started
+            try:
+                meta = await self._read_json(self._meta_file(session_id))
+                if meta is None:
+                    session_data = await self._read_json(self._legacy_file(session_id))
+                    if session_data:
+                        meta = {**session_data, "message_count": len(session_data.get("messages", []))}
+                if meta:
+                    self._index[session_id] = self._session_info(meta)
+            except Exception as e:
+                print(f"Error reading session {session_id}: {e}")
+    
+    async def list_sessions(self) -> List[SessionInfo]:
+        """List all stored sessions from the in-memory index, reading the files only the first time"""
+        if not self._index_loaded:
+            async with self._index_lock:
+                if not self._index_loaded:
+                    await self._load_index()
+                    self._index_loaded = True
+        
+        return list(self._index.values())
+    
+    async def delete_session(self, session_id: str):
+        """Delete a session's files"""
+        async with self._locks[session_id]:
+            for path in (self._messages_file(session_id), self._meta_file(session_id), self._legacy_file(session_id)):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._index.pop(session_id, None)
+    
+    async def delete_inactive(self, cutoff: datetime) -> List[str]:
+        """Delete sessions with no activity since the cutoff, judged by file mtimes; returns their ids"""
+        # The metadata file is replaced on every append, so its mtime is the last activity
+        cutoff_ts = cutoff.timestamp()
+        stale = set()
+        with os.scandir(self.sessions_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.meta.json'):
+                    session_id = entry.name[:-len('.meta.json')]
+                elif entry.name.endswith('.json'):
+                    session_id = entry.name[:-len('.json')]
+                else:
+                    continue
+                if entry.stat().st_mtime < cutoff_ts:
+                    stale.add(session_id)
+        
+        for session_id in stale:
+            await self.delete_session(session_id)
+        return list(stale)
+
+class RedisSessionBackend:
+    """Stores session metadata in a Redis hash and messages in a Redis list"""
+    
+    INDEX_KEY = "sessions"
+    
+    def __init__(self, redis_url: str, ttl_seconds: int):
+        self.redis = redis.from_url(redis_url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+    
+    async def aopen(self):
+        """Open a pooled connection so the first request skips the connect handshake"""
+        await self.redis.ping()
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.redis.aclose()
+    
+    @staticmethod
+    def _meta_key(session_id: str) -> str:
+        return f"session:{session_id}:meta"
+    
+    @staticmethod
+    def _messages_key(session_id: str) -> str:
+        return f"session:{session_id}:messages"
+    
+    async def append_batch(self, batch: Dict[str, List[bytes]]):
+        """Append encoded messages for all sessions and refresh their TTLs in a single transaction"""
+        now = datetime.now()
+        
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for session_id, messages in batch.items():
+                meta_key = self._meta_key(session_id)
+                messages_key = self._messages_key(session_id)
+                pipe.hsetnx(meta_key, "start_time", now.isoformat())
+                pipe.hset(meta_key, mapping={"session_id": session_id, "last_activity": now.isoformat()})
+                pipe.rpush(messages_key, *messages)
+                pipe.expire(meta_key, self.ttl_seconds)
+                pipe.expire(messages_key, self.ttl_seconds)
+                pipe.zadd(self.INDEX_KEY, {session_id: now.timestamp()})
+            await pipe.execute()
+    
+    async def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Load the full session document, or None if it does not exist"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._meta_key(session_id))
+            pipe.lrange(self._messages_key(session_id), 0, -1)
+            meta, raw_messages = await pipe.execute()
+        
+        if not meta:
+            return None
+        
+        return {
+            "session_id": session_id,
+            "start_time": meta["start_time"],
+            "last_activity": meta["last_activity"],
+            "messages": [orjson.loads(raw) for raw in raw_messages]
+        }
+    
+    async def load_messages_json(self, session_id: str) -> Optional[bytes]:
+        """Join the stored message documents into a JSON array without decoding them"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.exists(self._meta_key(session_id))
+            pipe.lrange(self._messages_key(session_id), 0, -1)
+            exists, raw_messages = await pipe.execute()
+        
+        if not exists:
+            return None
+        return f"[{','.join(raw_messages)}]".encode()
+    
+    async def list_sessions(self) -> List[SessionInfo]:
+        """List live sessions from the activity index"""
+        session_ids = await self.redis.zrevrange(self.INDEX_KEY, 0, -1)
+        if not session_ids:
+            return []
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hgetall(self._meta_key(session_id))
+                pipe.llen(self._messages_key(session_id))
+            replies = await pipe.execute()
+        
+        sessions = []
+        expired = []
+        for session_id, meta, message_count in zip(session_ids, replies[::2], replies[1::2]):
+            if not meta:
+                # The session keys expired; drop it from the index
+                expired.append(session_id)
+                continue
+            sessions.append(SessionInfo(
+                session_id=session_id,
+                start_time=datetime.fromisoformat(meta["start_time"]),
+                last_activity=datetime.fromisoformat(meta["last_activity"]),
+                message_count=message_count
+            ))
+        
+        if expired:
+            await self.redis.zrem(self.INDEX_KEY, *expired)
+        
+        return sessions
+    
+    async def delete_session(self, session_id: str):
+        """Delete a session's keys and index entry"""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._meta_key(session_id), self._messages_key(session_id))
+            pipe.zrem(self.INDEX_KEY, session_id)
+            await pipe.execute()
+    
+    async def delete_inactive(self, cutoff: datetime) -> List[str]:
+        """Delete sessions whose index score is older than the cutoff; returns their ids"""
+        # Keys also expire on their own TTL; this catches a max age shorter than that
+        cutoff_ts = cutoff.timestamp()
+        session_ids = await self.redis.zrangebyscore(self.INDEX_KEY, "-inf", f"({cutoff_ts}")
+        if not session_ids:
+            return []
+        
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for session_id in session_ids:
+                pipe.delete(self._meta_key(session_id), self._messages_key(session_id))
+            pipe.zrem(self.INDEX_KEY, *session_ids)
+            await pipe.execute()
+        return session_ids
+
+class SqliteSessionBackend:
+    """Stores sessions in one SQLite database in WAL mode; appends never rewrite earlier messages"""
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            start_time TEXT NOT NULL,
+            last_activity TEXT NOT NULL,
+            message_count INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            body TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS messages_by_session ON messages (session_id, id);
+        CREATE INDEX IF NOT EXISTS sessions_by_activity ON sessions (last_activity);
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+    
+    async def _connection(self) -> aiosqlite.Connection:
+        """Open the database on first use and make sure the schema exists"""
+        if self._db is None:
+            async with self._connect_lock:
+                if self._db is None:
+                    db = await aiosqlite.connect(self.db_path)
+                    # WAL lets readers (including other workers) run alongside the writer
+                    await db.execute("PRAGMA journal_mode=WAL")
+                    await db.execute("PRAGMA synchronous=NORMAL")
+                    await db.executescript(self.SCHEMA)
+                    self._db = db
+        return self._db
+    
+    async def aopen(self):
+        """Open the database so the first request skips the connect and schema check"""
+        await self._connection()
+    
+    async def aclose(self):
+        """Close the database connection"""
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+    
+    async def append_batch(self, batch: Dict[str, List[bytes]]):
+        """Insert encoded messages for all sessions in a single transaction"""
+        db = await self._connection()
+        now = datetime.now().isoformat()
+        
+        try:
+            for session_id, messages in batch.items():
+                await db.execute(
+                    "INSERT INTO sessions (id, start_time, last_activity, message_count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET last_activity = excluded.last_activity, "
+                    "message_count = message_count + excluded.message_count",
+                    (session_id, now, now, len(messages))
+                )
+                await db.executemany(
+                    "INSERT INTO messages (session_id, body) VALUES (?, ?)",
+                    [(session_id, message.decode()) for message in messages]
+                )
+            await db.commit()
+        except BaseException:
+            # Leave nothing half-inserted for the next batch's commit to pick up
+            await db.rollback()
+            raise
+    
+    async def _message_bodies(self, db: aiosqlite.Connection, session_id: str) -> List[str]:
+        async with db.execute("SELECT body FROM messages WHERE session_id = ? ORDER BY id", (session_id,)) as cursor:
+            return [body for body, in await cursor.fetchall()]
+    
+    async def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Load the full session document, or None if it does not exist"""
+        db = await self._connection()
+        async with db.execute("SELECT start_time, last_activity FROM sessions WHERE id = ?", (session_id,)) as cursor:
+            row = await cursor.fetchone()
+        
+        if row is None:
+            return None
+        
+        return {
+            "session_id": session_id,
+            "start_time": row[0],
+            "last_activity": row[1],
+            "messages": [orjson.loads(body) for body in await self._message_bodies(db, session_id)]
+        }
+    
+    async def load_messages_json(self, session_id: str) -> Optional[bytes]:
+        """Join the stored message documents into a JSON array without decoding them"""
+        db = await self._connection()
+        async with db.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)) as cursor:
+            if await cursor.fetchone() is None:
+                return None
+        
+        return f"[{','.join(await self._message_bodies(db, session_id))}]".encode()
+    
+    async def list_sessions(self) -> List[SessionInfo]:
+        """List stored sessions from the sessions table; messages aren't read"""
+        db = await self._connection()
+        async with db.execute("SELECT id, start_time, last_activity, message_count FROM sessions") as cursor:
+            rows = await cursor.fetchall()
+        
+        return [
+            SessionInfo(
+                session_id=session_id,
+                start_time=datetime.fromisoformat(start_time),
+                last_activity=datetime.fromisoformat(last_activity),
+                message_count=message_count
+            )
+            for session_id, start_time, last_activity, message_count in rows
+        ]
+    
+    async def delete_session(self, session_id: str):
+        """Delete a session and its messages"""
+        db = await self._connection()
+        await db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+        await db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+        await db.commit()
+    
+    async def delete_inactive(self, cutoff: datetime) -> List[str]:
+        """Delete sessions with no activity since the cutoff in one transaction; returns their ids"""
+        db = await self._connection()
+        # Timestamps are stored in isoformat(), which sorts chronologically as text
+        cutoff_iso = cutoff.isoformat()
+        async with db.execute("SELECT id FROM sessions WHERE last_activity < ?", (cutoff_iso,)) as cursor:
+            session_ids = [session_id for session_id, in await cursor.fetchall()]
+        
+        if session_ids:
+            await db.execute(
+                "DELETE FROM messages WHERE session_id IN (SELECT id FROM sessions WHERE last_activity < ?)",
+                (cutoff_iso,)
+            )
+            await db.execute("DELETE FROM sessions WHERE last_activity < ?", (cutoff_iso,))
+            await db.commit()
+        return session_ids
 
 class SessionManager:
+    # Writes are queued and flushed in batches by a background task
+    FLUSH_INTERVAL = 0.005
+    MAX_BATCH = 64
+    # A failed batch write is retried this many times, backing off from the delay
+    FLUSH_RETRIES = 3
+    FLUSH_RETRY_DELAY = 0.1  # seconds
+    
+    # Recently used histories are kept in memory; the TTL bounds staleness across workers
+    HISTORY_CACHE_SIZE = 1024
+    HISTORY_CACHE_TTL = 30  # seconds
+    
+    # Messages given to the query parser as context; kept per session so a turn needs no history load
+    RECENT_CONTEXT_SIZE = 5
+    
     def __init__(self):
-        self.sessions_dir = settings.sessions_dir
-        os.makedirs(self.sessions_dir, exist_ok=True)
+        if settings.session_backend == "redis":
+            self.backend = RedisSessionBackend(
+                settings.redis_url,
+                ttl_seconds=settings.max_session_age_days * 86400
+            )
+        elif settings.session_backend == "sqlite":
+            self.backend = SqliteSessionBackend(os.path.join(settings.sessions_dir, "sessions.db"))
+        else:
+            self.backend = FileSessionBackend(settings.sessions_dir)
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        # Messages queued and processed so far; flush() waits for the count queued when it was called
+        self._queued_count = 0
+        self._processed_count = 0
+        self._flush_waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+        self._history_cache: "OrderedDict[str, Tuple[float, List[ChatMessage]]]" = OrderedDict()
+        # Marks in-flight history loads; a write during the load stops its result being cached
+        self._history_loads: Dict[str, object] = {}
+        # Last few messages per session, on the same size and TTL bounds as the history cache
+        self._recent_context: "OrderedDict[str, Tuple[float, Deque[ChatMessage]]]" = OrderedDict()
+        self._recent_loads: Dict[str, object] = {}
+    
+    def _ensure_flusher(self) -> asyncio.Queue:
+        """Start the background flusher on first use, inside the running event loop"""
+        if self._flusher is None or self._flusher.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._flusher = asyncio.create_task(self._flush_loop())
+        return self._queue
+    
+    async def _flush_loop(self):
+        """Drain queued messages and write them to the backend in batches"""
+        while True:
+            items = [await self._queue.get()]
+            # Give concurrent requests a moment to enqueue their writes too
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            while len(items) < self.MAX_BATCH and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            
+            # Group by session, keeping FIFO order within each session
+            batch: Dict[str, List[bytes]] = {}
+            for session_id, message in items:
+                batch.setdefault(session_id, []).append(message)
+            
+            try:
+                await self._write_batch(batch)
+            finally:
+                self._processed_count += len(items)
+                # Items are written in queue order, so waiters are released in the order they came
+                while self._flush_waiters and self._flush_waiters[0][0] <= self._processed_count:
+                    waiter = self._flush_waiters.popleft()[1]
+                    if not waiter.done():
+                        waiter.set_result(None)
+    
+    async def _write_batch(self, batch: Dict[str, List[bytes]]):
+        """Write a batch to the backend, retrying the sessions that failed"""
+        for attempt in range(self.FLUSH_RETRIES + 1):
+            try:
+                await self.backend.append_batch(batch)
+                return
+            except SessionWriteError as e:
+                # The other sessions were written; retrying them would duplicate their messages
+                batch = {session_id: batch[session_id] for session_id in e.failed}
+                error = e
+            except Exception as e:
+                # Redis and SQLite write a batch in one transaction, so none of it was written
+                error = e
+            
+            if attempt < self.FLUSH_RETRIES:
+                await asyncio.sleep(self.FLUSH_RETRY_DELAY * 2 ** attempt)
+        
+        logger.error("Dropped session messages for %s after %d attempts", ", ".join(batch), self.FLUSH_RETRIES + 1, exc_info=error)
+        # The cached history and context hold the lost messages; reload them from storage instead
+        for session_id in batch:
+            self._history_cache.pop(session_id, None)
+            self._history_loads.pop(session_id, None)
+            self._recent_context.pop(session_id, None)
+            self._recent_loads.pop(session_id, None)
+    
+    async def aopen(self):
+        """Connect the storage backend and start the background flusher"""
+        self._ensure_flusher()
+        try:
+            await self.backend.aopen()
+        except Exception as e:
+            print(f"⚠️ Session backend warmup failed: {e}")
+    
+    async def flush(self):
+        """Wait until every message queued before this call has been written"""
+        # Waits on a position in the queue rather than for it to drain, so steady writes queued
+        # after the call can't hold up a read
+        if self._processed_count >= self._queued_count:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._flush_waiters.append((self._queued_count, waiter))
+        await waiter
+    
+    async def aclose(self):
+        """Flush pending writes, stop the background flusher and close the backend"""
+        await self.flush()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.backend.aclose()
     
     def create_session(self) -> str:
         """Create a new session and return session ID"""
-        session_id = str(uuid.uuid4())
+        # 32 hex chars, no dashes; also the session's file name stem
+        session_id = uuid.uuid4().hex
+        # A new session has no history, so its context needs no load
+        self._cache_recent_context(session_id, deque(maxlen=self.RECENT_CONTEXT_SIZE))
         return session_id
     
     async def add_message(self, session_id: str, message_type: str, content: str, results: Optional[Dict[str, Any]] = None):
-        """Add a message to the session history"""
-        message = ChatMessage(
+        """Queue a message for the session history; it is written by the background flusher"""
+        type_member = _MESSAGE_TYPES.get(message_type)
+        if type_member is None:
+            raise ValueError(f"Unknown message type: {message_type!r}")
+        
+        # Every field is already the right type, so the model is built without validation
+        message = ChatMessage.model_construct(
             timestamp=datetime.now(),
-            type=MessageType(message_type),
+            type=type_member,
             content=content,
             results=results
         )
         
-        session_file = os.path.join(self.sessions_dir, f"{session_id}.json")
-        
-        # Load existing session or create new
-        session_data = {
-            "session_id": session_id,
-            "start_time": datetime.now().isoformat(),
-            "last_activity": datetime.now().isoformat(),
-            "messages": []
-        }
-        
-        if os.path.exists(session_file):
-            async with aiofiles.open(session_file, 'r') as f:
-                content_str = await f.read()
-                if content_str.strip():
-                    session_data = json.loads(content_str)
-        
-        # Add new message
-        session_data["messages"].append({
-            "timestamp": message.timestamp.isoformat(),
+        # Encoded here so a message that can't be stored fails this call instead of the background
+        # write; the timestamp is a datetime, which orjson writes in isoformat() form
+        encoded = _dumps({
+            "timestamp": message.timestamp,
             "type": message.type.value,
             "content": message.content,
             "results": message.results
         })
-        session_data["last_activity"] = datetime.now().isoformat()
+        self._ensure_flusher().put_nowait((session_id, encoded))
+        self._queued_count += 1
         
-        # Save session
-        async with aiofiles.open(session_file, 'w') as f:
-            await f.write(json.dumps(session_data, indent=2))
+        # Keep the cached history in step with the queued write
+        self._history_loads.pop(session_id, None)
+        cached = self._history_cache.get(session_id)
+        if cached:
+            cached[1].append(message)
+        self._recent_loads.pop(session_id, None)
+        recent = self._recent_context.get(session_id)
+        if recent:
+            recent[1].append(message)  # The deque drops the oldest message itself
     
     async def get_conversation_history(self, session_id: str) -> List[ChatMessage]:
         """Get conversation history for a session"""
-        session_file = os.path.join(self.sessions_dir, f"{session_id}.json")
+        cached = self._history_cache.get(session_id)
+        if cached and cached[0] > time.monotonic():
+            self._history_cache.move_to_end(session_id)
+            return list(cached[1])
         
-        if not os.path.exists(session_file):
-            return []
+        load_token = self._history_loads[session_id] = object()
+        await self.flush()
+        session_data = await self.backend.load_session(session_id)
         
-        async with aiofiles.open(session_file, 'r') as f:
-            content = await f.read()
-            if not content.strip():
-                return []
-            
-            session_data = json.loads(content)
-            messages = []
-            
-            for msg_data in session_data.get("messages", []):
-                messages.append(ChatMessage(
-                    timestamp=datetime.fromisoformat(msg_data["timestamp"]),
-                    type=MessageType(msg_data["type"]),
-                    content=msg_data["content"],
-                    results=msg_data.get("results")
-                ))
-            
-            return messages
+        # Validate the whole list in one pass; ISO timestamps and type strings are coerced
+        messages = _HISTORY_ADAPTER.validate_python(session_data.get("messages", [])) if session_data else []
+        
+        if self._history_loads.get(session_id) is load_token:
+            del self._history_loads[session_id]
+            self._history_cache[session_id] = (time.monotonic() + self.HISTORY_CACHE_TTL, messages)
+            self._history_cache.move_to_end(session_id)
+            if len(self._history_cache) > self.HISTORY_CACHE_SIZE:
+                self._history_cache.popitem(last=False)
+        
+        return list(messages)
+    
+    def _cache_recent_context(self, session_id: str, recent: Deque[ChatMessage]):
+        self._recent_context[session_id] = (time.monotonic() + self.HISTORY_CACHE_TTL, recent)
+        self._recent_context.move_to_end(session_id)
+        if len(self._recent_context) > self.HISTORY_CACHE_SIZE:
+            self._recent_context.popitem(last=False)
+    
+    async def get_recent_context(self, session_id: str) -> List[ChatMessage]:
+        """Get the last few messages of a session, loading its history only if they aren't in memory"""
+        cached = self._recent_context.get(session_id)
+        if cached and cached[0] > time.monotonic():
+            self._recent_context.move_to_end(session_id)
+            return list(cached[1])
+        
+        load_token = self._recent_loads[session_id] = object()
+        history = await self.get_conversation_history(session_id)
+        recent = deque(history[-self.RECENT_CONTEXT_SIZE:], maxlen=self.RECENT_CONTEXT_SIZE)
+        
+        # A message added during the load may be missing from it, so only cache an undisturbed load
+        if self._recent_loads.get(session_id) is load_token:
+            del self._recent_loads[session_id]
+            self._cache_recent_context(session_id, recent)
+        
+        return list(recent)
+    
+    async def get_history_json(self, session_id: str) -> bytes:
+        """Get a session's messages as a JSON array, passing stored JSON through where possible"""
+        cached = self._history_cache.get(session_id)
+        if cached and cached[0] > time.monotonic():
+            return _HISTORY_ADAPTER.dump_json(cached[1])
+        
+        await self.flush()
+        return await self.backend.load_messages_json(session_id) or b"[]"
     
     async def list_sessions(self) -> List[SessionInfo]:
         """List all available sessions"""
-        sessions = []
-        
-        if not os.path.exists(self.sessions_dir):
-            return sessions
-        
-        for filename in os.listdir(self.sessions_dir):
-            if filename.endswith('.json'):
-                session_id = filename[:-5]  # Remove .json extension
-                session_file = os.path.join(self.sessions_dir, filename)
-                
-                try:
-                    async with aiofiles.open(session_file, 'r') as f:
-                        content = await f.read()
-                        if content.strip():
-                            session_data = json.loads(content)
-                            
-                            sessions.append(SessionInfo(
-                                session_id=session_id,
-                                start_time=datetime.fromisoformat(session_data["start_time"]),
-                                last_activity=datetime.fromisoformat(session_data["last_activity"]),
-                                message_count=len(session_data.get("messages", []))
-                            ))
-                except Exception as e:
-                    print(f"Error reading session {session_id}: {e}")
-                    continue
+        await self.flush()
+        sessions = await self.backend.list_sessions()
         
         # Sort by last activity (most recent first)
         sessions.sort(key=lambda x: x.last_activity, reverse=True)
@@ -114,53 +762,131 @@ class SessionManager:
     
     async def delete_session(self, session_id: str):
         """Delete a session"""
-        session_file = os.path.join(self.sessions_dir, f"{session_id}.json")
-        
-        if os.path.exists(session_file):
-            os.remove(session_file)
+        await self.flush()
+        self._history_cache.pop(session_id, None)
+        self._recent_context.pop(session_id, None)
+        await self.backend.delete_session(session_id)
     
     async def cleanup_old_sessions(self):
         """Clean up sessions older than max_session_age_days"""
         cutoff_date = datetime.now() - timedelta(days=settings.max_session_age_days)
         
-        sessions = await self.list_sessions()
-        for session in sessions:
-            if session.last_activity < cutoff_date:
-                await self.delete_session(session.session_id)
+        # Each backend finds stale sessions from its own activity record, without loading them
+        await self.flush()
+        for session_id in await self.backend.delete_inactive(cutoff_date):
+            self._history_cache.pop(session_id, None)
+            self._recent_context.pop(session_id, None)
     
-    async def export_session(self, session_id: str, format: str = "json") -> Dict[str, Any]:
-        """Export session data in specified format"""
-        session_file = os.path.join(self.sessions_dir, f"{session_id}.json")
+    async def _load_for_export(self, session_id: str) -> Dict[str, Any]:
+        await self.flush()
+        session_data = await self.backend.load_session(session_id)
         
-        if not os.path.exists(session_file):
+        if session_data is None:
             raise FileNotFoundError(f"Session {session_id} not found")
+        return session_data
+    
+    async def stream_export(self, session_id: str, format: str = "jsonl") -> Dict[str, Any]:
+        """Export session data as an iterator of byte chunks instead of one string"""
+        if format.lower() == "jsonl":
+            media_type, iter_content = "application/x-ndjson", self._iter_jsonl
+        elif format.lower() == "csv":
+            media_type, iter_content = "text/csv", self._iter_csv
+        elif format.lower() == "txt":
+            media_type, iter_content = "text/plain", self._iter_txt
+        else:
+            raise ValueError(f"Unsupported streaming export format: {format}")
         
-        async with aiofiles.open(session_file, 'r') as f:
-            session_data = json.loads(await f.read())
+        session_data = await self._load_for_export(session_id)
+        return {
+            "filename": f"session_{session_id}.{format.lower()}",
+            "media_type": media_type,
+            "content": iter_content(session_data)
+        }
+    
+    @staticmethod
+    def _iter_jsonl(session_data: Dict[str, Any]) -> Iterator[bytes]:
+        """Yield a session header line followed by one line per message"""
+        header = {key: value for key, value in session_data.items() if key != "messages"}
+        yield orjson.dumps(header) + b"\n"
+        for message in session_data.get("messages", []):
+            yield orjson.dumps(message) + b"\n"
+    
+    @staticmethod
+    def _iter_txt(session_data: Dict[str, Any]) -> Iterator[bytes]:
+        """Yield the readable text export, one message at a time"""
+        yield (
+            f"ReconIQ Session Export - {session_data['session_id']}\n"
+            f"Start Time: {session_data['start_time']}\n"
+            f"Last Activity: {session_data['last_activity']}\n"
+            + "=" * 50
+        ).encode()
+        
+        for msg in session_data.get("messages", []):
+            chunk = f"\n\n[{msg['timestamp']}] {msg['type'].upper()}\n{msg['content']}".encode()
+            if msg.get('results'):
+                chunk += b"\nResults: " + _dumps(msg['results'], orjson.OPT_INDENT_2)
+            yield chunk
+    
+    CSV_COLUMNS = ("timestamp", "type", "value", "source", "confidence", "target")
+    CSV_CHUNK_ROWS = 500
+    
+    @classmethod
+    def _iter_csv(cls, session_data: Dict[str, Any]) -> Iterator[bytes]:
+        """Yield the findings stored in a session as CSV, a chunk of rows at a time"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(cls.CSV_COLUMNS)
+        
+        rows = 0
+        for msg in session_data.get("messages", []):
+            for finding in (msg.get("results") or {}).get("findings", []):
+                metadata = finding.get("metadata") or {}
+                writer.writerow((
+                    msg["timestamp"],
+                    finding.get("type"),
+                    finding.get("value"),
+                    finding.get("source"),
+                    finding.get("confidence"),
+                    metadata.get("target") or metadata.get("host", "")
+                ))
+                rows += 1
+                if rows % cls.CSV_CHUNK_ROWS == 0:
+                    yield buffer.getvalue().encode()
+                    buffer.seek(0)
+                    buffer.truncate()
+        
+        yield buffer.getvalue().encode()
+    
+    async def export_session(self, session_id: str, format: str = "json") -> Dict[str, Any]:
+        """Export session data in specified format"""
+        session_data = await self._load_for_export(session_id)
         
         if format.lower() == "json":
             return {
                 "filename": f"session_{session_id}.json",
-                "content": json.dumps(session_data, indent=2),
+                "content": _dumps(session_data, orjson.OPT_INDENT_2).decode(),
                 "format": "json"
             }
         elif format.lower() == "txt":
             # Convert to readable text format
-            content_lines = [f"ReconIQ Session Export - {session_id}"]
-            content_lines.append(f"Start Time: {session_data['start_time']}")
-            content_lines.append(f"Last Activity: {session_data['last_activity']}")
-            content_lines.append("=" * 50)
-            
-            for msg in session_data.get("messages", []):
-                content_lines.append(f"\n[{msg['timestamp']}] {msg['type'].upper()}")
-                content_lines.append(msg['content'])
-                if msg.get('results'):
-                    content_lines.append(f"Results: {json.dumps(msg['results'], indent=2)}")
-            
             return {
                 "filename": f"session_{session_id}.txt",
-                "content": "\n".join(content_lines),
+                "content": b"".join(self._iter_txt(session_data)).decode(),
                 "format": "txt"
             }
+        elif format.lower() == "csv":
+            # One row per finding across all tool executions in the session
+            return {
+                "filename": f"session_{session_id}.csv",
+                "content": b"".join(self._iter_csv(session_data)).decode(),
+                "format": "csv"
+            }
+        elif format.lower() == "msgpack":
+            # Binary export: content is bytes and is sent as-is rather than embedded in JSON
+            return {
+                "filename": f"session_{session_id}.msgpack",
+                "content": ormsgpack.packb(session_data),
+                "format": "msgpack"
+            }
         else:
             raise ValueError(f"Unsupported export format: {format}")
\ No newline at end of file